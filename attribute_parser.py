@@ -0,0 +1,148 @@
+"""Parsing of FM attribute cells into absolute and estimated values.
+
+A cell is either a known value ("12"), a scouted range ("7-14"), or unknown
+("-" / empty); anything else, including a number longer than MAX_DIGITS,
+counts as unknown. parse_attribute_value handles one cell and defines the
+(abs, est) semantics; parse_attribute_bounds follows the same rules but keeps
+the range bounds. parse_cell_bounds and the *_block functions handle a whole
+block of attribute cells in one pass: an export only ever contains a few
+hundred distinct cell strings, so the block is factorized, each distinct
+string is parsed once, and the results are gathered back with NumPy indexing.
+
+pandas is only imported when a DataFrame (or a pandas missing value) is
+actually handed in, so the headless scoring path never loads it.
+"""
+import math
+
+import numpy as np
+
+# Longest number a cell may hold: FM attributes run 1-20, and the store keeps them as uint8
+MAX_DIGITS = 2
+
+
+def is_missing(value):
+    """pd.isna for a single cell, without importing pandas for plain values"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return False
+    if isinstance(value, float):
+        return math.isnan(value)
+    if isinstance(value, (int, np.integer)):
+        return False
+
+    import pandas as pd
+    return pd.isna(value)
+
+
+def parse_number(text):
+    """int of one number in a cell; ValueError when it is not a number or is longer than MAX_DIGITS"""
+    text = text.strip()
+    if len(text) > MAX_DIGITS:
+        raise ValueError(f"Attribute value out of range: {text!r}")
+    return int(text)
+
+
+def parse_attribute_value(value):
+    """Parse attribute values and return abs (single value) and est (midpoint) values"""
+    try:
+        if is_missing(value) or value == '-' or value == '' or value is None:
+            return 0, 0  # abs, est
+
+        value_str = str(value).strip()
+
+        # Handle empty string after stripping
+        if not value_str or value_str == '-':
+            return 0, 0
+
+        if '-' not in value_str:
+            # Single value - use for both abs and est
+            try:
+                val = parse_number(value_str)
+                return val, val  # abs, est (same for single values)
+            except ValueError:
+                return 0, 0
+        else:
+            # Range value - abs=0 (no absolute value), est=midpoint
+            parts = value_str.split('-')
+
+            # Ensure we have at least 2 parts for a range
+            if len(parts) < 2:
+                return 0, 0
+
+            try:
+                min_val = parse_number(parts[0]) if parts[0].strip() else 0
+                max_val = parse_number(parts[1]) if parts[1].strip() else 0
+                est_val = (min_val + max_val) / 2
+                return 0, est_val  # abs=0 for ranges, est=midpoint
+            except (ValueError, IndexError):
+                return 0, 0
+
+    except Exception as e:
+        print(f"Error parsing value '{value}': {e}")
+        return 0, 0
+
+
+def parse_attribute_bounds(value):
+    """Parse an attribute value into (abs, low, high); known values are a zero-width range"""
+    try:
+        if is_missing(value) or value == '-' or value == '' or value is None:
+            return 0, 0, 0
+
+        value_str = str(value).strip()
+        if not value_str or value_str == '-':
+            return 0, 0, 0
+
+        if '-' not in value_str:
+            try:
+                val = parse_number(value_str)
+                return val, val, val
+            except ValueError:
+                return 0, 0, 0
+
+        parts = value_str.split('-')
+        try:
+            min_val = parse_number(parts[0]) if parts[0].strip() else 0
+            max_val = parse_number(parts[1]) if parts[1].strip() else 0
+            return 0, min_val, max_val
+        except (ValueError, IndexError):
+            return 0, 0, 0
+
+    except Exception as e:
+        print(f"Error parsing value '{value}': {e}")
+        return 0, 0, 0
+
+
+def parse_cell_bounds(cells):
+    """Parse a flat sequence of str/None cells into flat (abs, low, high) arrays"""
+    # Factorize: distinct cell -> code, in order of first appearance
+    codes_by_cell = {}
+    codes = np.fromiter((codes_by_cell.setdefault(cell, len(codes_by_cell)) for cell in cells),
+                        dtype=np.intp, count=len(cells))
+
+    # Parse each distinct cell once and gather the results back
+    lookup = np.array([parse_attribute_bounds(cell) for cell in codes_by_cell] or [(0, 0, 0)],
+                      dtype=np.int64)
+    parsed = lookup[codes]
+    return parsed[:, 0], parsed[:, 1], parsed[:, 2]
+
+
+def parse_attribute_bounds_block(df, columns):
+    """Parse several DataFrame attribute columns into (abs, low, high) player x column arrays"""
+    import pandas as pd
+
+    n_rows, n_cols = len(df), len(columns)
+
+    # Flatten row by row so the result reshapes straight back to (players, columns)
+    cells = df[list(columns)].to_numpy(dtype=object).ravel()
+
+    # The scalar parser works on str(value), so 12 and 12.0 must stay distinct
+    text = np.where(pd.isna(cells), None, cells.astype(str)).tolist()
+
+    return tuple(values.reshape(n_rows, n_cols) for values in parse_cell_bounds(text))
+
+
+def parse_attribute_block(df, columns):
+    """Parse several attribute columns at once into (abs, est) player x column arrays"""
+    abs_values, low, high = parse_attribute_bounds_block(df, columns)
+    return abs_values, (low + high) / 2
@@ -0,0 +1,57 @@
+"""Time reopening an export through the parse cache.
+
+Usage:
+    python benchmarks/bench_cache.py [export.html] [--scale N]
+
+Loads the export (scaled up as in bench_load.py) into an empty temporary
+cache, then again unchanged, then again after touching its mtime (which
+costs a content hash but no parsing).
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_load import DEFAULT_EXPORT, make_scaled_export  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+from session import load_store  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    path = make_scaled_export(args.export, args.scale) if args.scale > 1 else args.export
+    directory = tempfile.mkdtemp()
+    try:
+        cache = ParseCache(directory)
+        with contextlib.redirect_stderr(io.StringIO()):
+            store, cold = timed(lambda: cache.load(path, load_store))
+        print(f"{len(store)} players, {os.path.getsize(path) / 1e6:.1f} MB export")
+        print(f"parse and cache: {cold:8.3f} s")
+        print(f"unchanged:       {timed(lambda: cache.load(path, load_store))[1]:8.3f} s")
+        os.utime(path)
+        print(f"touched:         {timed(lambda: cache.load(path, load_store))[1]:8.3f} s")
+    finally:
+        shutil.rmtree(directory)
+        if path != args.export:
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
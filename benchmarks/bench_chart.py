@@ -0,0 +1,87 @@
+"""Time redrawing the player attribute chart when the selection moves.
+
+Usage:
+    python benchmarks/bench_chart.py [export.html] [--players N]
+
+Renders with the Agg backend (no window), stepping through the best
+--players players of one role, once rebuilding the chart and drawing the
+whole figure for each player as the GUI used to, and once through
+AttributeChart's blitted update. Then, in both views, the selection is
+stepped through next to 9 compared players (labelled 'Selected player' in
+the legend, as the GUI does), and a compared player is added and removed.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from bench_scoring import DEFAULT_EXPORT  # noqa: E402
+from player_chart import MAX_PLAYERS, AttributeChart  # noqa: E402
+from session import ScoutingSession  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=50)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    session.load(args.export)
+    result = session.score_role(ROLE, args.players)
+    attributes = result.attributes_for(ROLE)
+
+    figure = Figure(figsize=(12, 4))
+    canvas = FigureCanvasAgg(figure)
+    chart = AttributeChart(figure, figure.add_subplot(), canvas)
+
+    def player(row):
+        return (str(result.store.names[row]),
+                [result.store.best_values(attr, row) for attr, _ in attributes])
+
+    def show(players):
+        chart.show(f'{players[0][0]} - {ROLE}', ROLE, attributes, players)
+        if chart.background is None:
+            canvas.draw()  # What draw_idle would do once Tk is idle
+
+    def step(rebuild, compared=()):
+        start = time.perf_counter()
+        for row in result.order.tolist():
+            if rebuild:
+                chart.layout = None
+            if compared:
+                show([('Selected player', player(row)[1])] + list(compared))
+            else:
+                show([player(row)])
+        return (time.perf_counter() - start) / len(result) * 1000
+
+    def toggle(compared):
+        # Alternately add and remove the last compared player
+        start = time.perf_counter()
+        for i in range(len(result)):
+            show(compared if i % 2 else compared[:-1])
+        return (time.perf_counter() - start) / len(result) * 1000
+
+    print(f"{len(attributes)} bars, {len(result)} players")
+    print(f"rebuild and full draw: {step(True):8.2f} ms per player")
+    print(f"update and blit:       {step(False):8.2f} ms per player")
+
+    compared = [player(row) for row in result.order[:MAX_PLAYERS - 1].tolist()]
+    for view in ('bars', 'radar'):
+        chart.set_view(view)
+        print(f"{view:<5} with {len(compared)} compared: {step(False, compared):8.2f} ms per player")
+        print(f"{view:<5} add/remove player:  {toggle(compared + compared[:1]):8.2f} ms per change")
+
+
+if __name__ == '__main__':
+    main()
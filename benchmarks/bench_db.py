@@ -0,0 +1,89 @@
+"""Peak memory of scoring from a memory-mapped player database vs in memory.
+
+Usage:
+    python benchmarks/bench_db.py [export.html] [--players N]
+
+Writes a temporary database with the sample's players tiled to --players
+rows, then in separate subprocesses scores one role and all roles from the
+database and from the same players loaded into a PlayerStore, reporting
+time and the growth in peak RSS.
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT  # noqa: E402
+from player_db import CHUNK_ROWS, DatabaseWriter  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+from session import load_store  # noqa: E402
+
+# Run inside a fresh interpreter: score and report peak RSS growth
+WORKER = r'''
+import contextlib, io, resource, sys, time
+sys.path.insert(0, {root!r})
+from player_db import PlayerDatabase
+from player_store import PlayerStore
+from session import ScoutingSession
+
+session = ScoutingSession()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+store = PlayerDatabase({path!r})
+if {in_memory!r}:
+    store = PlayerStore(store.names[:], store.attributes, store.low[:], store.high[:], store.abs_bits[:])
+with contextlib.redirect_stderr(io.StringIO()):
+    session.set_store(store)
+start = time.perf_counter()
+session.score_role(session.roles[0])
+one = time.perf_counter() - start
+start = time.perf_counter()
+session.score_all_roles()
+every = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(one, every, (peak - before) / 1024)
+'''
+
+
+def write_database(directory, store, n_players):
+    """Write store's rows tiled to n_players rows, one chunk at a time"""
+    with DatabaseWriter(directory, store.attributes) as writer:
+        for start in range(0, n_players, CHUNK_ROWS):
+            rows = np.arange(start, min(start + CHUNK_ROWS, n_players)) % len(store)
+            writer.append(PlayerStore(store.names[rows], store.attributes, store.low[rows],
+                                      store.high[rows], store.abs_bits[rows]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        store = load_store(args.export)
+    directory = tempfile.mkdtemp(suffix='.fmdb')
+    try:
+        write_database(directory, store, args.players)
+        print(f"{args.players} players x {len(store.attributes)} attributes")
+        for label, in_memory in (('database', False), ('in memory', True)):
+            code = WORKER.format(root=ROOT, path=directory, in_memory=in_memory)
+            output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                    check=True).stdout.split()
+            one, every, peak = map(float, output)
+            print(f"{label:10} one role {one:6.2f} s  all roles {every:6.2f} s  "
+                  f"peak RSS +{peak:7.1f} MB")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Time exporting results and the memory it takes, chunked against a whole DataFrame.
+
+Usage:
+    python benchmarks/bench_export.py [export.html] [--players N] [--columns display|full] [--no-trace]
+
+The sample's players are tiled to --players rows and scored for one role.
+The result is written to CSV and JSON Lines by result_export, a chunk of
+players at a time, and to CSV through to_frame().to_csv as the GUI used to.
+Each export is timed in one run and its peak memory, traced allocation on
+top of the scored result, taken in a second run; tracing is slow enough
+that --no-trace, timing only, suits large --players.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, scaled_store  # noqa: E402
+from result_export import COLUMN_SETS, export_results  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def measure(func, trace=True):
+    """(seconds, peak MB allocated or None) of func, timed and traced in separate calls.
+
+    Tracing slows allocation-heavy code several times over, so the timed
+    call runs without it.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    if not trace:
+        return elapsed, None
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def peak_text(peak):
+    return '' if peak is None else f", peak {peak:8.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--columns', choices=COLUMN_SETS, default='full')
+    parser.add_argument('--no-trace', action='store_true', help="time only, skipping the traced runs")
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+    result = session.score_role(ROLE)
+    columns = result.columns if args.columns == 'full' else result.display_columns
+
+    print(f"{len(result)} players, {len(columns)} columns")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('export.csv', 'export.jsonl'):
+            path = os.path.join(directory, name)
+            elapsed, peak = measure(lambda: export_results([(None, result)], path, args.columns),
+                                    not args.no_trace)
+            print(f"chunked {name:<13} {elapsed:7.2f} s{peak_text(peak)}")
+        path = os.path.join(directory, 'frame.csv')
+        elapsed, peak = measure(lambda: result.to_frame(columns).to_csv(path, index=False),
+                                not args.no_trace)
+        print(f"DataFrame to_csv      {elapsed:7.2f} s{peak_text(peak)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Time sidebar filters and player name search against scanning every player.
+
+Usage:
+    python benchmarks/bench_filter.py [export.html] [--players N] [--repeat N]
+
+The sample's players are tiled to --players rows. Each filter is resolved
+once while its indexes are built and then again with them in place, next to
+the same conditions evaluated with full-column NumPy scans; a filtered
+top-200 for one role is timed against scoring everyone. Last, the name
+index is built and used for type-ahead search and exact lookups.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, best_time, scaled_store  # noqa: E402
+from name_index import NameIndex  # noqa: E402
+from player_filter import NameFilter, parse_conditions  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+
+CONDITIONS = 'Pac >= 15, Acc >= 14'
+
+
+def scan(store, role_attributes):
+    """The same filter as a full scan of every player's values"""
+    best = {attr: store.low[:, store.columns[attr]] + store.high[:, store.columns[attr]].astype(np.uint16)
+            for attr in ('Pac', 'Acc')}
+    known = sum(store.is_absolute(attr).astype(np.uint8) for attr in role_attributes)
+    names = np.array(['son' in name.lower() for name in store.names.tolist()])
+    return np.flatnonzero((best['Pac'] >= 30) & (best['Acc'] >= 28) &
+                          (known >= np.ceil(len(role_attributes) * 0.8)) & names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+    store, role = session.store, session.roles[-1]
+    known = session.known_filter(role, 80)
+
+    def predicates():
+        return parse_conditions(CONDITIONS, store.attributes) + [known, NameFilter('son')]
+
+    print(f"{len(store)} players; filter: {CONDITIONS}, >= 80% known, name contains 'son'")
+    print(f"first select (builds indexes): {best_time(lambda: session.select(predicates()), 1) * 1000:8.2f} ms")
+    print(f"select with indexes:           "
+          f"{best_time(lambda: session.select(predicates()), args.repeat) * 1000:8.2f} ms")
+    print(f"full scan:                     "
+          f"{best_time(lambda: scan(store, known.attributes), args.repeat) * 1000:8.2f} ms")
+
+    rows = session.select(parse_conditions(CONDITIONS, store.attributes))
+    print(f"top 200 of {len(rows)} filtered:   "
+          f"{best_time(lambda: session.score_role(role, 200, rows), args.repeat) * 1000:8.2f} ms")
+    print(f"top 200 of everyone:           "
+          f"{best_time(lambda: session.score_role(role, 200), args.repeat) * 1000:8.2f} ms")
+
+    name = store.names[len(store) - 1]
+    # The name filter above already built the store's index; time a fresh one
+    print(f"name index build:              "
+          f"{best_time(lambda: NameIndex(store.names.tolist()), 1) * 1000:8.2f} ms")
+    for query in ('kan', 'harry k', 'ould'):
+        print(f"search {query!r:<22} "
+              f"{best_time(lambda: store.name_index().search(query), args.repeat) * 1000:8.2f} ms")
+    print(f"row_of with index:             "
+          f"{best_time(lambda: store.row_of(name), args.repeat) * 1000:8.2f} ms")
+    print(f"row_of by scanning names:      "
+          f"{best_time(lambda: np.flatnonzero(store.names == name)[0], args.repeat) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
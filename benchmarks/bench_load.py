@@ -0,0 +1,94 @@
+"""Compare pd.read_html with the streaming export reader.
+
+Usage:
+    python benchmarks/bench_load.py [export.html] [--repeat N] [--scale N]
+
+--scale writes a temporary export with the sample's player rows repeated N
+times, to see how both readers behave on whole-database sized files. Each
+reader runs in its own subprocess so peak memory is measured separately.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_EXPORT = os.path.join(ROOT, 'all attackers.html')
+
+# Run inside a fresh interpreter: time the reader and report peak RSS
+WORKER = r'''
+import resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from export_parser import read_export
+
+readers = {{
+    'read_html': lambda path: pd.read_html(path)[0],
+    'streaming': read_export,
+}}
+reader = readers[{reader!r}]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+timings = []
+for _ in range({repeat}):
+    start = time.perf_counter()
+    df = reader({path!r})
+    timings.append(time.perf_counter() - start)
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(len(df), min(timings), (peak - before) / 1024)
+'''
+
+
+def make_scaled_export(path, scale):
+    """Write a copy of the export with its player rows repeated scale times"""
+    with open(path, encoding='utf-8') as handle:
+        text = handle.read()
+
+    # Rows sit between the end of the header row and the closing table tag
+    header_end = text.index('</tr>') + len('</tr>')
+    table_end = text.index('</table>')
+    rows = text[header_end:table_end]
+
+    handle = tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8')
+    with handle:
+        handle.write(text[:header_end])
+        for _ in range(scale):
+            handle.write(rows)
+        handle.write(text[table_end:])
+    return handle.name
+
+
+def run_reader(reader, path, repeat):
+    """Time one reader in a subprocess, returning (rows, best seconds, peak MB)"""
+    code = WORKER.format(root=ROOT, reader=reader, path=path, repeat=repeat)
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True).stdout
+    rows, seconds, peak_mb = output.split()
+    return int(rows), float(seconds), float(peak_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.export
+    if args.scale > 1:
+        path = make_scaled_export(path, args.scale)
+
+    try:
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Export: {path} ({size_mb:.1f} MB)")
+        print(f"{'reader':<12}{'rows':>10}{'best (s)':>12}{'peak MB':>12}")
+        for reader in ('read_html', 'streaming'):
+            rows, seconds, peak_mb = run_reader(reader, path, args.repeat)
+            print(f"{reader:<12}{rows:>10}{seconds:>12.3f}{peak_mb:>12.1f}")
+    finally:
+        if path != args.export:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
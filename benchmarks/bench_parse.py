@@ -0,0 +1,73 @@
+"""Check and time the vectorized attribute parser against the per-cell one.
+
+Usage:
+    python benchmarks/bench_parse.py [export.html] [--repeat N]
+
+Before timing, every cell of the export plus the awkward hand-written cells
+of tests/test_attribute_parser.py (which checks the same equivalence under
+pytest) is parsed both ways and the (abs, est) results are compared; the
+script exits non-zero on the first mismatch.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from attribute_parser import parse_attribute_block  # noqa: E402
+from export_parser import read_export  # noqa: E402
+from tests.test_attribute_parser import EDGE_CASES, attribute_columns, scalar_block  # noqa: E402
+
+DEFAULT_EXPORT = os.path.join(ROOT, 'all attackers.html')
+
+
+def check_equivalent(df, columns, label):
+    expected_abs, expected_est = scalar_block(df, columns)
+    actual_abs, actual_est = parse_attribute_block(df, columns)
+    for expected, actual, kind in ((expected_abs, actual_abs, 'abs'),
+                                   (expected_est, actual_est, 'est')):
+        mismatch = np.argwhere(expected != actual)
+        if len(mismatch):
+            row, col = mismatch[0]
+            value = df[columns[col]].iat[row]
+            sys.exit(f"{label}: {kind} mismatch for {value!r}: "
+                     f"expected {expected[row, col]!r}, got {actual[row, col]!r}")
+    print(f"{label}: {expected_abs.size} cells identical")
+
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    edge_df = pd.DataFrame({'Val': pd.Series(EDGE_CASES, dtype=object)})
+    check_equivalent(edge_df, ['Val'], 'edge cases')
+
+    df = read_export(args.export)
+    columns = attribute_columns(df)
+    check_equivalent(df, columns, os.path.basename(args.export))
+
+    scalar = best_time(lambda: scalar_block(df, columns), args.repeat)
+    vectorized = best_time(lambda: parse_attribute_block(df, columns), args.repeat)
+    print(f"{len(df)} players x {len(columns)} attributes")
+    print(f"per-cell apply: {scalar * 1000:8.1f} ms")
+    print(f"vectorized:     {vectorized * 1000:8.1f} ms ({scalar / vectorized:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Time the rating bounds and Monte Carlo rank distributions for one role.
+
+Usage:
+    python benchmarks/bench_ranks.py [export.html] [--players N] [--samples N]
+
+The sample's players are tiled to --players rows. One role is scored
+(expected, pessimistic and optimistic ratings come from the same matmul,
+timed once the dense matrix is cached), then every player's rank
+distribution is sampled --samples times.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, best_time, scaled_store  # noqa: E402
+from rank_sampling import rank_distribution  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+    store, matrix = session.store, session.role_matrix
+    store.dense_matrix()
+
+    scoring = best_time(lambda: matrix.summaries(store, [ROLE]), 3)
+    print(f"{len(store)} players, rating bounds for one role: {scoring * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    rank_distribution(store, matrix, ROLE, samples=args.samples, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"{args.samples} rank samples: {elapsed:.2f} s ({elapsed / args.samples * 1000:.1f} ms each)")
+
+
+if __name__ == '__main__':
+    main()
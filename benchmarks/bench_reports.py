@@ -0,0 +1,50 @@
+"""Time saving chart reports for the best players of one role.
+
+Usage:
+    python benchmarks/bench_reports.py [export.html] [--players N] [--workers N ...]
+
+Writes --players PNG pages with each number of worker processes given, and
+the same pages as one PDF, into a temporary directory.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT  # noqa: E402
+from reports import report_pages, write_report  # noqa: E402
+from session import ScoutingSession  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count()])
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    session.load(args.export)
+    pages = report_pages(session.score_role(ROLE, args.players))
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{len(pages)} pages, {os.cpu_count()} CPUs")
+        for workers in args.workers:
+            start = time.perf_counter()
+            write_report(pages, os.path.join(directory, f'w{workers}.png'), workers)
+            elapsed = time.perf_counter() - start
+            print(f"PNG, {workers:2d} worker(s): {elapsed:7.2f} s ({elapsed / len(pages) * 1000:.0f} ms per page)")
+        start = time.perf_counter()
+        write_report(pages, os.path.join(directory, 'report.pdf'))
+        elapsed = time.perf_counter() - start
+        print(f"PDF:              {elapsed:7.2f} s ({elapsed / len(pages) * 1000:.0f} ms per page)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Time role scoring on a store scaled up from the sample export.
+
+Usage:
+    python benchmarks/bench_scoring.py [export.html] [--players N] [--repeat N] [--top K]
+
+The sample's players are tiled until the store holds --players rows, then
+one role and all roles are scored with the compiled RoleMatrix (one role
+also as a top-K ranking), and a result is sorted by a column the first and
+following times. Finally a newer export
+of 1% of the players is merged in and only those players are rescored.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from attribute_mapping import attribute_mapping  # noqa: E402
+from export_parser import read_export  # noqa: E402
+from player_store import PlayerStore  # noqa: E402
+from role_catalog import RoleCatalog  # noqa: E402
+from roles_data import roles_data  # noqa: E402
+from scoring import RoleMatrix, rescore_all_roles, score_all_roles, score_role  # noqa: E402
+
+DEFAULT_EXPORT = os.path.join(ROOT, 'all attackers.html')
+
+
+def scaled_store(store, n_players):
+    """Tile a store's rows until it has n_players rows"""
+    rows = np.resize(np.arange(len(store)), n_players)
+    return PlayerStore(store.names[rows], store.attributes, store.low[rows],
+                       store.high[rows], store.abs_bits[rows])
+
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=200)
+    args = parser.parse_args()
+
+    store = scaled_store(PlayerStore.from_frame(read_export(args.export)), args.players)
+    with contextlib.redirect_stdout(io.StringIO()):
+        matrix = RoleMatrix(RoleCatalog(roles_data, attribute_mapping), store.attributes)
+
+    dense = best_time(lambda: (setattr(store, '_dense', None), store.dense_matrix()), 1)
+    role = matrix.roles[0]
+    print(f"{len(store)} players x {len(store.attributes)} attributes, {len(matrix.roles)} roles")
+    print(f"dense matrix (once per load): {dense * 1000:8.2f} ms")
+    print(f"one role summaries:           "
+          f"{best_time(lambda: matrix.summaries(store, [role]), args.repeat) * 1000:8.2f} ms")
+    print(f"all roles summaries:          "
+          f"{best_time(lambda: matrix.summaries(store), args.repeat) * 1000:8.2f} ms")
+    print(f"score_all_roles (ratings):    "
+          f"{best_time(lambda: score_all_roles(store, matrix), args.repeat) * 1000:8.2f} ms")
+    print(f"score_role (with ranking):    "
+          f"{best_time(lambda: score_role(store, matrix, role), args.repeat) * 1000:8.2f} ms")
+    print(f"score_role top {args.top:<14} "
+          f"{best_time(lambda: score_role(store, matrix, role, args.top), args.repeat) * 1000:8.2f} ms")
+
+    # The first sort by a column computes its order; later header clicks reuse it
+    result = score_role(store, matrix, role)
+    print(f"first sort by Name:           "
+          f"{best_time(lambda: result.sorted_by('Name'), 1) * 1000:8.2f} ms")
+    print(f"repeated sort by Name:        "
+          f"{best_time(lambda: result.sorted_by('Name'), args.repeat) * 1000:8.2f} ms")
+
+    # A newer export rescouting 1% of the players, each with one value narrowed
+    rows = np.arange(0, len(store), 100)
+    low, high = store.low[rows].copy(), store.high[rows].copy()
+    high[:, 0] = low[:, 0]
+    newer = PlayerStore(store.names[rows], store.attributes, low, high, store.abs_bits[rows])
+    all_roles = score_all_roles(store, matrix)
+
+    def merge_and_rescore():
+        merged, changed = store.merge(newer)
+        return rescore_all_roles(all_roles, merged, changed)
+
+    print(f"merge 1% + rescore all roles: "
+          f"{best_time(merge_and_rescore, args.repeat) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Time similar-player searches for one role.
+
+Usage:
+    python benchmarks/bench_similarity.py [export.html] [--players N] [--queries N]
+
+The sample's players are tiled to --players rows. The role's search index
+is built once (timed), then --queries players spread over the store each
+get their nearest players, over every role attribute and over the key
+attributes only.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, scaled_store  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+from similarity import SCOPES, SimilarityIndex  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+    store = session.store
+    print(f"{len(store)} players")
+
+    for scope in SCOPES:
+        start = time.perf_counter()
+        index = SimilarityIndex(store, ROLE, session.role_matrix.role_attributes[ROLE], scope)
+        built = time.perf_counter() - start
+        backend = 'KD-tree' if index.tree is not None else 'blocked scan'
+        start = time.perf_counter()
+        for row in range(0, len(store), max(1, len(store) // args.queries)):
+            index.nearest(row)
+        per_query = (time.perf_counter() - start) / args.queries
+        print(f"{scope:<5} {len(index.attributes):2d} attributes ({backend}): "
+              f"built in {built * 1000:6.1f} ms, {per_query * 1000:6.2f} ms per search")
+
+
+if __name__ == '__main__':
+    main()
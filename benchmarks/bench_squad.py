@@ -0,0 +1,51 @@
+"""Time picking a squad for a formation.
+
+Usage:
+    python benchmarks/bench_squad.py [export.html] [--players N] [--depth N]
+
+The sample's players are tiled to --players rows. Every role is scored
+once (timed, as the squad picker needs all-roles ratings), then the
+default formation is picked at depths 1 to --depth.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, scaled_store  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+from squad import DEFAULT_FORMATION, linear_sum_assignment  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--depth', type=int, default=3)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+    print(f"{len(session.store)} players, {len(DEFAULT_FORMATION)} slots, "
+          f"{'scipy' if linear_sum_assignment is not None else 'NumPy Hungarian'} assignment")
+
+    start = time.perf_counter()
+    session.score_all_roles()
+    print(f"all roles scored in {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+    for depth in range(1, args.depth + 1):
+        start = time.perf_counter()
+        result = session.pick_squad(DEFAULT_FORMATION, depth=depth)
+        elapsed = time.perf_counter() - start
+        print(f"depth {depth}: {len(result.order)} picks in {elapsed * 1000:6.1f} ms, "
+              f"starting rating {result.starting_rating():.1f}")
+
+
+if __name__ == '__main__':
+    main()
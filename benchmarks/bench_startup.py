@@ -0,0 +1,90 @@
+"""Measure how long main.py takes to import, and what the time goes on.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--top N] [--window]
+
+Each run imports main in a fresh interpreter with -X importtime and reports
+the cumulative import time of main and its heaviest direct imports. --window
+also times PlayerAnalyzer until its first idle (needs a display).
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+app = main.PlayerAnalyzer()
+app.root.update()
+print(time.perf_counter() - start)
+app.root.destroy()
+"""
+
+
+def import_profile():
+    """Cumulative import time of main and of each module it imports directly, in seconds"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    # Children are listed (one level deeper) before their parent
+    modules, pending = {}, {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)) // 2, match.group(4)
+        children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append((name, cumulative))
+        if name == 'main':
+            modules = dict(children)
+            total = cumulative
+    return total / 1e6, {name: t / 1e6 for name, t in modules.items()}
+
+
+def window_time():
+    """Seconds until the window's first update; raises RuntimeError with the child's stderr if it fails"""
+    proc = subprocess.run([sys.executable, '-c', WINDOW_SCRIPT], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"exit status {proc.returncode}")
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--window', action='store_true')
+    args = parser.parse_args()
+
+    runs = [import_profile() for _ in range(args.repeat)]
+    totals = [total for total, _ in runs]
+    print(f"import main: median {statistics.median(totals) * 1000:.0f} ms, "
+          f"best {min(totals) * 1000:.0f} ms over {args.repeat} runs")
+
+    # Heaviest direct imports of main, by their median over the runs
+    names = set().union(*(modules for _, modules in runs))
+    medians = {name: statistics.median(modules.get(name, 0) for _, modules in runs)
+               for name in names}
+    for name in sorted(medians, key=medians.get, reverse=True)[:args.top]:
+        print(f"  {name:36} {medians[name] * 1000:8.1f} ms")
+
+    if args.window:
+        try:
+            timings = [window_time() for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"window: PlayerAnalyzer failed to start:\n{e}")
+        else:
+            print(f"window ready: median {statistics.median(timings) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
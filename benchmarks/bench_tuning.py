@@ -0,0 +1,63 @@
+"""Time re-ranking one role as its weights are tuned, incrementally against from scratch.
+
+Usage:
+    python benchmarks/bench_tuning.py [export.html] [--players N] [--steps N] [--top K]
+
+The sample's players are tiled to --players rows and a WeightTuner is built
+for one role. Each step moves one slider (an attribute scale, or every
+fifth step a group multiplier) and ranks the top K, as the weight editor
+does per burst of slider movement; that is compared with scoring the role
+from scratch, which is what each step would cost without the tuner.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_scoring import DEFAULT_EXPORT, best_time, scaled_store  # noqa: E402
+from session import ScoutingSession, load_store  # noqa: E402
+
+ROLE = 'Poacher (Attack)'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('export', nargs='?', default=DEFAULT_EXPORT)
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--top', type=int, default=200)
+    args = parser.parse_args()
+
+    session = ScoutingSession()
+    with contextlib.redirect_stderr(io.StringIO()):
+        session.set_store(scaled_store(load_store(args.export), args.players))
+
+    start = time.perf_counter()
+    tuner = session.weight_tuner(ROLE)
+    print(f"{len(session.store)} players, tuner built in {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(0)
+    attributes = [attr for attr, _ in tuner.attributes]
+    start = time.perf_counter()
+    for step in range(args.steps):
+        if step % 5 == 0:
+            tuner.set_multiplier(int(rng.choice([5, 3, 1])), rng.uniform(0, 10))
+        else:
+            tuner.set_scale(str(rng.choice(attributes)), rng.uniform(0, 3))
+        tuner.result(args.top)
+    per_step = (time.perf_counter() - start) / args.steps
+    print(f"incremental step + top {args.top}: {per_step * 1000:7.2f} ms")
+
+    scratch = best_time(lambda: session.score_role(ROLE, args.top), 3)
+    print(f"score from scratch (top {args.top}): {scratch * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
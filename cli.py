@@ -0,0 +1,222 @@
+"""Command line scoring of FM HTML exports, without starting the GUI.
+
+Examples:
+    python cli.py "all attackers.html" --role "Poacher (Attack)" --top 20
+    python cli.py export1.html export2.html --all-roles --format csv -o best_roles.csv
+    python cli.py --db world.fmdb --all-roles --columns full -o world_roles.parquet
+    python cli.py week1.html week4.html week8.html --merge --role "Poacher (Attack)"
+    python cli.py world/*.html --build-db world.fmdb
+    python cli.py --db world.fmdb --all-roles --top 100
+    python cli.py "all attackers.html" --role "Poacher (Attack)" --top 30 --report shortlist.pdf
+    python cli.py "all attackers.html" --role "Poacher (Attack)" --top 20 --rank-samples 500
+    python cli.py "all attackers.html" --squad --depth 3
+    python cli.py --db world.fmdb --squad --slot Goalkeeper --slot "Poacher (Attack)" -o squad.csv
+    python cli.py --list-roles
+    python cli.py "all attackers.html" --roles club_roles.toml --role "Club Poacher"
+
+Only session.py, parse_cache.py and NumPy are imported; tkinter and pandas are not,
+and matplotlib only for --report. Parsed exports are cached between runs unless
+--no-cache is given.
+"""
+import argparse
+import os
+import sys
+
+from parse_cache import ParseCache
+from result_export import (COLUMN_SETS, FORMATS as FILE_FORMATS, chunk_records, column_chunks,
+                           export_columns, export_results, write_csv, write_jsonl)
+from session import ScoutingSession
+
+FORMATS = ('table', 'csv', 'jsonl', 'parquet')
+
+
+def format_cell(column, value):
+    """Render a value the way the GUI table shows it"""
+    if isinstance(value, float):
+        return f"{value:.0f}%" if column.endswith('_pct') else f"{value:.1f}"
+    return '' if value is None else str(value)
+
+
+def write_table(records, columns, out):
+    rows = [[format_cell(col, record.get(col)) for col in columns] for record in records]
+    widths = [max([len(col)] + [len(row[i]) for row in rows]) for i, col in enumerate(columns)]
+    out.write('  '.join(col.ljust(width) for col, width in zip(columns, widths)).rstrip() + '\n')
+    for row in rows:
+        out.write('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() + '\n')
+
+
+def write_stream(results, columns, output_format, out):
+    """Write results as text; csv and jsonl a chunk at a time, a table once its widths are known"""
+    chunks = column_chunks(results, columns)
+    if output_format == 'table':
+        write_table([record for chunk in chunks for record in chunk_records(chunk, columns)],
+                    columns, out)
+        return
+    write = write_csv if output_format == 'csv' else write_jsonl
+    for _ in write(chunks, columns, out):
+        pass
+
+
+def write_stdout(parser, write):
+    """Call write() to print to stdout, exiting quietly if the reader has gone (as `| head` does)"""
+    try:
+        write()
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Point stdout at devnull so the interpreter's final flush does not fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        parser.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Score FM HTML exports for one or more roles.")
+    parser.add_argument('exports', nargs='*', help="FM HTML export files (stacked together)")
+    parser.add_argument('--merge', action='store_true',
+                        help="Treat the exports as successive scouting reports, oldest first, "
+                             "and keep each player's most precise values")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--role', action='append', default=[],
+                        help="Role to rank players for (repeatable)")
+    target.add_argument('--all-roles', action='store_true',
+                        help="Score every role and report each player's best fit")
+    target.add_argument('--squad', action='store_true',
+                        help="Pick the best players for a formation's slots (see --slot)")
+    parser.add_argument('--slot', action='append', default=[], metavar='ROLE',
+                        help="A formation slot for --squad, in order (repeatable; "
+                             "default: a 4-3-3 of the bundled roles)")
+    parser.add_argument('--depth', type=int,
+                        help="Choices per slot for --squad (default: 2, a starter and a backup)")
+    parser.add_argument('--list-roles', action='store_true', help="List the known roles and exit")
+    parser.add_argument('--roles', action='append', default=[], metavar='FILE',
+                        help="JSON or TOML role definitions to add to (or override) the "
+                             "bundled roles (repeatable)")
+    parser.add_argument('--format', choices=FORMATS,
+                        help="Output format (default: from the -o extension, else table)")
+    parser.add_argument('--columns', choices=COLUMN_SETS, default='display',
+                        help="Only the columns the GUI shows, or every attribute column")
+    parser.add_argument('--top', type=int, help="Only the best N players per role")
+    parser.add_argument('--rank-samples', type=int, metavar='N',
+                        help="Add each player's rank spread over N Monte Carlo draws of "
+                             "their scouted ranges (--role only)")
+    parser.add_argument('--seed', type=int, help="Random seed for --rank-samples")
+    parser.add_argument('-o', '--output', help="Write here instead of stdout")
+    parser.add_argument('--report', metavar='PATH',
+                        help="Instead of a table, chart each ranked player into a PDF (PATH.pdf) "
+                             "or PNG files named after PATH (PATH.png)")
+    parser.add_argument('--workers', type=int,
+                        help="Processes rendering PNG report pages (default: one per CPU)")
+    parser.add_argument('--db', help="Score a player database built with --build-db instead of exports")
+    parser.add_argument('--build-db', metavar='DIRECTORY',
+                        help="Stream the exports into a memory-mapped player database and exit")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always parse the exports instead of using the parse cache")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        session = ScoutingSession(cache=None if args.no_cache else ParseCache(),
+                                  role_files=args.roles)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Failed to read role definitions: {e}\n")
+
+    if args.list_roles:
+        write_stdout(parser, lambda: print('\n'.join(session.roles)))
+        return 0
+
+    if args.build_db:
+        if not args.exports:
+            parser.error("--build-db needs at least one export file")
+        from player_db import build_database
+        try:
+            count = build_database(args.build_db, args.exports)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"Failed to build database: {e}\n")
+        print(f"Wrote {count} players to {args.build_db}", file=sys.stderr)
+        return 0
+
+    if not args.exports and not args.db:
+        parser.error("at least one export file (or --db) is required")
+    if args.exports and args.db:
+        parser.error("give either export files or --db, not both")
+    if not args.role and not args.all_roles and not args.squad:
+        parser.error("choose --role, --all-roles or --squad")
+    if (args.slot or args.depth is not None) and not args.squad:
+        parser.error("--slot and --depth need --squad")
+    if args.squad and args.top is not None:
+        parser.error("--top does not apply to --squad (use --depth for more choices per slot)")
+    if args.depth is not None and args.depth < 1:
+        parser.error("--depth must be at least 1")
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.rank_samples is not None:
+        if args.rank_samples < 1:
+            parser.error("--rank-samples must be at least 1")
+        if not args.role:
+            parser.error("--rank-samples needs --role")
+    for role in args.role + args.slot:
+        if role not in session.catalog:
+            parser.error(f"unknown role {role!r} (see --list-roles)")
+
+    try:
+        if args.db:
+            session.open_database(args.db)
+        elif args.merge:
+            session.merge(*args.exports)
+        else:
+            session.load(*args.exports)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Failed to load exports: {e}\n")
+
+    if args.squad:
+        from squad import DEFAULT_FORMATION
+        results = [(None, session.pick_squad(args.slot or DEFAULT_FORMATION, depth=args.depth))]
+    elif args.all_roles:
+        results = [(None, session.score_all_roles(args.top))]
+    else:
+        # With --top only the winners are kept (partial selection, streamed over a database)
+        results = [(role, session.score_role(role, args.top)) for role in args.role]
+        if args.rank_samples:
+            results = [(role, session.add_rank_distribution(result, samples=args.rank_samples,
+                                                            seed=args.seed))
+                       for role, result in results]
+
+    if args.report:
+        from reports import report_pages, write_report
+        pages = [page for _, result in results for page in report_pages(result)]
+        try:
+            files = write_report(pages, args.report, args.workers)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"Failed to write report: {e}\n")
+        print(f"Wrote {len(pages)} charts to {len(files)} file(s)", file=sys.stderr)
+        return 0
+
+    # Several roles go into one output, tagged with a Role column
+    if not args.output:
+        if args.format == 'parquet':
+            parser.error("--format parquet needs -o")
+        columns = export_columns(results, args.columns)
+        output_format = args.format or 'table'
+        write_stdout(parser, lambda: write_stream(results, columns, output_format, sys.stdout))
+        return 0
+
+    output_format = args.format
+    if output_format is None:
+        output_format = FILE_FORMATS.get(os.path.splitext(args.output)[1].lower(), 'table')
+    try:
+        if output_format == 'table':
+            with open(args.output, 'w', encoding='utf-8') as out:
+                write_stream(results, export_columns(results, args.columns), 'table', out)
+        else:
+            export_results(results, args.output, args.columns, output_format)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Failed to write {args.output}: {e}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
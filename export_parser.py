@@ -0,0 +1,143 @@
+"""Streaming reader for Football Manager "print screen" HTML exports.
+
+FM writes player lists as a single <table>: one header row of <th> cells
+followed by one <tr> of <td> cells per player. Rather than building a full
+document tree (pd.read_html), the file is scanned in chunks with row and cell
+regexes and rows are handed out as soon as their </tr> has been read. Reading
+stops at the end of the first table.
+"""
+import html
+import os
+import re
+
+# Characters read from the file per scanner feed
+CHUNK_SIZE = 64 * 1024
+
+TABLE_START = re.compile(r'<table\b', re.IGNORECASE)
+TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+ROW_PATTERN = re.compile(r'<tr\b[^>]*>(.*?)</tr\s*>', re.IGNORECASE | re.DOTALL)
+CELL_PATTERN = re.compile(r'<t([dh])\b[^>]*>(.*?)</t[dh]\s*>', re.IGNORECASE | re.DOTALL)
+BREAK_PATTERN = re.compile(r'<br\b[^>]*>', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+
+
+def clean_cell(text):
+    """Reduce a cell's inner HTML to the text pd.read_html would produce"""
+    if '<' in text:
+        text = TAG_PATTERN.sub('', BREAK_PATTERN.sub(' ', text))
+    if '&' in text:
+        text = html.unescape(text)
+    # Collapse whitespace; empty cells are missing values
+    text = ' '.join(text.split())
+    return text if text else None
+
+
+class ExportTableScanner:
+    """Collect the header and data rows of the first table in an export"""
+
+    def __init__(self):
+        self.header = None
+        self.rows = []  # Completed data rows not yet handed out
+        self.done = False
+
+        self._buffer = ''
+        self._in_table = False
+
+    def feed(self, chunk):
+        """Scan a chunk of markup, keeping any incomplete row for the next call"""
+        text = self._buffer + chunk
+
+        if not self._in_table:
+            start = TABLE_START.search(text)
+            if start is None:
+                # Keep enough to catch a '<table' split across chunks
+                self._buffer = text[-len('<table'):]
+                return
+            text = text[start.start():]
+            self._in_table = True
+
+        end = TABLE_END.search(text)
+        limit = end.start() if end else len(text)
+
+        position = 0
+        for match in ROW_PATTERN.finditer(text, 0, limit):
+            self._add_row(match.group(1))
+            position = match.end()
+
+        if end:
+            self.done = True
+            self._buffer = ''
+        else:
+            self._buffer = text[position:]
+
+    def close(self):
+        """Finish scanning when the file ends without closing the table"""
+        self.done = True
+        self._buffer = ''
+
+    def _add_row(self, row_html):
+        cells = CELL_PATTERN.findall(row_html)
+        if not cells:
+            return
+
+        values = [clean_cell(content) for _, content in cells]
+        if self.header is None:
+            if any(kind.lower() == 'h' for kind, _ in cells):
+                self.header = values
+        else:
+            self.rows.append(values)
+
+
+def iter_export_rows(file_path, encoding='utf-8', chunk_size=CHUNK_SIZE, progress=None):
+    """Yield the header row and then each player row of an FM HTML export.
+
+    progress, if given, is called with the fraction of the file read so far.
+    """
+    scanner = ExportTableScanner()
+    header_sent = False
+    size = max(os.path.getsize(file_path), 1) if progress is not None else 1
+    read = 0
+
+    with open(file_path, 'r', encoding=encoding, errors='replace') as handle:
+        while not scanner.done:
+            chunk = handle.read(chunk_size)
+            if chunk:
+                scanner.feed(chunk)
+                read += len(chunk)
+                if progress is not None:
+                    # Characters, not bytes, but FM exports are nearly all ASCII
+                    progress(min(read / size, 1.0))
+            else:
+                scanner.close()
+
+            if not header_sent and scanner.header is not None:
+                yield scanner.header
+                header_sent = True
+
+            if scanner.rows:
+                rows, scanner.rows = scanner.rows, []
+                yield from rows
+
+    if not header_sent:
+        raise ValueError(f"No player table found in {file_path}")
+
+
+def pad_record(row, width):
+    """Pad or trim a ragged row so it lines up with the header"""
+    return row[:width] if len(row) >= width else row + [None] * (width - len(row))
+
+
+def read_export_rows(file_path, encoding='utf-8', progress=None):
+    """Read an FM HTML export into (header, rows), every row as long as the header"""
+    rows = iter_export_rows(file_path, encoding=encoding, progress=progress)
+    header = next(rows)
+    width = len(header)
+    return header, [pad_record(row, width) for row in rows]
+
+
+def read_export(file_path, encoding='utf-8'):
+    """Read the first table of an FM HTML export into a DataFrame"""
+    import pandas as pd
+
+    header, records = read_export_rows(file_path, encoding=encoding)
+    return pd.DataFrame.from_records(records, columns=header)
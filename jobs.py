@@ -0,0 +1,101 @@
+"""Run slow work (loading exports, scoring) off the Tk thread.
+
+A JobRunner owns one worker thread that runs submitted jobs in order, so a
+job always sees the session state left by the jobs before it. Jobs report
+progress and their outcome through a queue that the GUI drains on the Tk
+thread with after() polling; callbacks therefore run on the Tk thread and
+no Tk call is ever made from the worker.
+
+A cancelled job is skipped if it has not started, stops at its next
+progress report if it has, and its outcome is dropped either way.
+"""
+import queue
+import threading
+import time
+
+# Minimum seconds between progress events posted by one job
+PROGRESS_INTERVAL = 0.05
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's function once the job has been cancelled"""
+
+
+class Job:
+    """One unit of work for the worker, with its callbacks and cancellation flag"""
+
+    def __init__(self, runner, func, on_done=None, on_error=None, on_progress=None):
+        self.runner = runner
+        self.func = func  # Called on the worker as func(job)
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancelled = threading.Event()
+        self._last_progress = 0.0
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def progress(self, fraction):
+        """Report progress (0-1) from the worker; raises JobCancelled once cancelled"""
+        if self.cancelled:
+            raise JobCancelled()
+
+        now = time.monotonic()
+        if fraction < 1 and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.runner.events.put((self, 'progress', fraction))
+
+
+class JobRunner:
+    """A single worker thread running jobs in submission order"""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()  # (job, 'progress' | 'done' | 'error', value)
+        self._thread = None
+
+    def submit(self, func, on_done=None, on_error=None, on_progress=None):
+        """Queue func(job) for the worker; the callbacks run from poll()"""
+        job = Job(self, func, on_done, on_error, on_progress)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name='job-runner', daemon=True)
+            self._thread.start()
+        self.jobs.put(job)
+        return job
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job.cancelled:
+                continue
+            try:
+                result = job.func(job)
+            except JobCancelled:
+                continue
+            except Exception as e:
+                self.events.put((job, 'error', e))
+            else:
+                self.events.put((job, 'done', result))
+
+    def poll(self):
+        """Run the callbacks for everything the worker has posted (call on the Tk thread)"""
+        while True:
+            try:
+                job, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if job.cancelled:
+                continue
+
+            callback = {'progress': job.on_progress, 'done': job.on_done,
+                        'error': job.on_error}[kind]
+            if callback is not None:
+                callback(value)
+            elif kind == 'error':
+                raise value
@@ -1,10 +1,13 @@
-import pandas as pd
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.style as style
+
+from jobs import JobRunner
+from results_table import VirtualTable
+
+# NumPy (via session/scoring) and matplotlib are imported on first use so the
+# window can appear straight away; see preload_modules and ensure_chart.
 
 # Import the roles data and attribute mapping from your separate files
 try:
@@ -15,66 +18,100 @@ except ImportError as e:
     roles_data = {}
     attribute_mapping = {}
 
+# How often (ms) the Tk thread picks up progress and results from the worker
+POLL_INTERVAL = 30
+
+# Players shown per analysis unless changed in the sidebar (0 shows everyone)
+DEFAULT_TOP = 200
+
+# Suggestions listed under the player search box
+SEARCH_LIMIT = 20
+
+# Delay (ms) before the chart follows the selection, so holding an arrow key
+# only draws the player the selection stops on
+GRAPH_DELAY = 40
+
+# Players drawn on the chart at once: the selected one plus those Ctrl-clicked
+MAX_COMPARED = 10
+
+# Reports on more players than this ask first
+REPORT_CONFIRM = 200
+
+# How often (ms) loaded role files are checked for changes
+ROLE_CHECK_INTERVAL = 2000
+
+
+def count_text(result):
+    """How many players a result shows, e.g. '200 total' or 'top 200 of 52310'"""
+    if len(result) < result.total:
+        text = f"top {len(result)} of {result.total}"
+    else:
+        text = f"{len(result)} total"
+    if result.total < len(result.store):
+        text += f", filtered from {len(result.store)}"
+    return text
+
+
 class PlayerAnalyzer:
     def __init__(self):
-        self.df = None
-        self.processed_df = None
         self.current_results = None
         self.current_role = None
+        self.current_formation = None  # (formation, depth) of the squad on screen, if one is
         self.selected_player = None
+        self.selected_row = None  # Store row of the selected player
+        self.compare_rows = []  # Store rows of the players compared with it
         
         # Initialize matplotlib components as None first
         self.fig = None
         self.ax = None
         self.canvas = None
+        self.chart = None  # AttributeChart drawing on self.ax
+        self.graph_after = None  # Pending after() id of a debounced chart update
         
-        # Use the imported roles_data and attribute mapping
+        # Loading and scoring live in the Tk-free session; the GUI only displays.
+        # Session work runs on the job runner's worker thread, one job at a time.
+        self._session = None
         self.roles_data = roles_data
-        self.attribute_mapping = attribute_mapping
-        
-        # Create reverse mapping (full name to abbreviation)
-        self.reverse_mapping = {v: k for k, v in attribute_mapping.items()}
+        self.roles = list(roles_data)  # Role names in the dropdown, updated when role files change
+        self.roles_job = None  # Pending job reading or re-checking role files
+        self.jobs = JobRunner()
+        self.load_job = None
+        self.analysis_job = None
+        # Exports and reports write on their own worker, so scoring is not held up
+        self.output_jobs = JobRunner()
+        self.export_job = None
+        self.report_job = None
+        self.search_rows = []  # Store rows of the names listed under the search box
+        self.weight_editor = None  # Open WeightEditor re-ranking the role on screen
         
         self.setup_gui()
     
-    def parse_attribute_value(self, value):
-        """Parse attribute values and return abs (single value) and est (midpoint) values"""
+    @property
+    def session(self):
+        """The Tk-free scouting session, created (importing NumPy) on first use"""
+        if self._session is None:
+            from parse_cache import ParseCache
+            from session import ScoutingSession
+            # Reopening an unchanged export reads the parsed players back from the cache
+            self._session = ScoutingSession(self.roles_data, attribute_mapping, cache=ParseCache())
+        return self._session
+    
+    def preload_modules(self):
+        """Import the heavy modules on a background thread once the window is up"""
+        def preload():
+            import session  # noqa: F401 - NumPy and the scoring code
+            import matplotlib.backends.backend_tkagg  # noqa: F401
+            import matplotlib.figure  # noqa: F401
+        
+        threading.Thread(target=preload, daemon=True).start()
+    
+    def poll_jobs(self):
+        """Run the callbacks of background jobs on the Tk thread"""
         try:
-            if pd.isna(value) or value == '-' or value == '' or value is None:
-                return 0, 0  # abs, est
-            
-            value_str = str(value).strip()
-            
-            # Handle empty string after stripping
-            if not value_str or value_str == '-':
-                return 0, 0
-            
-            if '-' not in value_str:
-                # Single value - use for both abs and est
-                try:
-                    val = int(value_str)
-                    return val, val  # abs, est (same for single values)
-                except ValueError:
-                    return 0, 0
-            else:
-                # Range value - abs=0 (no absolute value), est=midpoint
-                parts = value_str.split('-')
-                
-                # Ensure we have at least 2 parts for a range
-                if len(parts) < 2:
-                    return 0, 0
-                
-                try:
-                    min_val = int(parts[0]) if parts[0].strip() else 0
-                    max_val = int(parts[1]) if parts[1].strip() else 0
-                    est_val = (min_val + max_val) / 2
-                    return 0, est_val  # abs=0 for ranges, est=midpoint
-                except (ValueError, IndexError):
-                    return 0, 0
-                    
-        except Exception as e:
-            print(f"Error parsing value '{value}': {e}")
-            return 0, 0
+            self.jobs.poll()
+            self.output_jobs.poll()
+        finally:
+            self.root.after(POLL_INTERVAL, self.poll_jobs)
     
     def load_file(self):
         """Load HTML file and process the data"""
@@ -86,66 +123,156 @@ class PlayerAnalyzer:
         if not file_path:
             return
         
-        try:
-            # Read HTML file
-            dfs = pd.read_html(file_path)
-            self.df = dfs[0]  # Assuming data is in first table
-            
-            # Process the data
-            self.process_data()
-            
-            # Update status
-            self.status_label.config(text=f"Loaded {len(self.df)} players successfully!")
-            
-            # Enable role selection and analysis
-            self.role_dropdown.config(state='normal')
-            self.analyze_button.config(state='normal')
-            self.export_button.config(state='normal')
-            
-            # Clear any existing results
+        # A newly chosen file replaces one that is still loading
+        if self.load_job is not None:
+            self.load_job.cancel()
+        
+        file_name = os.path.basename(file_path)
+        self.status_label.config(text=f"Loading {file_name}...")
+        
+        # Stream the player table out of the HTML export and parse it on the worker
+        session = self.session
+        self.load_job = self.jobs.submit(
+            lambda job: session.load(file_path, progress=job.progress),
+            on_done=self.on_file_loaded,
+            on_error=self.on_load_failed,
+            on_progress=lambda fraction: self.status_label.config(
+                text=f"Loading {file_name}... {fraction:.0%}"))
+    
+    def open_database(self):
+        """Open a memory-mapped player database built with cli.py --build-db"""
+        directory = filedialog.askdirectory(title="Select player database")
+        
+        if not directory:
+            return
+        
+        if self.load_job is not None:
+            self.load_job.cancel()
+        
+        self.status_label.config(text=f"Opening {os.path.basename(directory)}...")
+        
+        # Nothing is read up front; scoring streams the database in chunks
+        session = self.session
+        self.load_job = self.jobs.submit(
+            lambda job: session.open_database(directory),
+            on_done=self.on_file_loaded,
+            on_error=self.on_load_failed)
+    
+    def merge_files(self):
+        """Merge newer scouting exports into the loaded players"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select newer HTML files",
+            filetypes=[("HTML files", "*.html"), ("All files", "*.*")]
+        )
+        
+        if not file_paths:
+            return
+        
+        if self.load_job is not None:
+            self.load_job.cancel()
+        
+        self.status_label.config(text=f"Merging {len(file_paths)} file(s)...")
+        
+        # Only new or changed players are rescored (see ScoutingSession.merge)
+        session = self.session
+        
+        def merge(job):
+            before = 0 if session.store is None else len(session.store)
+            changed = session.merge(*file_paths, progress=job.progress)
+            return session.store, changed, before
+        
+        self.load_job = self.jobs.submit(
+            merge,
+            on_done=self.on_files_merged,
+            on_error=self.on_load_failed,
+            on_progress=lambda fraction: self.status_label.config(
+                text=f"Merging {len(file_paths)} file(s)... {fraction:.0%}"))
+    
+    def on_files_merged(self, outcome):
+        """Show the merged store and refresh the current analysis (runs on the Tk thread)"""
+        store, changed, before = outcome
+        self.load_job = None
+        
+        added = int((changed >= before).sum())
+        self.status_label.config(text=f"{len(store)} players: {added} new, "
+                                      f"{len(changed) - added} updated")
+        
+        self.role_dropdown.config(state='normal')
+        self.analyze_button.config(state='normal')
+        self.all_roles_button.config(state='normal')
+        self.tune_button.config(state='normal')
+        self.squad_button.config(state='normal')
+        self.export_button.config(state='normal')
+        self.report_button.config(state='normal')
+        
+        self.index_names(store)
+        
+        # Re-run whatever is shown against the merged players
+        if self.current_results is None:
             self.clear_results()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {str(e)}")
-    
-    def process_data(self):
-        """Process the raw data and create abs/est columns"""
-        # Start with a copy of the original data
-        self.processed_df = self.df[['Name']].copy()
-        
-        # Get all attribute columns (exclude Name and status columns)
-        attribute_columns = [col for col in self.df.columns 
-                           if col not in ['Name', 'Inf'] and len(col) <= 3]
-        
-        # Collect all new columns to add at once
-        new_columns = {}
-        
-        # Process each attribute column
-        for col in attribute_columns:
-            if col in self.df.columns:
-                # Apply parsing function
-                parsed_values = self.df[col].apply(self.parse_attribute_value)
-                
-                # Add to new columns dictionary
-                new_columns[f'{col}_abs'] = [x[0] for x in parsed_values]
-                new_columns[f'{col}_est'] = [x[1] for x in parsed_values]
-        
-        # Add all new columns at once using pd.concat for better performance
-        if new_columns:
-            additional_df = pd.DataFrame(new_columns, index=self.processed_df.index)
-            self.processed_df = pd.concat([self.processed_df, additional_df], axis=1)
-        
-        # Add any remaining non-attribute columns that might be useful
-        other_columns = [col for col in self.df.columns 
-                        if col not in ['Name'] + attribute_columns]
-        if other_columns:
-            other_df = pd.DataFrame({col: self.df[col] for col in other_columns}, 
-                                  index=self.processed_df.index)
-            self.processed_df = pd.concat([self.processed_df, other_df], axis=1)
+        else:
+            self.refresh_analysis()
+    
+    def on_file_loaded(self, store):
+        """Show a freshly loaded store (runs on the Tk thread)"""
+        self.load_job = None
+        
+        # Update status
+        self.status_label.config(text=f"Loaded {len(store)} players successfully!")
+        
+        # Enable role selection and analysis
+        self.role_dropdown.config(state='normal')
+        self.analyze_button.config(state='normal')
+        self.all_roles_button.config(state='normal')
+        self.tune_button.config(state='normal')
+        self.squad_button.config(state='normal')
+        self.export_button.config(state='normal')
+        self.report_button.config(state='normal')
+        
+        # Clear any existing results
+        self.close_weight_editor()
+        self.current_results = None
+        self.clear_results()
+        self.index_names(store)
+    
+    def index_names(self, store):
+        """Build the store's name index on the worker, so lookups and search never wait for it"""
+        self.jobs.submit(lambda job: store.name_index())
+    
+    def on_load_failed(self, error):
+        self.load_job = None
+        self.status_label.config(text="Failed to load file")
+        messagebox.showerror("Error", f"Failed to load file: {str(error)}")
+    
+    def run_analysis(self, role, score, show, formation=None):
+        """Run score(job) on the worker, then show the result; a newer analysis supersedes this one"""
+        if self.analysis_job is not None:
+            self.analysis_job.cancel()
+        # Tuned weights only apply to the ranking they were tuned on
+        self.close_weight_editor()
+        
+        self.results_label.config(text=f"Scoring {role or 'all roles'}...")
+        
+        def done(result):
+            self.analysis_job = None
+            self.current_results = result
+            self.current_role = role
+            self.current_formation = formation
+            show(result)
+        
+        def failed(error):
+            self.analysis_job = None
+            self.results_label.config(text="No analysis results")
+            messagebox.showerror("Error", f"Analysis failed: {str(error)}")
+        
+        self.analysis_job = self.jobs.submit(
+            score, on_done=done, on_error=failed,
+            on_progress=lambda fraction: self.results_label.config(
+                text=f"Ranking {role} over sampled ranges... {fraction:.0%}"))
     
     def analyze_role(self):
         """Analyze players for selected role"""
-        if self.processed_df is None:
+        if self.session.store is None:
             messagebox.showerror("Error", "Please load a file first!")
             return
         
@@ -154,176 +281,328 @@ class PlayerAnalyzer:
             messagebox.showerror("Error", "Please select a role!")
             return
         
-        # Get role data
-        role_data = self.roles_data.get(selected_role, {})
-        
-        if not role_data:
+        if selected_role not in self.roles:
             messagebox.showerror("Error", "Invalid role selected!")
             return
         
-        # Flatten all attributes with their importance ratings
-        all_attributes = {}
-        for category, attributes in role_data.items():
-            all_attributes.update(attributes)
+        self.start_analysis(selected_role)
+    
+    def analyze_all_roles(self):
+        """Score every player against every role and show each player's best fit"""
+        if self.session.store is None:
+            messagebox.showerror("Error", "Please load a file first!")
+            return
+        
+        self.start_analysis(None)
+    
+    def start_analysis(self, role):
+        """Score one role (None for every role) with the sidebar's filters and top setting"""
+        try:
+            predicates = self.filter_predicates()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid filter: {e}")
+            return
+        known_pct = self.known_pct()
+        session, top, samples = self.session, self.top_players(), self.rank_samples()
+        
+        def score(job):
+            # Filters resolve to rows through the session's indexes; a single role
+            # then scores only those rows and keeps only the best players asked for
+            rows = session.analysis_rows(role, predicates, known_pct)
+            if role is None:
+                return session.score_all_roles(top, rows)
+            result = session.score_role(role, top, rows)
+            if samples:
+                result = session.add_rank_distribution(result, rows, samples, progress=job.progress)
+            return result
+        
+        if role is None:
+            self.run_analysis(None, score, self.display_all_roles)
+        else:
+            self.run_analysis(role, score, lambda result: self.display_results(result, role))
+    
+    def refresh_analysis(self):
+        """Run whatever is on screen again, e.g. after a merge or a filter change"""
+        if self.current_formation is not None:
+            self.start_squad(*self.current_formation)
+        else:
+            self.start_analysis(self.current_role)
+    
+    def open_squad_dialog(self):
+        """Choose a formation and pick the best players for its slots"""
+        from squad_dialog import SquadDialog
+        
+        formation = self.current_formation[0] if self.current_formation else None
+        SquadDialog(self.root, self.roles, self.start_squad, formation)
+    
+    def start_squad(self, formation, depth):
+        """Pick a squad for a formation from the players passing the sidebar's filters"""
+        if self._session is None or self._session.store is None:
+            messagebox.showerror("Error", "Please load a file first!")
+            return
+        missing = [role for role in formation if role not in self.roles]
+        if missing:
+            messagebox.showerror("Error", f"Unknown roles in the formation: {', '.join(missing)}")
+            return
+        try:
+            predicates = self.filter_predicates()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid filter: {e}")
+            return
+        session = self.session
+        
+        def score(job):
+            rows = session.analysis_rows(None, predicates)
+            return session.pick_squad(formation, rows, depth)
+        
+        self.run_analysis(None, score, self.display_squad, formation=(formation, depth))
+    
+    def display_squad(self, result):
+        """Display the players picked for each slot, starters first"""
+        self.clear_results()
+        starters = int((result.choices == 1).sum())
+        self.results_label.config(
+            text=f"Best Squad: {starters} of {len(result.formation)} slots filled, "
+                 f"starting rating {result.starting_rating():.1f}")
+        
+        columns = result.display_columns
+        self.tree["columns"] = columns
+        self.tree["show"] = "headings"
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
+            if col in ('Name', 'Role'):
+                self.tree.column(col, width=200, anchor='w')
+            else:
+                self.tree.column(col, width=100, anchor='center')
+        
+        self.table.show(result, columns)
+    
+    def results_name(self):
+        """What the results on screen are of, for file names"""
+        if self.current_role is not None:
+            return self.current_role
+        return 'Squad' if self.current_formation is not None else 'All Roles'
+    
+    def filter_predicates(self):
+        """The attribute and name filters typed into the sidebar; raises ValueError if unreadable"""
+        from player_filter import NameFilter, parse_conditions
+        
+        predicates = parse_conditions(self.conditions_var.get(), self.session.store.attributes)
+        name = self.name_filter_var.get().strip()
+        if name:
+            predicates.append(NameFilter(name))
+        return predicates
+    
+    def known_pct(self):
+        """Minimum % of known importance-5 attributes, or 0 for no minimum"""
+        try:
+            return max(0, min(100, int(self.known_var.get())))
+        except (tk.TclError, ValueError):
+            return 0
+    
+    def apply_filters(self):
+        """Run the analysis on screen again with the current filters"""
+        if self._session is None or self._session.store is None:
+            return
+        if self.current_results is not None:
+            self.refresh_analysis()
+        elif self.role_var.get():
+            self.analyze_role()
+    
+    def clear_filters(self):
+        self.conditions_var.set('')
+        self.known_var.set('0')
+        self.name_filter_var.set('')
+        self.apply_filters()
+    
+    def top_players(self):
+        """How many players an analysis keeps, or None for all of them"""
+        try:
+            top = int(self.top_var.get())
+        except (tk.TclError, ValueError):
+            top = DEFAULT_TOP
+        return top if top > 0 else None
+    
+    def rank_samples(self):
+        """Monte Carlo samples of each single-role ranking, or 0 for none"""
+        try:
+            return max(0, int(self.samples_var.get()))
+        except (tk.TclError, ValueError):
+            return 0
+    
+    def load_role_files(self):
+        """Add custom roles (or override bundled ones) from JSON or TOML files"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select role definition files",
+            filetypes=[("Role definitions", "*.json *.toml"), ("All files", "*.*")]
+        )
+        if not file_paths:
+            return
+        
+        session = self.session
         
-        # Start with just the Name column
-        result_df = self.processed_df[['Name']].copy()
+        def failed(error):
+            self.roles_job = None
+            messagebox.showerror("Error", f"Failed to read role definitions: {str(error)}")
         
-        # Initialize importance group sums and absolute counters
-        importance_5_sum = np.zeros(len(self.processed_df))
-        importance_3_sum = np.zeros(len(self.processed_df))
-        importance_1_sum = np.zeros(len(self.processed_df))
+        # Queued behind any scoring, so the roles never change under a running analysis
+        self.roles_job = self.jobs.submit(
+            lambda job: (session.add_role_files(*file_paths), session.roles),
+            on_done=self.on_roles_changed, on_error=failed)
+    
+    def check_role_files(self):
+        """Reload the role files when they change on disk (re-armed every ROLE_CHECK_INTERVAL)"""
+        self.root.after(ROLE_CHECK_INTERVAL, self.check_role_files)
+        if self.roles_job is not None or self._session is None or not self._session.catalog.paths:
+            return
         
-        # Count absolutes in each importance group for each player
-        importance_5_absolutes = np.zeros(len(self.processed_df))
-        importance_3_absolutes = np.zeros(len(self.processed_df))
-        importance_1_absolutes = np.zeros(len(self.processed_df))
+        session = self.session
         
-        # Count total attributes in each importance group
-        importance_5_count = 0
-        importance_3_count = 0
-        importance_1_count = 0
+        def failed(error):
+            # A half-saved file is reported here and read again on its next change
+            self.roles_job = None
+            self.status_label.config(text=f"Role definitions not reloaded: {error}")
         
-        # Collect all attribute columns to add at once
-        attribute_columns = {}
+        self.roles_job = self.jobs.submit(
+            lambda job: (session.reload_roles(), session.roles),
+            on_done=self.on_roles_changed, on_error=failed)
+    
+    def on_roles_changed(self, outcome):
+        """Offer the new roles and re-run an analysis whose role changed (runs on the Tk thread)"""
+        changed, roles = outcome
+        self.roles_job = None
+        if not changed:
+            return
         
-        # Process each attribute and collect data
-        for full_attr_name, importance in all_attributes.items():
-            # Convert full name to abbreviation for column lookup
-            attr_abbrev = self.reverse_mapping.get(full_attr_name, full_attr_name)
-            
-            abs_col = f'{attr_abbrev}_abs'
-            est_col = f'{attr_abbrev}_est'
-            
-            if abs_col in self.processed_df.columns:
-                abs_values = self.processed_df[abs_col].values
-                est_values = self.processed_df[est_col].values
-                
-                # Use absolute value if available (non-zero), otherwise use estimated
-                best_values = np.where(abs_values > 0, abs_values, est_values)
-                
-                # Track which values are absolutes (non-zero abs values)
-                is_absolute = (abs_values > 0).astype(int)
-                
-                # Collect attribute columns
-                attribute_columns[f'{attr_abbrev}_abs'] = self.processed_df[abs_col]
-                attribute_columns[f'{attr_abbrev}_est'] = self.processed_df[est_col]
-                attribute_columns[f'{attr_abbrev}_best'] = best_values
-                attribute_columns[f'{attr_abbrev}_importance'] = importance
-                
-                # Add to appropriate importance group
-                if importance == 5:
-                    importance_5_sum += best_values
-                    importance_5_absolutes += is_absolute
-                    importance_5_count += 1
-                elif importance == 3:
-                    importance_3_sum += best_values
-                    importance_3_absolutes += is_absolute
-                    importance_3_count += 1
-                elif importance == 1:
-                    importance_1_sum += best_values
-                    importance_1_absolutes += is_absolute
-                    importance_1_count += 1
+        self.roles = roles
+        self.role_dropdown.config(values=roles)
+        self.status_label.config(text=f"Roles updated: {', '.join(sorted(changed))}")
+        if self.current_results is None:
+            return
+        if self.current_role is None or self.current_role in roles:
+            # Unchanged roles keep their cached scores (see ScoutingSession.update_roles)
+            if self.current_role is None or self.current_role in changed:
+                self.refresh_analysis()
+        else:
+            self.close_weight_editor()
+            self.current_results = None
+            self.clear_results()
+    
+    def tune_weights(self):
+        """Open the weight editor for the role on screen, re-ranking its players live"""
+        if self.current_results is None or self.current_role is None:
+            messagebox.showerror("Error", "Analyze a single role first!")
+            return
+        try:
+            predicates = self.filter_predicates()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid filter: {e}")
+            return
+        known_pct = self.known_pct()
+        session, role = self.session, self.current_role
+        
+        def tuner():
+            # Every player passing the filters, not just the top shown, so tuning can promote anyone
+            return session.weight_tuner(role, session.analysis_rows(role, predicates, known_pct))
+        
+        def failed(error):
+            messagebox.showerror("Error", f"Could not tune weights: {str(error)}")
+        
+        self.jobs.submit(lambda job: tuner(), on_done=self.open_weight_editor, on_error=failed)
+    
+    def open_weight_editor(self, tuner):
+        """Show the sliders for a tuner built on the worker (runs on the Tk thread)"""
+        from weight_editor import WeightEditor
+        
+        self.close_weight_editor()
+        if tuner.role != self.current_role or tuner.store is not self.session.store:
+            return  # Another analysis or file came in while it was being built
+        self.weight_editor = WeightEditor(self.root, tuner, self.on_weights_changed,
+                                          full_name=lambda attr: attribute_mapping.get(attr, attr),
+                                          on_close=self.on_weight_editor_closed)
+    
+    def close_weight_editor(self):
+        if self.weight_editor is not None:
+            self.weight_editor.close()
+    
+    def on_weight_editor_closed(self):
+        self.weight_editor = None
+    
+    def on_weights_changed(self, tuner):
+        """Show the ranking under the tuned weights; columns and the selected player stay"""
+        result = tuner.result(self.top_players())
+        self.current_results = result
+        self.results_label.config(text=f"Best {tuner.role} Players, tuned weights ({count_text(result)})")
+        self.table.reorder(result)
+    
+    def on_role_change(self, event):
+        """Switch straight to a role's ranking when every role is already scored"""
+        if self.session.all_roles is not None:
+            self.analyze_role()
+    
+    def show_results(self, result):
+        """Display either kind of result in the table"""
+        from scoring import AllRolesResult
+        
+        if isinstance(result, AllRolesResult):
+            self.display_all_roles(result)
+        else:
+            self.display_results(result, result.role)
+    
+    def display_all_roles(self, result):
+        """Display every player's best role, margin and rating for each role"""
+        self.clear_results()
+        self.results_label.config(text=f"Best Role for Every Player ({count_text(result)})")
+        
+        columns = result.display_columns
+        
+        # Configure treeview columns
+        self.tree["columns"] = columns
+        self.tree["show"] = "headings"
+        
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
+            if col == 'Name':
+                self.tree.column(col, width=150, anchor='w')
+            elif col in ('best_role', 'second_role'):
+                self.tree.column(col, width=200, anchor='w')
             else:
-                # Debug: print missing attributes
-                print(f"Warning: Attribute '{attr_abbrev}' (from '{full_attr_name}') not found in data")
-        
-        # Calculate importance group totals and percentages
-        attribute_columns['importance_5_total'] = importance_5_sum
-        attribute_columns['importance_3_total'] = importance_3_sum
-        attribute_columns['importance_1_total'] = importance_1_sum
-        
-        # Calculate absolute percentages (avoid division by zero)
-        attribute_columns['importance_5_abs_pct'] = (importance_5_absolutes / max(importance_5_count, 1)) * 100
-        attribute_columns['importance_3_abs_pct'] = (importance_3_absolutes / max(importance_3_count, 1)) * 100
-        attribute_columns['importance_1_abs_pct'] = (importance_1_absolutes / max(importance_1_count, 1)) * 100
-        
-        # Calculate averages (avoid division by zero)
-        attribute_columns['importance_5_avg'] = importance_5_sum / max(importance_5_count, 1)
-        attribute_columns['importance_3_avg'] = importance_3_sum / max(importance_3_count, 1)
-        attribute_columns['importance_1_avg'] = importance_1_sum / max(importance_1_count, 1)
-        
-        # Calculate overall rating (weighted sum of group averages)
-        overall_rating = (attribute_columns['importance_5_avg'] * 5 + 
-                         attribute_columns['importance_3_avg'] * 3 + 
-                         attribute_columns['importance_1_avg'] * 1) / 9  # 5+3+1=9
-        attribute_columns['overall_rating'] = overall_rating
-        
-        # Add all columns at once using pd.concat for better performance
-        if attribute_columns:
-            additional_df = pd.DataFrame(attribute_columns, index=result_df.index)
-            result_df = pd.concat([result_df, additional_df], axis=1)
-        
-        # Sort by overall rating
-        result_df = result_df.sort_values('overall_rating', ascending=False)
-        
-        # Store results and display
-        self.current_results = result_df
-        self.current_role = selected_role
-        self.display_results(result_df, selected_role)
-    
-    def display_results(self, dataframe, role):
+                self.tree.column(col, width=100, anchor='center')
+        
+        self.table.show(result, columns)
+    
+    def display_results(self, result, role):
         """Display analysis results in the main window"""
         # Clear existing results
         self.clear_results()
         
         # Update the results label
-        self.results_label.config(text=f"Best {role} Players ({len(dataframe)} total)")
-        
-        # Configure columns - show totals with their absolute percentages
-        important_columns = ['Name', 'overall_rating', 
-                           'importance_5_total', 'importance_5_abs_pct',
-                           'importance_3_total', 'importance_3_abs_pct', 
-                           'importance_1_total', 'importance_1_abs_pct']
-        
-        # Add key attributes for the role (first 5-6 most important)
-        role_data = self.roles_data.get(role, {})
-        all_attributes = {}
-        for category, attributes in role_data.items():
-            all_attributes.update(attributes)
-        
-        # Sort attributes by importance and take top 6
-        sorted_attrs = sorted(all_attributes.items(), key=lambda x: x[1], reverse=True)[:6]
-        for full_attr_name, importance in sorted_attrs:
-            attr_abbrev = self.reverse_mapping.get(full_attr_name, full_attr_name)
-            important_columns.extend([f'{attr_abbrev}_best', f'{attr_abbrev}_importance'])
+        self.results_label.config(text=f"Best {role} Players ({count_text(result)})")
         
-        # Filter dataframe to show only important columns
-        display_df = dataframe[important_columns].copy()
+        # Only the rows in view are ever formatted (see VirtualTable)
+        columns = result.display_columns
         
         # Configure treeview columns
-        self.tree["columns"] = list(display_df.columns)
+        self.tree["columns"] = columns
         self.tree["show"] = "headings"
         
         # Set column headings and widths
-        for col in display_df.columns:
+        for col in columns:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
             if 'Name' in col:
                 self.tree.column(col, width=150, anchor='w')
-            elif 'overall_rating' in col:
+            elif col.endswith('_rating'):
                 self.tree.column(col, width=120, anchor='center')
             elif 'importance_' in col and 'total' in col:
                 self.tree.column(col, width=100, anchor='center')
-            elif 'abs_pct' in col:
+            elif col.endswith('_pct'):
                 self.tree.column(col, width=80, anchor='center')
             elif 'importance' in col:
                 self.tree.column(col, width=80, anchor='center')
             else:
                 self.tree.column(col, width=80, anchor='center')
         
-        # Insert data
-        for index, row in display_df.iterrows():
-            values = []
-            for col in display_df.columns:
-                val = row[col]
-                if isinstance(val, float):
-                    if 'abs_pct' in col:
-                        values.append(f"{val:.0f}%")  # Format percentages
-                    else:
-                        values.append(f"{val:.1f}")
-                else:
-                    values.append(str(val))
-            self.tree.insert("", "end", values=values)
+        self.table.show(result, columns)
     
     def sort_by_column(self, column):
         """Sort the treeview by the selected column"""
@@ -337,156 +616,299 @@ class PlayerAnalyzer:
         ascending = self.sort_order.get(column, True)
         self.sort_order[column] = not ascending
         
-        # Sort the dataframe
-        sorted_df = self.current_results.sort_values(column, ascending=ascending)
+        # Reorder the result view; scores are not recomputed and the order is cached
+        sorted_results = self.current_results.sorted_by(column, ascending=ascending)
         
-        # Update display
-        selected_role = self.role_var.get()
-        self.current_results = sorted_df
-        self.display_results(sorted_df, selected_role)
-    
-    def on_player_select(self, event):
-        """Handle player selection in the treeview"""
-        selection = self.tree.selection()
-        if selection and self.current_results is not None:
-            item = self.tree.item(selection[0])
-            player_name = item['values'][0]  # First column is Name
-            self.selected_player = player_name
-            self.update_player_graph()
+        # Update display; columns, headings and the selected player stay as they are
+        self.current_results = sorted_results
+        self.table.reorder(sorted_results)
     
     def clear_results(self):
         """Clear the results display"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.table.clear()
         self.results_label.config(text="No analysis results")
         self.selected_player = None
-        if self.ax is not None and self.canvas is not None:
-            self.clear_graph()
+        self.selected_row = None
+        self.clear_graph()
+    
+    def ensure_chart(self):
+        """Create the matplotlib figure and canvas the first time a chart is drawn"""
+        if self.canvas is not None:
+            return
+        
+        import matplotlib.style
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
+        from player_chart import AttributeChart
+        
+        # Set up matplotlib
+        matplotlib.style.use('default')
+        self.fig = Figure(figsize=(12, 4))
+        self.ax = self.fig.add_subplot()
+        self.fig.patch.set_facecolor('white')
+        
+        # Replace the placeholder with the canvas
+        self.graph_placeholder.destroy()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_section)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart = AttributeChart(self.fig, self.ax, self.canvas)
+        self.chart.set_view(self.view_var.get())
     
     def clear_graph(self):
         """Clear the graph"""
-        if self.ax is not None and self.canvas is not None:
-            self.ax.clear()
-            self.ax.text(0.5, 0.5, 'Select a player to view attributes', 
-                        horizontalalignment='center', verticalalignment='center',
-                        transform=self.ax.transAxes, fontsize=12, style='italic')
-            self.canvas.draw()
-    
-    def on_player_select(self, event):
-        """Handle player selection in the treeview"""
-        selection = self.tree.selection()
-        if selection and self.current_results is not None:
-            item = self.tree.item(selection[0])
-            player_name = item['values'][0]  # First column is Name
-            self.selected_player = player_name
-            self.update_player_graph()
+        self.cancel_graph_update()
+        # Before the first chart the placeholder label already says this
+        if self.chart is not None:
+            self.chart.show_message('Select a player to view attributes', style='italic')
+    
+    def on_search_typed(self, event=None):
+        """List the players whose names match what has been typed so far"""
+        if event is not None and event.keysym in ('Return', 'Up', 'Down', 'Escape'):
+            return
+        store = self.session.store if self._session is not None else None
+        index = store.name_index(build=False) if store is not None else None
+        if index is None:
+            self.search_rows = []
+            self.search_box['values'] = ()
+            return
+        
+        self.search_rows = index.search(self.search_var.get(), SEARCH_LIMIT)
+        self.search_box['values'] = [str(store.names[row]) for row in self.search_rows]
+    
+    def on_search_chosen(self, event=None):
+        """Jump to the chosen (or, on Enter, the best matching) player in the results"""
+        if not self.search_rows or self.current_results is None:
+            return
+        choice = self.search_box.current()
+        row = self.search_rows[choice if choice >= 0 else 0]
+        if self.current_results.store is not self.session.store:
+            return  # The results are from an older load; the rows do not match
+        self.show_player(row)
+    
+    def show_player(self, row):
+        """Select a player (store row) in the results, or just chart it when not shown"""
+        position = self.current_results.position_of(row)
+        if position is not None:
+            # Scrolls to the player and selects it, which also draws the graph
+            self.table.select(position)
+        else:
+            self.on_player_select(row)
+            self.results_label.config(
+                text=f"{self.selected_player} is not in these results (showing the graph only)")
+    
+    def on_player_select(self, row):
+        """Handle player selection in the table (row is the player's store row)"""
+        if self.current_results is not None:
+            self.selected_row = row
+            self.selected_player = self.current_results.store.names[row]
+            self.schedule_graph_update()
+    
+    def show_player_menu(self, row, x, y):
+        """Right-click menu of a player in the results"""
+        role = self.current_results.role_for(row)
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label=f"Find Similar Players ({role})",
+                         command=lambda: self.find_similar(row, role, 'role'))
+        menu.add_command(label="Find Similar Players (key attributes)",
+                         command=lambda: self.find_similar(row, role, 'key'))
+        try:
+            menu.tk_popup(x, y)
+        finally:
+            menu.grab_release()
+    
+    def find_similar(self, row, role, scope):
+        """List the players most like one player for a role, weighted by its importances"""
+        session, store = self.session, self.session.store
+        
+        def search(job):
+            import numpy as np
+            
+            rows, distances = session.similar_players(row, role, scope=scope)
+            # The role's ratings of just the players found
+            scored = session.score_role(role, rows=np.sort(rows))
+            ratings = [scored.values(name, rows).tolist()
+                       for name in ('overall_rating', 'pessimistic_rating', 'optimistic_rating')]
+            return rows.tolist(), list(zip(store.names[rows].tolist(), distances.tolist(), *ratings))
+        
+        def done(outcome):
+            from similar_window import SimilarPlayersWindow
+            
+            if store is not self.session.store:
+                return  # Another file came in while searching
+            rows, records = outcome
+            scope_text = " (key attributes)" if scope == 'key' else ""
+            SimilarPlayersWindow(
+                self.root, f"Players most like {store.names[row]} as {role}{scope_text}", rows, records,
+                on_pick=lambda picked: self.show_similar(store, picked),
+                on_compare=lambda found: self.compare_similar(store, row, found))
+        
+        def failed(error):
+            messagebox.showerror("Error", f"Similar player search failed: {str(error)}")
+        
+        self.jobs.submit(search, on_done=done, on_error=failed)
+    
+    def show_similar(self, store, row):
+        """Show a player picked from a similar players list"""
+        if self.current_results is not None and self.current_results.store is store:
+            self.show_player(row)
+    
+    def compare_similar(self, store, row, rows):
+        """Chart a player against the closest players found for it"""
+        if self.current_results is not None and self.current_results.store is store:
+            self.show_player(row)
+            self.table.set_compared(rows[:MAX_COMPARED - 1])
+    
+    def on_compare(self, rows):
+        """Overlay the players marked in the table on the selected player's chart"""
+        self.compare_rows = rows
+        self.schedule_graph_update()
+    
+    def on_view_change(self):
+        """Redraw the chart as bars or radar"""
+        if self.chart is not None:
+            self.chart.set_view(self.view_var.get())
+            self.schedule_graph_update()
+    
+    def schedule_graph_update(self):
+        """Redraw the chart once the selection has stopped moving for GRAPH_DELAY ms"""
+        self.cancel_graph_update()
+        self.graph_after = self.root.after(GRAPH_DELAY, self.update_player_graph)
+    
+    def cancel_graph_update(self):
+        if self.graph_after is not None:
+            self.root.after_cancel(self.graph_after)
+            self.graph_after = None
     
     def update_player_graph(self):
         """Update the graph for the selected player"""
-        if (not self.selected_player or self.current_results is None or 
-            not self.current_role or self.ax is None or self.canvas is None):
+        self.graph_after = None
+        if self.current_results is None:
             self.clear_graph()
             return
         
-        # Find the player's data
-        player_data = self.current_results[self.current_results['Name'] == self.selected_player]
-        if player_data.empty:
+        # The selected player first, then those marked for comparison
+        rows = [] if self.selected_row is None else [self.selected_row]
+        rows += [row for row in self.compare_rows if row not in rows]
+        rows = rows[:MAX_COMPARED]
+        if not rows:
             self.clear_graph()
             return
         
-        player_row = player_data.iloc[0]
+        # In the all-roles view the graph shows the (first) player's best role
+        role = self.current_results.role_for(rows[0])
+        attributes = self.current_results.attributes_for(role)
+        
+        # Read from the result's own store; the session may already hold a newer load
+        store = self.current_results.store
+        players = [(str(store.names[row]),
+                    [store.best_values(attr_abbrev, row) for attr_abbrev, _ in attributes])
+                   for row in rows]
+        title = f'{players[0][0]} - {role}'
+        if len(players) > 1 and self.selected_row is not None:
+            # The legend keeps its labels as the selection moves, so it stays in the background
+            title = f'{players[0][0]} vs {len(players) - 1} compared - {role}'
+            players[0] = ('Selected player', players[0][1])
+        
+        # Only the players' artists change unless the role or view did (see AttributeChart)
+        self.ensure_chart()
+        self.chart.show(title, role, attributes, players)
+    
+    def export_results(self):
+        """Export current results to CSV, Parquet or JSON Lines"""
+        if self.current_results is None:
+            messagebox.showerror("Error", "No results to export!")
+            return
+        if self.export_job is not None:
+            messagebox.showerror("Error", "An export is already being written")
+            return
         
-        # Get role attributes
-        role_data = self.roles_data.get(self.current_role, {})
-        all_attributes = {}
-        for category, attributes in role_data.items():
-            all_attributes.update(attributes)
+        selected_role = self.results_name()
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"),
+                       ("JSON Lines files", "*.jsonl")],
+            initialfile=f"{selected_role.replace(' ', '_')}_analysis.csv"
+        )
+        if not file_path:
+            return
         
-        # Collect attribute data for the graph
-        attributes = []
-        values = []
-        importance_colors = []
+        from result_export import export_results, format_for
         
-        for full_attr_name, importance in all_attributes.items():
-            attr_abbrev = self.reverse_mapping.get(full_attr_name, full_attr_name)
-            best_col = f'{attr_abbrev}_best'
-            
-            if best_col in player_row:
-                attributes.append(attr_abbrev)
-                values.append(player_row[best_col])
-                
-                # Color based on importance
-                if importance == 5:
-                    importance_colors.append('#d32f2f')  # Red for critical
-                elif importance == 3:
-                    importance_colors.append('#f57c00')  # Orange for moderate
-                else:
-                    importance_colors.append('#388e3c')  # Green for minor
-        
-        # Create the graph
-        self.plot_player_attributes(attributes, values, importance_colors)
-    
-    def plot_player_attributes(self, attributes, values, colors):
-        """Create a bar chart of player attributes"""
-        if self.ax is None or self.canvas is None:
+        try:
+            format_for(file_path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
-            
-        self.ax.clear()
-        
-        if not attributes:
-            self.ax.text(0.5, 0.5, 'No data to display', 
-                        horizontalalignment='center', verticalalignment='center',
-                        transform=self.ax.transAxes, fontsize=12)
-            self.canvas.draw()
-            return
-        
-        # Create bar chart
-        bars = self.ax.bar(range(len(attributes)), values, color=colors, alpha=0.7, edgecolor='black', linewidth=0.5)
-        
-        # Customize the plot
-        self.ax.set_xlabel('Attributes', fontweight='bold')
-        self.ax.set_ylabel('Values', fontweight='bold')
-        self.ax.set_title(f'{self.selected_player} - {self.current_role}', fontweight='bold', fontsize=12)
-        self.ax.set_xticks(range(len(attributes)))
-        self.ax.set_xticklabels(attributes, rotation=45, ha='right')
-        self.ax.grid(True, alpha=0.3, axis='y')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            self.ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                        f'{value:.1f}', ha='center', va='bottom', fontsize=8)
-        
-        # Add legend
-        legend_elements = [
-            plt.Rectangle((0,0),1,1, facecolor='#d32f2f', alpha=0.7, label='Critical (5)'),
-            plt.Rectangle((0,0),1,1, facecolor='#f57c00', alpha=0.7, label='Moderate (3)'),
-            plt.Rectangle((0,0),1,1, facecolor='#388e3c', alpha=0.7, label='Minor (1)')
-        ]
-        self.ax.legend(handles=legend_elements, loc='upper right', fontsize=8)
-        
-        plt.tight_layout()
-        self.canvas.draw()
+        
+        # Written a chunk of players at a time on the worker, in the order shown
+        results = [(self.current_role, self.current_results)]
+        column_set = 'full' if self.full_columns_var.get() else 'display'
+        self.export_button.config(state='disabled')
+        
+        def done(count):
+            self.export_job = None
+            self.export_button.config(state='normal')
+            self.status_label.config(text=f"Exported {count} players")
+            messagebox.showinfo("Success", f"{count} players exported to {file_path}")
+        
+        def failed(error):
+            self.export_job = None
+            self.export_button.config(state='normal')
+            messagebox.showerror("Error", f"Failed to export: {str(error)}")
+        
+        self.export_job = self.output_jobs.submit(
+            lambda job: export_results(results, file_path, column_set, progress=job.progress),
+            on_done=done, on_error=failed,
+            on_progress=lambda fraction: self.status_label.config(
+                text=f"Exporting {os.path.basename(file_path)}... {fraction:.0%}"))
     
-    def export_results(self):
-        """Export current results to CSV"""
+    def export_reports(self):
+        """Save one attribute chart per player in the results, as a PDF or PNG files"""
         if self.current_results is None:
-            messagebox.showerror("Error", "No results to export!")
+            messagebox.showerror("Error", "No results to report on!")
+            return
+        if self.report_job is not None:
+            messagebox.showerror("Error", "A report is already being saved")
             return
         
-        selected_role = self.role_var.get()
-        file_path = filedialog.asksavename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-            initialname=f"{selected_role.replace(' ', '_')}_analysis.csv"
+        count = len(self.current_results)
+        if count > REPORT_CONFIRM and not messagebox.askyesno(
+                "Save Reports", f"Save a chart for each of the {count} players in the results?"):
+            return
+        
+        selected_role = self.results_name()
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF (one page per player)", "*.pdf"),
+                       ("PNG (one file per player)", "*.png")],
+            initialfile=f"{selected_role.replace(' ', '_')}_report.pdf"
         )
+        if not file_path:
+            return
+        
+        from reports import report_pages, write_report
+        
+        # Values are read here, so the worker never touches a store a newer load replaces
+        pages = report_pages(self.current_results)
+        self.report_button.config(state='disabled')
+        
+        def done(files):
+            self.report_job = None
+            self.report_button.config(state='normal')
+            self.status_label.config(text=f"Saved {len(pages)} charts to {len(files)} file(s)")
         
-        if file_path:
-            try:
-                self.current_results.to_csv(file_path, index=False)
-                messagebox.showinfo("Success", f"Results exported to {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export: {str(e)}")
+        def failed(error):
+            self.report_job = None
+            self.report_button.config(state='normal')
+            self.status_label.config(text="Report failed")
+            messagebox.showerror("Error", f"Failed to save report: {str(error)}")
+        
+        self.report_job = self.output_jobs.submit(
+            lambda job: write_report(pages, file_path, progress=job.progress),
+            on_done=done, on_error=failed,
+            on_progress=lambda fraction: self.status_label.config(
+                text=f"Saving {len(pages)} charts... {fraction:.0%}"))
     
     def setup_gui(self):
         """Setup the main GUI with sidebar layout"""
@@ -531,6 +953,12 @@ class PlayerAnalyzer:
         load_button = ttk.Button(file_frame, text="Load HTML File", command=self.load_file)
         load_button.pack(fill=tk.X)
         
+        merge_button = ttk.Button(file_frame, text="Merge Newer Exports", command=self.merge_files)
+        merge_button.pack(fill=tk.X, pady=(5, 0))
+        
+        database_button = ttk.Button(file_frame, text="Open Player Database", command=self.open_database)
+        database_button.pack(fill=tk.X, pady=(5, 0))
+        
         self.status_label = ttk.Label(file_frame, text="No file loaded", 
                                      foreground="gray", wraplength=250)
         self.status_label.pack(pady=(5, 0))
@@ -543,35 +971,112 @@ class PlayerAnalyzer:
         
         self.role_var = tk.StringVar()
         self.role_dropdown = ttk.Combobox(role_frame, textvariable=self.role_var, 
-                                         values=list(self.roles_data.keys()),
+                                         values=self.roles,
                                          state='disabled', width=35)
         self.role_dropdown.pack(fill=tk.X, pady=(5, 10))
+        self.role_dropdown.bind('<<ComboboxSelected>>', self.on_role_change)
         
         self.analyze_button = ttk.Button(role_frame, text="Analyze Players", 
                                         command=self.analyze_role, state='disabled')
         self.analyze_button.pack(fill=tk.X)
         
+        self.all_roles_button = ttk.Button(role_frame, text="Score All Roles", 
+                                          command=self.analyze_all_roles, state='disabled')
+        self.all_roles_button.pack(fill=tk.X, pady=(5, 0))
+        
+        self.squad_button = ttk.Button(role_frame, text="Pick Squad...",
+                                       command=self.open_squad_dialog, state='disabled')
+        self.squad_button.pack(fill=tk.X, pady=(5, 0))
+        
+        self.tune_button = ttk.Button(role_frame, text="Tune Weights...",
+                                      command=self.tune_weights, state='disabled')
+        self.tune_button.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Button(role_frame, text="Load Role Definitions (JSON/TOML)",
+                   command=self.load_role_files).pack(fill=tk.X, pady=(5, 0))
+        
+        top_frame = ttk.Frame(role_frame)
+        top_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(top_frame, text="Show top (0 = all):").pack(side=tk.LEFT)
+        self.top_var = tk.StringVar(value=str(DEFAULT_TOP))
+        ttk.Spinbox(top_frame, from_=0, to=1000000, increment=50, width=8,
+                    textvariable=self.top_var).pack(side=tk.RIGHT)
+        
+        # Rank spread from sampling every scouted range (see rank_sampling)
+        samples_frame = ttk.Frame(role_frame)
+        samples_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(samples_frame, text="Rank samples (0 = off):").pack(side=tk.LEFT)
+        self.samples_var = tk.StringVar(value='0')
+        ttk.Spinbox(samples_frame, from_=0, to=10000, increment=100, width=8,
+                    textvariable=self.samples_var).pack(side=tk.RIGHT)
+        
+        # Filters section; filters apply to the next analysis, or now with Apply/Enter
+        filter_frame = ttk.LabelFrame(sidebar, text="Filters", padding="10")
+        filter_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        ttk.Label(filter_frame, text="Attributes (e.g. Pac >= 15, Acc >= 14):").pack(anchor='w')
+        self.conditions_var = tk.StringVar()
+        conditions_entry = ttk.Entry(filter_frame, textvariable=self.conditions_var)
+        conditions_entry.pack(fill=tk.X, pady=(2, 5))
+        
+        known_frame = ttk.Frame(filter_frame)
+        known_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(known_frame, text="Min % known (importance 5):").pack(side=tk.LEFT)
+        self.known_var = tk.StringVar(value='0')
+        ttk.Spinbox(known_frame, from_=0, to=100, increment=10, width=5,
+                    textvariable=self.known_var).pack(side=tk.RIGHT)
+        
+        ttk.Label(filter_frame, text="Name contains:").pack(anchor='w')
+        self.name_filter_var = tk.StringVar()
+        name_entry = ttk.Entry(filter_frame, textvariable=self.name_filter_var)
+        name_entry.pack(fill=tk.X, pady=(2, 5))
+        
+        for entry in (conditions_entry, name_entry):
+            entry.bind('<Return>', lambda event: self.apply_filters())
+        
+        filter_buttons = ttk.Frame(filter_frame)
+        filter_buttons.pack(fill=tk.X)
+        ttk.Button(filter_buttons, text="Apply Filters",
+                   command=self.apply_filters).pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(filter_buttons, text="Clear",
+                   command=self.clear_filters).pack(side=tk.LEFT, padx=(5, 0))
+        
         # Export section
         export_frame = ttk.LabelFrame(sidebar, text="Export", padding="10")
         export_frame.pack(fill=tk.X, pady=(0, 15))
         
-        self.export_button = ttk.Button(export_frame, text="Export to CSV", 
+        self.export_button = ttk.Button(export_frame, text="Export Results (CSV/Parquet/JSONL)", 
                                        command=self.export_results, state='disabled')
         self.export_button.pack(fill=tk.X)
         
+        # Every attribute's abs/est/best/importance, as exports have always had, or just the table's
+        self.full_columns_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(export_frame, text="All attribute columns",
+                        variable=self.full_columns_var).pack(anchor='w', pady=(5, 0))
+        
+        self.report_button = ttk.Button(export_frame, text="Save Chart Reports (PNG/PDF)",
+                                       command=self.export_reports, state='disabled')
+        self.report_button.pack(fill=tk.X, pady=(5, 0))
+        
         # Instructions
         instructions_frame = ttk.LabelFrame(sidebar, text="Instructions", padding="10")
         instructions_frame.pack(fill=tk.BOTH, expand=True)
         
-        instructions_text = """1. Load your HTML player data file
+        instructions_text = """1. Load your HTML player data file; merge newer exports of the same players to keep the most precise values
+
+2. Select a position from the dropdown; custom roles can be loaded from JSON/TOML files and are reloaded when the files change
+
+3. Click 'Analyze Players' to see results, with pessimistic and optimistic ratings from scouted ranges; rank samples add each player's rank spread. 'Tune Weights...' re-ranks them live as you drag group and attribute sliders
+
+4. Or click 'Score All Roles' to see each player's best role; the dropdown then switches roles instantly. 'Pick Squad...' fills a formation's slots with the best combination of players, with backups
 
-2. Select a position from the dropdown
+5. Narrow the players with filters, e.g. Pac >= 15, Acc >= 14 (the known % applies to single roles)
 
-3. Click 'Analyze Players' to see results
+6. Click column headers to sort, or type a name into 'Find player' to jump to a player
 
-4. Click column headers to sort
+7. Ctrl-click players to compare them with the selected one (up to 10, as bars or radar); Esc clears. Right-click a player to find the most similar players for the role
 
-5. Export results to CSV if needed
+8. Export results to CSV, Parquet or JSON Lines, or save a chart per player as a PDF or PNG files
 
 Players are ranked by weighted scores based on position requirements."""
         
@@ -590,50 +1095,55 @@ Players are ranked by weighted scores based on position requirements."""
                                       font=("Arial", 12, "bold"))
         self.results_label.pack(side=tk.LEFT)
         
+        # Type-ahead player search over the loaded names
+        self.search_var = tk.StringVar()
+        self.search_box = ttk.Combobox(results_header, textvariable=self.search_var, width=30)
+        self.search_box.pack(side=tk.RIGHT)
+        self.search_box.bind('<KeyRelease>', self.on_search_typed)
+        self.search_box.bind('<<ComboboxSelected>>', self.on_search_chosen)
+        self.search_box.bind('<Return>', self.on_search_chosen)
+        ttk.Label(results_header, text="Find player:").pack(side=tk.RIGHT, padx=(0, 5))
+        
         # Results table with scrollbars
         table_frame = ttk.Frame(table_section)
         table_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create treeview with scrollbars
-        self.tree = ttk.Treeview(table_frame)
-        
-        # Bind selection event
-        self.tree.bind('<<TreeviewSelect>>', self.on_player_select)
-        
-        # Vertical scrollbar
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
-        
-        # Horizontal scrollbar
-        h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(xscrollcommand=h_scrollbar.set)
-        
-        # Pack scrollbars and treeview
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        table_frame.grid_rowconfigure(0, weight=1)
-        table_frame.grid_columnconfigure(0, weight=1)
+        # Create treeview with scrollbars; only the rows in view are items
+        self.table = VirtualTable(table_frame, on_select=self.on_player_select,
+                                  on_compare=self.on_compare, compare_limit=MAX_COMPARED - 1,
+                                  on_menu=self.show_player_menu)
+        self.tree = self.table.tree
         
         # === GRAPH SECTION ===
         
-        # Set up matplotlib
-        plt.style.use('default')
-        self.fig, self.ax = plt.subplots(figsize=(12, 4))
-        self.fig.patch.set_facecolor('white')
-        
-        # Create canvas
-        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_section)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Initialize with empty graph
-        self.clear_graph()
+        # The figure is only created for the first chart (ensure_chart);
+        # until then a placeholder of the same size holds its place
+        self.graph_section = graph_section
+        
+        # Bars or radar, for one player or a comparison
+        view_frame = ttk.Frame(graph_section)
+        view_frame.pack(fill=tk.X)
+        ttk.Label(view_frame, text="View:").pack(side=tk.LEFT)
+        self.view_var = tk.StringVar(value='bars')
+        for text, view in (("Bars", 'bars'), ("Radar", 'radar')):
+            ttk.Radiobutton(view_frame, text=text, value=view, variable=self.view_var,
+                            command=self.on_view_change).pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.graph_placeholder = tk.Frame(graph_section, height=400, background='white')
+        self.graph_placeholder.pack(fill=tk.BOTH, expand=True)
+        self.graph_placeholder.pack_propagate(False)
+        ttk.Label(self.graph_placeholder, text='Select a player to view attributes',
+                  font=("Arial", 12, "italic"), background='white').pack(expand=True)
         
         # Style the treeview
         ttk_style = ttk.Style()
         ttk_style.configure("Treeview.Heading", font=("Arial", 10, "bold"))
         ttk_style.configure("Treeview", font=("Arial", 9))
+        
+        # Warm the heavy imports up while the user picks a file
+        self.root.after(200, self.preload_modules)
+        self.root.after(POLL_INTERVAL, self.poll_jobs)
+        self.root.after(ROLE_CHECK_INTERVAL, self.check_role_files)
     
     def run(self):
         """Start the application"""
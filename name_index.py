@@ -0,0 +1,132 @@
+"""Name lookup and type-ahead search over a store's player names.
+
+Names are matched in a normalized form: case-folded, accents stripped and
+runs of spaces collapsed, so 'muller' finds 'Thomas Müller' and 'kane' finds
+'Harry Kane'. A NameIndex keeps:
+
+    first_rows      {exact name: first row}, for row_of
+    words           every word-start suffix of every normalized name
+                    ('harry kane', 'kane'), sorted, with its row, so a
+                    prefix of a full name or of a surname is a binary search
+    joined          the normalized names in one string, for substring search
+
+A substring is found with one C-level scan of joined rather than trigram
+posting lists, which cost far more memory to build in Python and would be
+no faster for the short queries typed into the search box.
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+# Separates names in the joined text (never part of a normalized name)
+NAME_SEPARATOR = '\n'
+
+# Sorts after every character a normalized name can hold
+PREFIX_END = '\U0010ffff'
+
+# A new word starts after each of these ('Palmer-Houlden', "O'Brien")
+WORD_BREAK = re.compile(r"[ '-]")
+
+
+def normalize(name):
+    """Case-, accent- and spacing-insensitive form of a name ('' for None)"""
+    if name is None:
+        return ''
+    text = str(name).casefold()
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text)
+                       if not unicodedata.combining(ch))
+    return ' '.join(text.split())
+
+
+class NameIndex:
+    """Hash, prefix and substring lookups over one list of names, built once"""
+
+    def __init__(self, names):
+        names = list(names)
+        self.first_rows = {}
+        for row, name in enumerate(names):
+            self.first_rows.setdefault(name, row)
+
+        normalized = [normalize(name) for name in names]
+
+        # Each name, then each later word of it: 'harry kane' -> 'harry kane', 'kane'
+        words, rows, whole = [], [], []
+        for row, name in enumerate(normalized):
+            words.append(name)
+            rows.append(row)
+            whole.append(True)
+            for match in WORD_BREAK.finditer(name):
+                words.append(name[match.end():])
+                rows.append(row)
+                whole.append(False)
+        words = np.array(words, dtype=str)
+        order = np.argsort(words, kind='stable')
+        self.words = words[order]
+        self.word_rows = np.array(rows, dtype=np.intp)[order]
+        self.whole = np.array(whole, dtype=bool)[order]  # The entry is the whole name
+
+        lengths = np.fromiter((len(name) + 1 for name in normalized), dtype=np.int64,
+                              count=len(normalized))
+        self.starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(normalized) else lengths
+        self.joined = NAME_SEPARATOR.join(normalized)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def row_of(self, name):
+        """Row of the first player with exactly this name, or None"""
+        return self.first_rows.get(name)
+
+    def contains(self, text):
+        """Sorted rows whose normalized name contains the normalized text"""
+        text = normalize(text)
+        if not text:
+            return np.arange(len(self), dtype=np.intp)
+        # Each hit maps to the name it starts in
+        hits = np.fromiter((match.start() for match in re.finditer(re.escape(text), self.joined)),
+                           dtype=np.int64)
+        return np.unique(np.searchsorted(self.starts, hits, 'right') - 1).astype(np.intp)
+
+    def search(self, query, limit=20):
+        """Up to limit rows for a typed query, best first.
+
+        Exact names come first, then names starting with the query, then
+        names with a later word starting with it ('kan' -> 'Harry Kane'),
+        then names containing it anywhere. The first three groups are in
+        alphabetical order, the last in row order.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        start = np.searchsorted(self.words, query, 'left')
+        exact_stop = np.searchsorted(self.words, query, 'right')
+        stop = np.searchsorted(self.words, query + PREFIX_END, 'left')
+        whole = self.whole[start:stop]
+        exact = np.zeros(stop - start, dtype=bool)
+        exact[:exact_stop - start] = True
+
+        groups = [self.word_rows[start:stop][whole & exact],
+                  self.word_rows[start:stop][whole & ~exact],
+                  self.word_rows[start:stop][~whole]]
+        found = []
+        seen = set()
+        for rows in groups:
+            # A name can hold several matching words, so look a little past limit
+            for row in rows[:limit * 2].tolist():
+                if row not in seen:
+                    seen.add(row)
+                    found.append(row)
+            if len(found) >= limit:
+                return found[:limit]
+
+        # Matches inside a word, in row order
+        for row in self.contains(query).tolist():
+            if row not in seen:
+                seen.add(row)
+                found.append(row)
+                if len(found) >= limit:
+                    break
+        return found
@@ -0,0 +1,167 @@
+"""On-disk cache of parsed exports, so reopening an unchanged file skips parsing.
+
+Each parsed export is kept as one uncompressed .npz PlayerStore archive
+(see PlayerStore.save) named after a hash of the file's contents. A small
+index maps (path, size, mtime) to that content hash, so an untouched file
+is found from a stat() alone; a file that was copied, moved or touched
+without being changed is hashed once and still hits. Entries are touched
+when used and the least recently used are evicted once the directory
+grows past max_bytes.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from player_store import PlayerStore
+
+# Bump when parsing or the archive layout changes, so old entries are ignored
+CACHE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bytes read per update while hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+INDEX_NAME = 'index.json'
+
+
+def default_cache_dir():
+    """Per-user cache directory (%LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere)"""
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    return os.path.join(base or os.path.join(os.path.expanduser('~'), '.cache'), 'player-scout')
+
+
+def content_hash(file_path):
+    """Hex digest of a file's contents and the cache version"""
+    digest = hashlib.blake2b(f'v{CACHE_VERSION}:'.encode(), digest_size=20)
+    with open(file_path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsed PlayerStores on disk, keyed by export path, size, mtime and content hash"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def entry_path(self, digest):
+        return os.path.join(self.directory, f'{digest}.npz')
+
+    def file_key(self, file_path):
+        stat = os.stat(file_path)
+        return f'{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}'
+
+    def read_index(self):
+        """{file key: content hash} for the files seen so far"""
+        try:
+            with open(os.path.join(self.directory, INDEX_NAME), encoding='utf-8') as handle:
+                index = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return index.get('files', {}) if index.get('version') == CACHE_VERSION else {}
+
+    def write_index(self, files):
+        data = json.dumps({'version': CACHE_VERSION, 'files': files}).encode('utf-8')
+        self.replace_atomically(os.path.join(self.directory, INDEX_NAME), '.json',
+                                lambda handle: handle.write(data))
+
+    def replace_atomically(self, path, suffix, write):
+        """Write to a temporary file next to path, then move it into place"""
+        os.makedirs(self.directory, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(dir=self.directory, suffix=suffix, delete=False)
+        try:
+            with handle:
+                write(handle)
+            os.replace(handle.name, path)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+
+    def lookup(self, file_path):
+        """(file key, content hash, cached store or None) for an export"""
+        key = self.file_key(file_path)
+        index = self.read_index()
+        digest = index.get(key) or content_hash(file_path)
+
+        path = self.entry_path(digest)
+        try:
+            store = PlayerStore.load(path)
+        except (OSError, ValueError, KeyError):
+            return key, digest, None
+
+        # Mark as recently used, and remember this path/size/mtime for next time
+        try:
+            os.utime(path)
+            if index.get(key) != digest:
+                self.remember(index, key, digest)
+                self.write_index(index)
+        except OSError:
+            pass
+        return key, digest, store
+
+    def get(self, file_path):
+        """The cached store for an export, or None"""
+        return self.lookup(file_path)[2]
+
+    def put(self, file_path, store, key=None, digest=None):
+        """Cache the store parsed from an export, evicting old entries if needed"""
+        key = key or self.file_key(file_path)
+        digest = digest or content_hash(file_path)
+        self.replace_atomically(self.entry_path(digest), '.npz', store.save)
+
+        index = self.read_index()
+        self.remember(index, key, digest)
+        self.evict(index)
+        self.write_index(index)
+
+    def remember(self, index, key, digest):
+        """Point a file key at a content hash, dropping older keys for the same path"""
+        path = key.rsplit('|', 2)[0]
+        for old in [old for old in index if old.rsplit('|', 2)[0] == path]:
+            del index[old]
+        index[key] = digest
+
+    def evict(self, index):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name[:-len('.npz')]))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        kept = {digest for _, _, digest in entries}
+        # Always keep the newest entry, even if it alone is over the limit
+        for _, size, digest in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(self.entry_path(digest))
+            except OSError:
+                continue
+            total -= size
+            kept.discard(digest)
+
+        # Forget file keys whose entry is gone
+        for key in [key for key, digest in index.items() if digest not in kept]:
+            del index[key]
+
+    def load(self, file_path, parse, progress=None):
+        """The store for an export: from the cache, or parse(file_path, progress) and cache it"""
+        key, digest, store = self.lookup(file_path)
+        if store is not None:
+            if progress is not None:
+                progress(1.0)
+            return store
+
+        store = parse(file_path, progress)
+        try:
+            self.put(file_path, store, key, digest)
+        except OSError:
+            pass  # A read-only or full cache directory only costs the speed-up
+        return store
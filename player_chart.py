@@ -0,0 +1,324 @@
+"""The player attribute chart, updated in place as the selection moves.
+
+Rebuilding the axes for every selected player (ax.clear(), new bars, value
+labels and legend, tight_layout and a full draw) made arrowing through the
+table sluggish. AttributeChart builds the axes decoration (ticks, grid,
+importance legend, layout) once per view and role, from a RoleGeometry
+cached per role; showing another player only sets bar heights, label text
+and the title.
+
+One player is drawn as bars coloured by importance. Up to MAX_PLAYERS can
+be compared, either as grouped bars or as a radar of the role's
+attributes, one colour per player; importance is then shown by the colour
+of the attribute labels. Each player's bars are one PolyCollection rather
+than a Rectangle per bar, so ten players draw in ten calls. Adding or
+removing a compared player only replaces the players' own artists and the
+players' legend.
+
+The per-player artists are animated, so a full draw (after a role or view
+change or a resize) leaves them out and the chart keeps a copy of that
+static background. A player change then restores the background, draws
+just the player artists over it and blits, instead of redrawing the axes,
+ticks and legend. The players' legend is part of the background, since
+drawing it is as slow as the bars; a change of compared players (not of
+their values) costs one full draw. Canvases that cannot blit fall back to
+draw_idle.
+
+A chart made with blit=False (for saving reports) animates nothing, so
+figure.savefig() draws it whole after update().
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Rectangle
+
+# Bar colour per importance; anything else is minor
+IMPORTANCE_COLORS = {5: '#d32f2f', 3: '#f57c00'}  # Red for critical, orange for moderate
+MINOR_COLOR = '#388e3c'  # Green for minor
+
+# One colour per compared player (matplotlib's tab10)
+PLAYER_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                 '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+# Most players drawn at once
+MAX_PLAYERS = len(PLAYER_COLORS)
+
+# FM attributes run 1-20; the y axis leaves room above for the value labels
+VALUE_LIMIT = 22
+
+# Gap between the top of a bar and its value label
+LABEL_OFFSET = 0.5
+
+# Share of each attribute's slot taken by its group of bars
+GROUP_WIDTH = 0.8
+
+VIEWS = ('bars', 'radar')
+
+
+def importance_color(importance):
+    return IMPORTANCE_COLORS.get(importance, MINOR_COLOR)
+
+
+class RoleGeometry:
+    """Attribute order, colours and positions for one role, computed once"""
+
+    def __init__(self, attributes):
+        self.labels = [attr for attr, _ in attributes]
+        self.colors = [importance_color(importance) for _, importance in attributes]
+        self.positions = np.arange(len(attributes))
+        # Radar spokes, with the first repeated to close each outline
+        self.angles = np.linspace(0, 2 * np.pi, len(attributes), endpoint=False)
+        self.closed_angles = np.append(self.angles, self.angles[:1])
+
+    def bar_lefts(self, count):
+        """Left edges of each of count players' bars, grouped around each position, and their width"""
+        width = GROUP_WIDTH / count
+        return [self.positions + (i - count / 2) * width for i in range(count)], width
+
+
+def bar_verts(lefts, width, values):
+    """(bars, 4, 2) corners of bars from 0 up to values"""
+    verts = np.empty((len(lefts), 4, 2))
+    verts[:, :2, 0] = lefts[:, None]
+    verts[:, 2:, 0] = lefts[:, None] + width
+    verts[:, :, 1] = 0
+    verts[:, 1:3, 1] = np.asarray(values)[:, None]
+    return verts
+
+
+class AttributeChart:
+    """Role attribute values of one or more players, reused from player to player"""
+
+    def __init__(self, figure, ax, canvas, blit=True):
+        self.figure = figure
+        self.ax = ax  # Axes of the bar view
+        self.polar = None  # Axes of the radar view, created when first shown
+        self.canvas = canvas
+        self.blit = blit  # Draw players over a saved background; off for saved figures
+        self.view = 'bars'
+        self.geometries = {}  # (role, attributes) -> RoleGeometry
+        self.layout = None  # (view, role, attributes) the decoration was built for
+        self.geometry = None
+        self.player_artists = []  # One list of artists per shown player
+        self.bar_lefts = []  # Left edges of each player's bars
+        self.bar_width = 1
+        self.player_names = []
+        self.player_legend = None
+        self.title = None
+        self.background = None  # The static chart saved after the last full draw
+        if blit:
+            self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    @property
+    def axes(self):
+        """The Axes of the current view"""
+        return self.polar if self.view == 'radar' else self.ax
+
+    def set_view(self, view):
+        """Switch between 'bars' and 'radar'; the next show() rebuilds the chart"""
+        if view not in VIEWS:
+            raise ValueError(f"Unknown chart view: {view}")
+        self.view = view
+        self.layout = None
+
+    def role_geometry(self, role, attributes):
+        key = (role, tuple(attributes))
+        if key not in self.geometries:
+            self.geometries[key] = RoleGeometry(attributes)
+        return self.geometries[key]
+
+    def build(self, role, attributes):
+        """Create the axes decoration of the current view for one role's attributes"""
+        if self.view == 'radar' and self.polar is None:
+            self.polar = self.figure.add_subplot(projection='polar')
+        self.ax.set_visible(self.view == 'bars')
+        if self.polar is not None:
+            self.polar.set_visible(self.view == 'radar')
+
+        geometry = self.geometry = self.role_geometry(role, attributes)
+        ax = self.axes
+        ax.clear()
+        self.player_artists = []
+        self.player_names = []
+        self.player_legend = None
+
+        if self.view == 'radar':
+            ax.set_xticks(geometry.angles)
+            ax.set_xticklabels(geometry.labels, fontsize=8)
+            ax.set_ylim(0, VALUE_LIMIT - 2)
+            ax.set_yticks([5, 10, 15, 20])
+            ax.tick_params(axis='y', labelsize=7)
+        else:
+            ax.set_xlabel('Attributes', fontweight='bold')
+            ax.set_ylabel('Values', fontweight='bold')
+            ax.set_xticks(geometry.positions)
+            ax.set_xticklabels(geometry.labels, rotation=45, ha='right')
+            ax.grid(True, alpha=0.3, axis='y')
+            # Bar collections do not autoscale, so the limits are fixed here
+            ax.set_xlim(-0.5, len(attributes) - 0.5)
+            ax.set_ylim(0, VALUE_LIMIT)
+        # Attribute labels carry the importance colour, since compared players have their own
+        for label, color in zip(ax.get_xticklabels(), geometry.colors):
+            label.set_color(color)
+
+        legend_elements = [
+            Rectangle((0, 0), 1, 1, facecolor=IMPORTANCE_COLORS[5], alpha=0.7, label='Critical (5)'),
+            Rectangle((0, 0), 1, 1, facecolor=IMPORTANCE_COLORS[3], alpha=0.7, label='Moderate (3)'),
+            Rectangle((0, 0), 1, 1, facecolor=MINOR_COLOR, alpha=0.7, label='Minor (1)')
+        ]
+        if self.view == 'radar':
+            legend = ax.legend(handles=legend_elements, loc='upper left', fontsize=8,
+                               bbox_to_anchor=(1.1, 1.1))
+        else:
+            legend = ax.legend(handles=legend_elements, loc='upper right', fontsize=8)
+        # Kept as a plain artist, so the players' legend does not replace it
+        ax.add_artist(legend)
+
+        # Titled with the role for now, so tight_layout leaves room for the player's title
+        self.title = ax.set_title(role, fontweight='bold', fontsize=12)
+        self.title.set_animated(self.blit)
+        # Layout depends on the tick labels, so it only changes with the role or view
+        self.figure.tight_layout()
+        self.layout = (self.view, role, tuple(attributes))
+        self.background = None
+
+    def animated_artists(self):
+        """The artists that change from player to player"""
+        return [artist for artists in self.player_artists for artist in artists] + [self.title]
+
+    def on_draw(self, event):
+        """After a full draw, keep the static chart and draw the current players over it"""
+        if self.layout is None or not self.canvas.supports_blit:
+            self.background = None
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.animated_artists():
+            self.figure.draw_artist(artist)
+
+    def add_players(self, players):
+        """Replace the player artists with new ones for [(name, values)] players"""
+        ax, geometry = self.axes, self.geometry
+        for artist in self.animated_artists()[:-1]:
+            artist.remove()
+        if self.player_legend is not None:
+            self.player_legend.remove()
+        self.player_artists = []
+        self.player_names = []
+        self.player_legend = None
+        self.background = None  # The players' legend is part of the background
+
+        single = len(players) == 1
+        self.bar_lefts, self.bar_width = geometry.bar_lefts(len(players))
+        handles = []
+        for i, (name, values) in enumerate(players):
+            color = PLAYER_COLORS[i % len(PLAYER_COLORS)]
+            if self.view == 'radar':
+                closed = np.append(values, values[:1])
+                line, = ax.plot(geometry.closed_angles, closed, color=color, linewidth=1.5)
+                fill, = ax.fill(geometry.closed_angles, closed, color=color, alpha=0.1)
+                artists = [line, fill]
+            elif single:
+                # One player keeps the importance-coloured bars and value labels
+                bars = PolyCollection(bar_verts(self.bar_lefts[i], self.bar_width, values),
+                                      facecolors=geometry.colors, alpha=0.7,
+                                      edgecolors='black', linewidths=0.5)
+                labels = [ax.text(x, 0, '', ha='center', va='bottom', fontsize=8)
+                          for x in geometry.positions]
+                artists = [ax.add_collection(bars, autolim=False)] + labels
+            else:
+                bars = PolyCollection(bar_verts(self.bar_lefts[i], self.bar_width, values),
+                                      facecolors=color, alpha=0.8,
+                                      edgecolors='black', linewidths=0.3)
+                artists = [ax.add_collection(bars, autolim=False)]
+            for artist in artists:
+                artist.set_animated(self.blit)
+            self.player_artists.append(artists)
+            handles.append(Rectangle((0, 0), 1, 1, facecolor=color, alpha=0.8, label=name))
+
+        if not single:
+            if self.view == 'radar':
+                self.player_legend = ax.legend(handles=handles, loc='upper right', fontsize=8,
+                                               bbox_to_anchor=(-0.1, 1.1))
+            else:
+                self.player_legend = ax.legend(handles=handles, loc='upper left', fontsize=8,
+                                               ncol=2)
+        self.player_names = [name for name, _ in players]
+
+    def set_names(self, names):
+        """Relabel the players' legend (a full draw, as it is part of the background)"""
+        if self.player_legend is not None:
+            for text, name in zip(self.player_legend.get_texts(), names):
+                text.set_text(name)
+            self.background = None
+        self.player_names = list(names)
+
+    def set_values(self, index, values):
+        """Point one player's existing artists at new values"""
+        artists = self.player_artists[index]
+        if self.view == 'radar':
+            line, fill = artists
+            closed = np.append(values, values[:1])
+            line.set_ydata(closed)
+            fill.set_xy(np.column_stack([self.geometry.closed_angles, closed]))
+            return
+
+        artists[0].set_verts(bar_verts(self.bar_lefts[index], self.bar_width, values))
+        # Value labels (single player only)
+        for label, value in zip(artists[1:], values):
+            label.set_y(value + LABEL_OFFSET)
+            label.set_text(f'{value:.1f}')
+
+    def show(self, title, role, attributes, players):
+        """Show [(name, values)] players for a role's [(abbreviation, importance)] attributes"""
+        if not attributes or not players:
+            self.show_message('No data to display')
+            return
+        self.update(title, role, attributes, players)
+
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.animated_artists():
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def update(self, title, role, attributes, players):
+        """Set up the artists for these players without drawing"""
+        players = players[:MAX_PLAYERS]
+        if self.layout != (self.view, role, tuple(attributes)):
+            self.build(role, attributes)
+
+        # Another player only moves the artists; another number of players replaces them
+        names = [name for name, _ in players]
+        if len(players) != len(self.player_artists):
+            self.add_players(players)
+        elif names != self.player_names:
+            self.set_names(names)
+        for i, (_, values) in enumerate(players):
+            self.set_values(i, values)
+        self.title.set_text(title)
+
+        # Out-of-range cells (a broken export) still fit, at the cost of a full draw
+        highest = max(max(values) for _, values in players)
+        if self.view == 'radar':
+            limit = max(VALUE_LIMIT - 2, highest)
+        else:
+            limit = max(VALUE_LIMIT, highest + 2)
+        if self.axes.get_ylim() != (0, limit):
+            self.axes.set_ylim(0, limit)
+            self.background = None
+
+    def show_message(self, text, **style):
+        """Replace the chart with a line of text"""
+        if self.polar is not None:
+            self.polar.set_visible(False)
+        self.ax.set_visible(True)
+        self.ax.clear()
+        self.layout = None
+        self.player_artists = []
+        self.player_names = []
+        self.player_legend = None
+        self.background = None
+        self.ax.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center',
+                     transform=self.ax.transAxes, fontsize=12, **style)
+        self.canvas.draw_idle()
@@ -0,0 +1,243 @@
+"""Memory-mapped player database for player lists too big to hold in memory.
+
+A database is a directory of fixed-width binary files, one row per player,
+that mirror a PlayerStore's arrays:
+
+    header.json         format version, player count, attribute and metadata columns
+    low.u8, high.u8     uint8 (players x attributes) range bounds
+    abs_bits.u8         uint8 (players x ceil(attributes / 8)) absolute-value bitmask
+    names.off/.txt      int64 offsets (players + 1) into UTF-8 text, one string per player
+    metadata_<i>.off/.txt
+                        the same for each metadata column
+
+Strings are stored back to back; a cell holding just MISSING is None.
+build_database streams exports into this format a chunk of rows at a time,
+and PlayerDatabase maps it read-only. Scoring walks the attribute matrix
+through fresh maps of chunk_rows rows at a time (dense_chunks), so the
+resident attribute data stays at one chunk however many players there are;
+only the per-player result columns grow with the database. Rank sampling
+and similar-player searches stream a role's columns the same way
+(bound_chunks); merging and weight tuning need the players in memory and
+refuse a database.
+"""
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+from export_parser import iter_export_rows, pad_record
+from player_store import PlayerStore, dense_bounds
+
+FORMAT_VERSION = 1
+
+# Players per scoring chunk (about 9 MB of dense float32 with 47 attributes)
+CHUNK_ROWS = 16384
+
+# Stored in place of a None string
+MISSING = '\x00'
+
+HEADER_NAME = 'header.json'
+
+
+def map_array(path, dtype, shape, offset=0):
+    """Read-only memory map of a file, or an empty array for an empty one"""
+    if not all(shape):
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+class StringColumn:
+    """A read-only column of str/None stored as UTF-8 text plus int64 offsets"""
+
+    def __init__(self, directory, name, length):
+        self.offsets = map_array(os.path.join(directory, f'{name}.off'), np.int64, (length + 1,))
+        text_path = os.path.join(directory, f'{name}.txt')
+        self.text = map_array(text_path, np.uint8, (os.path.getsize(text_path),))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def value(self, row):
+        text = bytes(self.text[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+        return None if text == MISSING else text
+
+    def __getitem__(self, rows):
+        """One value for an int, an object array for a slice or an array of rows"""
+        if isinstance(rows, (int, np.integer)):
+            return self.value(rows)
+        rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows)
+        values = np.empty(len(rows), dtype=object)
+        values[:] = [self.value(row) for row in rows.tolist()]
+        return values
+
+    def tolist(self):
+        return self[:].tolist()
+
+
+class DatabaseWriter:
+    """Append PlayerStores with the same columns to a new database directory"""
+
+    def __init__(self, directory, attributes, metadata_columns=()):
+        self.directory = directory
+        self.attributes = list(attributes)
+        self.metadata_columns = list(metadata_columns)
+        self.count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Remove any old header first, so a half-written database is never opened
+        if os.path.exists(os.path.join(directory, HEADER_NAME)):
+            os.unlink(os.path.join(directory, HEADER_NAME))
+
+        self.files = {name: open(os.path.join(directory, f'{name}.u8'), 'wb')
+                      for name in ('low', 'high', 'abs_bits')}
+        self.strings = {}  # Column name -> [offsets file, text file, bytes written]
+        for name in self.string_columns():
+            offsets = open(os.path.join(directory, f'{name}.off'), 'wb')
+            offsets.write(np.zeros(1, dtype=np.int64).tobytes())
+            self.strings[name] = [offsets, open(os.path.join(directory, f'{name}.txt'), 'wb'), 0]
+
+    def string_columns(self):
+        return ['names'] + [f'metadata_{i}' for i in range(len(self.metadata_columns))]
+
+    def append(self, store):
+        if store.attributes != self.attributes:
+            raise ValueError("Exports have different attribute columns")
+
+        for name in self.files:
+            self.files[name].write(np.ascontiguousarray(getattr(store, name)).tobytes())
+
+        columns = [store.names] + [store.metadata.get(col, np.full(len(store), None, dtype=object))
+                                   for col in self.metadata_columns]
+        for name, values in zip(self.string_columns(), columns):
+            encoded = [(MISSING if value is None else str(value)).encode('utf-8')
+                       for value in values]
+            offsets, text, written = self.strings[name]
+            ends = written + np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            offsets.write(ends.tobytes())
+            text.write(b''.join(encoded))
+            self.strings[name][2] = int(ends[-1]) if len(ends) else written
+
+        self.count += len(store)
+
+    def close(self):
+        """Flush everything and write the header, which makes the database readable"""
+        self.abort()
+        header = {'version': FORMAT_VERSION, 'players': self.count,
+                  'attributes': self.attributes, 'metadata': self.metadata_columns}
+        with open(os.path.join(self.directory, HEADER_NAME), 'w', encoding='utf-8') as handle:
+            json.dump(header, handle)
+
+    def abort(self):
+        """Close the files without writing a header, leaving the database unreadable"""
+        for handle in self.files.values():
+            handle.close()
+        for offsets, text, _ in self.strings.values():
+            offsets.close()
+            text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def build_database(directory, export_paths, chunk_rows=CHUNK_ROWS, progress=None):
+    """Stream FM HTML exports into a database, chunk_rows players at a time; returns the count"""
+    writer = None
+    try:
+        for i, export_path in enumerate(export_paths):
+            file_progress = None
+            if progress is not None:
+                file_progress = lambda fraction, i=i: progress((i + fraction) / len(export_paths))
+
+            rows = iter_export_rows(export_path, progress=file_progress)
+            header = next(rows)
+            while True:
+                batch = [pad_record(row, len(header)) for row in islice(rows, chunk_rows)]
+                if not batch:
+                    break
+                store = PlayerStore.from_rows(header, batch)
+                if writer is None:
+                    writer = DatabaseWriter(directory, store.attributes, list(store.metadata))
+                writer.append(store)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    if writer is None:
+        raise ValueError("No players found in the exports")
+    writer.close()
+    return writer.count
+
+
+class PlayerDatabase(PlayerStore):
+    """A PlayerStore whose arrays are memory-mapped from a database directory.
+
+    Row lookups (result columns for the rows on screen, one player's graph)
+    read just those rows; scoring streams the whole matrix in chunks.
+    """
+
+    in_memory = False
+
+    def __init__(self, directory, chunk_rows=CHUNK_ROWS):
+        with open(os.path.join(directory, HEADER_NAME), encoding='utf-8') as handle:
+            header = json.load(handle)
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported player database version in {directory}")
+
+        # Not PlayerStore.__init__: nothing here is loaded into memory
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.count = header['players']
+        self.attributes = header['attributes']
+        self.columns = {attr: i for i, attr in enumerate(self.attributes)}
+        self.names = StringColumn(directory, 'names', self.count)
+        self.metadata = {col: StringColumn(directory, f'metadata_{i}', self.count)
+                         for i, col in enumerate(header['metadata'])}
+
+        self.low = self.map('low')
+        self.high = self.map('high')
+        self.abs_bits = self.map('abs_bits')
+        self._dense = None
+        self._identity = None
+        self._name_index = None
+
+    def __len__(self):
+        return self.count
+
+    def map(self, name, start=0, stop=None):
+        """Map rows start:stop of one of the attribute matrices"""
+        stop = self.count if stop is None else stop
+        width = (len(self.attributes) + 7) // 8 if name == 'abs_bits' else len(self.attributes)
+        return map_array(os.path.join(self.directory, f'{name}.u8'), np.uint8,
+                         (stop - start, width), offset=start * width)
+
+    def dense_chunks(self, rows=None):
+        """Dense stacks of chunk_rows players at a time, mapped fresh so each chunk is released"""
+        count = self.count if rows is None else len(rows)
+        for start in range(0, count, self.chunk_rows):
+            stop = min(start + self.chunk_rows, count)
+            if rows is None:
+                bounds = [self.map(name, start, stop) for name in ('low', 'high', 'abs_bits')]
+            else:
+                part = rows[start:stop]
+                bounds = [self.low[part], self.high[part], self.abs_bits[part]]
+            yield slice(start, stop), dense_bounds(*bounds, len(self.attributes))
+
+    def bound_chunks(self, columns, rows=None):
+        """Low and high bounds of some columns, chunk_rows players at a time"""
+        count = self.count if rows is None else len(rows)
+        for start in range(0, count, self.chunk_rows):
+            stop = min(start + self.chunk_rows, count)
+            if rows is None:
+                low, high = self.map('low', start, stop), self.map('high', start, stop)
+            else:
+                part = rows[start:stop]
+                low, high = self.low[part], self.high[part]
+            yield slice(start, stop), low[:, columns], high[:, columns]
@@ -0,0 +1,193 @@
+"""Indexed player filters for the sidebar, resolved to store rows before scoring.
+
+A filter is a list of predicates, all of which must hold:
+
+    AttributeFilter     an attribute's best value against a number ("Pac >= 15")
+    KnownFilter         the percentage of some attributes whose value is known
+                        ("at least 80% of the importance 5 attributes")
+    NameFilter          the name contains some text, ignoring case and accents
+
+A FilterIndex over a store keeps, built on first use, each filtered
+attribute's rows sorted by value and the same for each known-count; names
+are searched through the store's NameIndex. Every predicate can count and
+list its matches from these by binary search (or one substring search)
+without touching other rows; select() lists the matches of the most selective
+predicate only and tests the others on those rows alone.
+"""
+import operator
+import re
+
+import numpy as np
+
+from name_index import normalize
+
+# Comparison operators accepted in conditions ('=' and the Unicode forms included)
+OPERATORS = {'>=': operator.ge, '≥': operator.ge, '<=': operator.le, '≤': operator.le,
+             '>': operator.gt, '<': operator.lt, '==': operator.eq, '=': operator.eq}
+
+CONDITION_PATTERN = re.compile(r'^\s*([^\s<>=≥≤]+)\s*(>=|<=|==|[≥≤<>=])\s*(\d+(?:\.\d+)?)\s*$')
+
+
+def sorted_range(keys, op, key):
+    """(start, stop) of the sorted keys for which keys op key holds"""
+    if op is operator.ge:
+        return np.searchsorted(keys, key, 'left'), len(keys)
+    if op is operator.gt:
+        return np.searchsorted(keys, key, 'right'), len(keys)
+    if op is operator.le:
+        return 0, np.searchsorted(keys, key, 'right')
+    if op is operator.lt:
+        return 0, np.searchsorted(keys, key, 'left')
+    return np.searchsorted(keys, key, 'left'), np.searchsorted(keys, key, 'right')
+
+
+class FilterIndex:
+    """Lazily built sorted indexes over one store's values"""
+
+    def __init__(self, store):
+        self.store = store
+        self._sorted = {}  # Key name -> (rows sorted by key, sorted keys)
+        self._name_rows = {}  # Normalized text -> rows whose name contains it
+
+    def __len__(self):
+        return len(self.store)
+
+    def doubled_values(self, attr, rows=None):
+        """Twice the best values of one attribute (low + high), as exact integers"""
+        col = self.store.columns[attr]
+        if rows is None:
+            return self.store.low[:, col] + self.store.high[:, col].astype(np.uint16)
+        return self.store.low[rows, col] + self.store.high[rows, col].astype(np.uint16)
+
+    def known_counts(self, attributes, rows=None):
+        """How many of the attributes each player has a known value for"""
+        counts = np.zeros(len(self.store) if rows is None else len(rows), dtype=np.uint8)
+        for attr in attributes:
+            counts += self.store.is_absolute(attr, rows)
+        return counts
+
+    def sorted_keys(self, name, compute):
+        """(rows sorted by key, sorted keys) for a key column, computed once with compute()"""
+        if name not in self._sorted:
+            keys = compute()
+            order = np.argsort(keys, kind='stable')
+            self._sorted[name] = (order, keys[order])
+        return self._sorted[name]
+
+    def name_rows(self, text):
+        """Sorted rows whose name contains text (cached per text)"""
+        if text not in self._name_rows:
+            self._name_rows[text] = self.store.name_index().contains(text)
+        return self._name_rows[text]
+
+
+class AttributeFilter:
+    """An attribute's best value compared with a number, e.g. Pac >= 15"""
+
+    def __init__(self, attr, op, value):
+        self.attr = attr
+        self.op = OPERATORS[op]
+        self.symbol = op
+        # Best values are halves, so compare twice the value with low + high exactly
+        self.key = value * 2
+
+    def __repr__(self):
+        return f'AttributeFilter({self.attr!r}, {self.symbol!r}, {self.key / 2:g})'
+
+    def index(self, index):
+        return index.sorted_keys(('value', self.attr), lambda: index.doubled_values(self.attr))
+
+    def count(self, index):
+        start, stop = sorted_range(self.index(index)[1], self.op, self.key)
+        return stop - start
+
+    def rows(self, index):
+        order, keys = self.index(index)
+        start, stop = sorted_range(keys, self.op, self.key)
+        return np.sort(order[start:stop])
+
+    def test(self, index, rows):
+        return self.op(index.doubled_values(self.attr, rows), self.key)
+
+
+class KnownFilter:
+    """At least a percentage of some attributes have known (absolute) values"""
+
+    def __init__(self, attributes, minimum_pct):
+        self.attributes = tuple(attributes)
+        # Smallest whole number of known attributes that reaches the percentage
+        self.minimum = int(np.ceil(len(self.attributes) * minimum_pct / 100 - 1e-9))
+
+    def __repr__(self):
+        return f'KnownFilter({self.attributes!r}, minimum={self.minimum})'
+
+    def index(self, index):
+        return index.sorted_keys(('known', self.attributes),
+                                 lambda: index.known_counts(self.attributes))
+
+    def count(self, index):
+        keys = self.index(index)[1]
+        return len(keys) - np.searchsorted(keys, self.minimum, 'left')
+
+    def rows(self, index):
+        order, keys = self.index(index)
+        return np.sort(order[np.searchsorted(keys, self.minimum, 'left'):])
+
+    def test(self, index, rows):
+        return index.known_counts(self.attributes, rows) >= self.minimum
+
+
+class NameFilter:
+    """The player's name contains some text, ignoring case and accents"""
+
+    def __init__(self, text):
+        self.text = normalize(text)
+
+    def __repr__(self):
+        return f'NameFilter({self.text!r})'
+
+    def count(self, index):
+        return len(index.name_rows(self.text))
+
+    def rows(self, index):
+        return index.name_rows(self.text)
+
+    def test(self, index, rows):
+        names = index.store.names[rows]
+        return np.array([self.text in normalize(name) for name in names], dtype=bool)
+
+
+def parse_conditions(text, attributes):
+    """Parse 'Pac >= 15, Acc >= 14' into AttributeFilters over the given attribute columns.
+
+    Raises ValueError naming the first condition that cannot be used.
+    """
+    filters = []
+    for condition in re.split(r'[,;]|\band\b', text):
+        if not condition.strip():
+            continue
+        match = CONDITION_PATTERN.match(condition)
+        if match is None:
+            raise ValueError(f"Cannot read condition '{condition.strip()}' (try e.g. 'Pac >= 15')")
+        attr, op, value = match.groups()
+        # Abbreviations are matched ignoring case, so 'pac' finds 'Pac'
+        column = next((col for col in attributes if col.lower() == attr.lower()), None)
+        if column is None:
+            raise ValueError(f"Unknown attribute '{attr}'")
+        filters.append(AttributeFilter(column, op, float(value)))
+    return filters
+
+
+def select(index, predicates):
+    """Sorted store rows matching every predicate, or None when there are no predicates"""
+    if not predicates:
+        return None
+
+    # List the most selective predicate's matches and only test the rest on those
+    predicates = sorted(predicates, key=lambda predicate: predicate.count(index))
+    rows = predicates[0].rows(index)
+    for predicate in predicates[1:]:
+        if not len(rows):
+            break
+        rows = rows[predicate.test(index, rows)]
+    return rows
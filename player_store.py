@@ -0,0 +1,374 @@
+"""Compact columnar storage for parsed player attributes.
+
+Instead of two float/object pandas columns per attribute (X_abs, X_est), a
+PlayerStore keeps:
+
+    low, high   uint8 (players x attributes) range bounds; a known value is
+                stored as a zero-width range, so low == high == value
+    abs_bits    uint8 (players x ceil(attributes / 8)) bitmask, bit set when
+                the value is absolute (known) rather than estimated
+    names       object array of player names
+    metadata    the remaining raw columns of the export (Inf, L Th, ...)
+
+abs, est and best (what analyze_role ranks on) are derived on demand:
+abs = low where the bit is set else 0, est = best = (low + high) / 2.
+
+Memory per 10,000 players with the 47 attributes of a standard export:
+low + high 940 KB, abs_bits 60 KB, so under 1 MB of attribute data against
+~7.5 MB for the float64 X_abs/X_est columns (before any per-role copies).
+Names and metadata are Python strings and cost the same as before.
+
+Successive exports of the same players are combined with merge, which keeps
+the most precise value seen for each attribute.
+"""
+from itertools import chain
+from operator import itemgetter
+
+import numpy as np
+
+from attribute_parser import parse_attribute_bounds_block, parse_cell_bounds
+
+# Column that identifies a player across exports when FM is asked to include it
+UID_COLUMN = 'UID'
+
+# Columns of an export that are never attributes
+NON_ATTRIBUTE_COLUMNS = ['Name', 'Inf', UID_COLUMN]
+
+# Range width given to unscouted cells when comparing precision
+UNKNOWN_WIDTH = 256
+
+
+def attribute_columns_of(columns):
+    """Pick the attribute columns out of an export's header (abbreviations up to 3 characters)"""
+    return [col for col in columns
+            if col not in NON_ATTRIBUTE_COLUMNS and len(col) <= 3]
+
+
+def text_arrays(values):
+    """Split an object array of str/None into a fixed-width str array and a None mask"""
+    missing = np.array([value is None for value in values], dtype=bool)
+    text = np.array(['' if value is None else value for value in values], dtype=str)
+    return text, missing
+
+
+def object_array(text, missing):
+    """Inverse of text_arrays"""
+    values = text.astype(object)
+    values[missing] = None
+    return values
+
+
+def precision(low, high, absolute):
+    """Range width of each cell: -1 when known, UNKNOWN_WIDTH when not scouted (lower is better).
+
+    A malformed range with high < low (e.g. from "14-7") counts as not scouted.
+    """
+    width = np.maximum(high.astype(np.int16) - low, 0)
+    width[absolute] = -1
+    width[~absolute & ((high == 0) | (high < low))] = UNKNOWN_WIDTH
+    return width
+
+
+def dense_bounds(low, high, abs_bits, n_attributes):
+    """Best values, the absolute mask and low bounds of some rows as a float32 (3 x rows x attributes) stack"""
+    dense = np.empty((3, len(low), n_attributes), dtype=np.float32)
+    np.add(low, high, out=dense[0], dtype=np.float32)
+    dense[0] /= 2
+    dense[1] = np.unpackbits(abs_bits, axis=1, count=n_attributes).view(bool)
+    dense[2] = low
+    return dense
+
+
+def pack_bounds(abs_values, low, high):
+    """Turn parsed (abs, low, high) int arrays into the store's uint8 matrices and bitmask"""
+    # FM attributes are 1-20; anything outside uint8 is a broken cell
+    low = np.clip(low, 0, 255).astype(np.uint8)
+    high = np.clip(high, 0, 255).astype(np.uint8)
+    abs_bits = np.packbits(abs_values > 0, axis=1)
+    return low, high, abs_bits
+
+
+class PlayerStore:
+    """Parsed attributes for a set of players, one row per player"""
+
+    # Whether the attribute arrays are held in memory; whole-matrix copies are
+    # only made of a store that is (see player_db.PlayerDatabase)
+    in_memory = True
+
+    def __init__(self, names, attributes, low, high, abs_bits, metadata=None):
+        self.names = np.asarray(names, dtype=object)
+        self.attributes = list(attributes)
+        self.low = low
+        self.high = high
+        self.abs_bits = abs_bits
+        self.metadata = metadata or {}
+
+        # Attribute abbreviation -> column position
+        self.columns = {attr: i for i, attr in enumerate(self.attributes)}
+
+        # Dense float32 [best, absolute, low] stack for matrix scoring, built on first use
+        self._dense = None
+
+        # (identity column, {(identity, occurrence): row}) for merge, built on first use
+        self._identity = None
+
+        # NameIndex over names for lookups and search, built on first use
+        self._name_index = None
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        """Build a store from an export's header and rows of str/None cells, without pandas"""
+        attributes = attribute_columns_of(header)
+        positions = [header.index(attr) for attr in attributes]
+        n_rows, n_cols = len(rows), len(attributes)
+
+        if n_rows and n_cols:
+            # Pull the attribute cells out row by row into one flat list
+            pick = itemgetter(*positions) if n_cols > 1 else (lambda row: (row[positions[0]],))
+            cells = list(chain.from_iterable(map(pick, rows)))
+            parsed = [values.reshape(n_rows, n_cols) for values in parse_cell_bounds(cells)]
+        else:
+            parsed = [np.zeros((n_rows, n_cols), dtype=np.int64) for _ in range(3)]
+
+        name_position = header.index('Name')
+        metadata = {}
+        for position, col in enumerate(header):
+            if col != 'Name' and col not in attributes:
+                metadata[col] = np.array([row[position] for row in rows], dtype=object)
+
+        names = np.array([row[name_position] for row in rows], dtype=object)
+        return cls(names, attributes, *pack_bounds(*parsed), metadata)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build a store from a raw export DataFrame (one string cell per attribute)"""
+        attributes = attribute_columns_of(df.columns)
+        parsed = parse_attribute_bounds_block(df, attributes)
+
+        metadata = {col: df[col].to_numpy(dtype=object) for col in df.columns
+                    if col != 'Name' and col not in attributes}
+
+        return cls(df['Name'].to_numpy(dtype=object), attributes, *pack_bounds(*parsed), metadata)
+
+    @classmethod
+    def concat(cls, stores):
+        """Stack stores with the same attribute columns into one"""
+        first = stores[0]
+        for store in stores[1:]:
+            if store.attributes != first.attributes:
+                raise ValueError("Exports have different attribute columns")
+
+        metadata = {}
+        for col in first.metadata:
+            if all(col in store.metadata for store in stores):
+                metadata[col] = np.concatenate([store.metadata[col] for store in stores])
+
+        return cls(np.concatenate([store.names for store in stores]), first.attributes,
+                   np.concatenate([store.low for store in stores]),
+                   np.concatenate([store.high for store in stores]),
+                   np.concatenate([store.abs_bits for store in stores]), metadata)
+
+    def save(self, file):
+        """Write the store to an uncompressed .npz archive (no pickled objects)"""
+        arrays = {'attributes': np.array(self.attributes, dtype=str),
+                  'low': self.low, 'high': self.high, 'abs_bits': self.abs_bits,
+                  'metadata_columns': np.array(list(self.metadata), dtype=str)}
+        arrays['names'], arrays['names_missing'] = text_arrays(self.names)
+        for i, values in enumerate(self.metadata.values()):
+            arrays[f'metadata_{i}'], arrays[f'metadata_{i}_missing'] = text_arrays(values)
+        np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, file):
+        """Read a store written by save"""
+        with np.load(file, allow_pickle=False) as archive:
+            metadata = {}
+            for i, col in enumerate(archive['metadata_columns'].tolist()):
+                metadata[col] = object_array(archive[f'metadata_{i}'],
+                                             archive[f'metadata_{i}_missing'])
+            return cls(object_array(archive['names'], archive['names_missing']),
+                       archive['attributes'].tolist(), archive['low'], archive['high'],
+                       archive['abs_bits'], metadata)
+
+    def __len__(self):
+        return len(self.names)
+
+    def identity_keys(self, column='Name'):
+        """(identity, occurrence) per row, so players with the same name still pair up in order"""
+        ids = self.names if column == 'Name' else self.metadata[column]
+        seen = {}
+        keys = []
+        for identity in ids.tolist():
+            occurrence = seen.get(identity, 0)
+            seen[identity] = occurrence + 1
+            keys.append((identity, occurrence))
+        return keys
+
+    def identity_index(self, column='Name'):
+        """{(identity, occurrence): row} (cached)"""
+        if self._identity is None or self._identity[0] != column:
+            self._identity = (column, {key: row for row, key in enumerate(self.identity_keys(column))})
+        return self._identity[1]
+
+    def aligned_bounds(self, attributes):
+        """(low, high, absolute) for the given attribute columns; columns it lacks are unscouted"""
+        if attributes == self.attributes:
+            return self.low, self.high, self.absolute_mask()
+
+        shape = (len(self), len(attributes))
+        low, high = np.zeros(shape, dtype=np.uint8), np.zeros(shape, dtype=np.uint8)
+        absolute = np.zeros(shape, dtype=bool)
+        mask = self.absolute_mask()
+        for i, attr in enumerate(attributes):
+            col = self.columns.get(attr)
+            if col is not None:
+                low[:, i], high[:, i], absolute[:, i] = self.low[:, col], self.high[:, col], mask[:, col]
+        return low, high, absolute
+
+    def merge(self, newer):
+        """Merge a newer export into this store, keeping the most precise value of each attribute.
+
+        Players are matched by UID when both exports have it, otherwise by
+        name. A known value beats a range, a narrower range beats a wider one
+        and on a tie the newer export wins. A matched player's metadata is the
+        newer export's, blanks included, in every column that export has.
+        Players only in the newer export are appended, so every existing row
+        keeps its position.
+
+        Returns (merged store, sorted rows of the merged store that are new or
+        whose attribute values changed).
+        """
+        by = UID_COLUMN if UID_COLUMN in self.metadata and UID_COLUMN in newer.metadata else 'Name'
+        rows = self.identity_index(by)
+        new_keys = {}
+        targets = np.empty(len(newer), dtype=np.intp)
+        added = len(self)
+        for i, key in enumerate(newer.identity_keys(by)):
+            row = rows.get(key)
+            if row is None:
+                row = new_keys[key] = added
+                added += 1
+            targets[i] = row
+
+        attributes = self.attributes + [attr for attr in newer.attributes if attr not in self.columns]
+        n_rows, n_new = added, added - len(self)
+
+        # Start from this store's values, with unscouted rows for the new players
+        old_low, old_high, old_abs = self.aligned_bounds(attributes)
+        low = np.concatenate([old_low, np.zeros((n_new, len(attributes)), dtype=np.uint8)])
+        high = np.concatenate([old_high, np.zeros((n_new, len(attributes)), dtype=np.uint8)])
+        absolute = np.concatenate([old_abs, np.zeros((n_new, len(attributes)), dtype=bool)])
+
+        # Take the newer value wherever it is at least as precise
+        new_low, new_high, new_abs = newer.aligned_bounds(attributes)
+        take = (precision(new_low, new_high, new_abs) <=
+                precision(low[targets], high[targets], absolute[targets]))
+        low[targets] = np.where(take, new_low, low[targets])
+        high[targets] = np.where(take, new_high, high[targets])
+        absolute[targets] = np.where(take, new_abs, absolute[targets])
+
+        names = np.concatenate([self.names, np.empty(n_new, dtype=object)])
+        names[targets] = newer.names
+
+        metadata = {}
+        for col in list(self.metadata) + [col for col in newer.metadata if col not in self.metadata]:
+            values = np.empty(n_rows, dtype=object)
+            if col in self.metadata:
+                values[:len(self)] = self.metadata[col]
+            if col in newer.metadata:
+                # Cleared cells too: an empty Inf is a player no longer injured
+                values[targets] = newer.metadata[col]
+            metadata[col] = values
+
+        merged = PlayerStore(names, attributes, low, high, np.packbits(absolute, axis=1), metadata)
+        if new_keys:
+            merged._identity = (by, {**rows, **new_keys})
+        else:
+            merged._identity = (by, rows)
+
+        # New players, plus existing ones with any value changed
+        existing = np.sort(targets[targets < len(self)])
+        differs = ((low[existing] != old_low[existing]) | (high[existing] != old_high[existing]) |
+                   (absolute[existing] != old_abs[existing])).any(axis=1)
+        changed = np.concatenate([existing[differs], np.arange(len(self), n_rows)])
+
+        # Carry the dense scoring matrix over, recomputing only the changed rows
+        if self._dense is not None and attributes == self.attributes:
+            merged._dense = np.concatenate(
+                [self._dense, np.empty((3, n_new, len(attributes)), dtype=np.float32)], axis=1)
+            merged.fill_dense(changed)
+        return merged, changed
+
+    def absolute_mask(self, columns=None):
+        """Boolean (players x attributes) mask of absolute values, optionally for some columns"""
+        mask = np.unpackbits(self.abs_bits, axis=1, count=len(self.attributes)).view(bool)
+        return mask if columns is None else mask[:, columns]
+
+    def is_absolute(self, attr, rows=None):
+        """Boolean vector of which players have a known value for one attribute"""
+        col = self.columns[attr]
+        byte = self.abs_bits[:, col // 8] if rows is None else self.abs_bits[rows, col // 8]
+        return (byte >> (7 - col % 8)) & 1 == 1
+
+    def abs_values(self, attr, rows=None):
+        """Known values of one attribute, 0 where only a range (or nothing) was scouted"""
+        low = self.low[:, self.columns[attr]] if rows is None else self.low[rows, self.columns[attr]]
+        return np.where(self.is_absolute(attr, rows), low, 0)
+
+    def est_values(self, attr, rows=None):
+        """Estimated values of one attribute: the value itself or the range midpoint"""
+        col = self.columns[attr]
+        if rows is None:
+            return (self.low[:, col] + self.high[:, col].astype(np.float64)) / 2
+        return (self.low[rows, col] + self.high[rows, col].astype(np.float64)) / 2
+
+    def best_values(self, attr, rows=None):
+        """The value analyze_role ranks on: abs when known, otherwise est.
+
+        Known values are stored as zero-width ranges, so this is always est.
+        """
+        return self.est_values(attr, rows)
+
+    def dense_matrix(self):
+        """Best values, the absolute mask and low bounds stacked as float32 (3 x players x attributes).
+
+        Cached, so every role can be scored with one matmul against it. Best
+        values are halves of small integers, so float32 holds them and their
+        sums exactly. High bounds are 2 * best - low, so they need no plane.
+        """
+        if self._dense is None:
+            self._dense = dense_bounds(self.low, self.high, self.abs_bits, len(self.attributes))
+        return self._dense
+
+    def fill_dense(self, rows):
+        """Recompute some rows of the cached dense matrix after their values changed"""
+        self._dense[:, rows] = dense_bounds(self.low[rows], self.high[rows], self.abs_bits[rows],
+                                            len(self.attributes))
+
+    def dense_chunks(self, rows=None):
+        """Yield (output slice, dense stack) pieces covering all rows, or the given rows in order.
+
+        Scoring goes through this so a store that does not fit in memory
+        (see player_db.PlayerDatabase) can hand its rows out a chunk at a
+        time; an in-memory store is a single chunk of its cached matrix.
+        """
+        dense = self.dense_matrix()
+        yield slice(None), dense if rows is None else dense[:, rows]
+
+    def bound_chunks(self, columns, rows=None):
+        """Yield (output slice, low, high) pieces of some attribute columns, as dense_chunks does"""
+        if rows is None:
+            yield slice(None), self.low[:, columns], self.high[:, columns]
+        else:
+            yield slice(None), self.low[np.ix_(rows, columns)], self.high[np.ix_(rows, columns)]
+
+    def name_index(self, build=True):
+        """The NameIndex of the player names (cached); None if not built yet and build is False"""
+        if self._name_index is None and build:
+            from name_index import NameIndex
+            self._name_index = NameIndex(self.names.tolist())
+        return self._name_index
+
+    def row_of(self, name):
+        """Row index of the first player with this name, or None"""
+        return self.name_index().row_of(name)
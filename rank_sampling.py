@@ -0,0 +1,122 @@
+"""Monte Carlo rank distributions for one role's players.
+
+A scouted range such as 7-14 says the attribute is one of those whole
+values, not that it is 10.5. Each sample draws every ranged attribute
+uniformly (and independently) from its range, rates every player for the
+role and ranks them; known values stay fixed and unscouted ones count 0,
+as they do in the ratings. Over the samples each player gets a mean rank,
+the best and worst rank seen and how often they made the top TOP_RANKS.
+
+Only the ranged cells are drawn: a sample's rating is the pessimistic one
+(every range at its low bound) plus each ranged cell's draw above that
+bound, so known and unscouted cells cost nothing after setup. Samples are
+drawn BATCH_SAMPLES at a time as one (samples x cells) array and summed
+per player with np.add.reduceat; ranks are accumulated into running
+statistics, so memory does not grow with the number of samples. A player
+database is read a chunk at a time (see PlayerStore.bound_chunks).
+"""
+import numpy as np
+
+from scoring import IMPORTANCE_LEVELS
+
+# Samples drawn unless asked otherwise
+SAMPLES = 200
+
+# Samples drawn and ranked together
+BATCH_SAMPLES = 8
+
+# The shortlist whose odds are reported, as top_<n>_pct
+TOP_RANKS = 10
+
+# Summary columns added by rank_distribution (top_<n>_pct follows them)
+RANK_COLUMNS = ['rank_mean', 'rank_best', 'rank_worst']
+
+
+def role_weights(matrix, role):
+    """Weight of each of a role's columns (matrix.role_columns) in its overall rating"""
+    r = matrix.index[role]
+    weights = []
+    for _, importance in matrix.role_attributes[role]:
+        g = IMPORTANCE_LEVELS.index(importance)
+        weights.append(importance / (matrix.group_counts[r, g] * 9))
+    return np.array(weights)
+
+
+def ranged_cells(low, high, weights):
+    """(base ratings, ranged players, their first cells, values per cell, cell weights) of some bounds"""
+    widths = high.astype(np.int64) - low
+    # Every player's rating with each range at its low bound
+    base = low @ weights
+    # The ranged cells, player by player: a draw of 0..width above the low bound each
+    players, cells = np.nonzero(widths > 0)
+    choices = (widths[players, cells] + 1).astype(np.uint32)
+    # Start of each ranged player's cells, for summing cells per player
+    ranged, starts = np.unique(players, return_index=True)
+    return base, ranged, starts, choices, weights[cells].astype(np.float32)
+
+
+def sample_ratings(rng, batch, base, ranged, starts, choices, cell_weights):
+    """batch sampled ratings of some players, as a (batch x players) array"""
+    ratings = np.repeat(base[np.newaxis], batch, axis=0)
+    if len(choices):
+        # (bits * choices) >> 16 maps 16 random bits onto 0..choices-1
+        bits = rng.integers(0, 1 << 16, size=(batch, len(choices)), dtype=np.uint16)
+        draws = ((bits * choices) >> 16).astype(np.float32) * cell_weights
+        ratings[:, ranged] += np.add.reduceat(draws, starts, axis=1)
+    return ratings
+
+
+def rank_distribution(store, matrix, role, rows=None, samples=SAMPLES, top=TOP_RANKS,
+                      seed=None, progress=None):
+    """Rank statistics of the players (rows, or every player) over sampled ratings.
+
+    Returns {column: array} in the order of rows (store order for every
+    player). Ranks start at 1 and are taken among the sampled players only;
+    ties go to the earlier row, as in the rankings. progress, if given, is
+    called with the fraction of samples done after each batch.
+
+    The ranged cells of an in-memory store are found once; a database's are
+    read again chunk by chunk for every batch, so its bounds are never all
+    in memory at once. The same seed gives the same statistics either way
+    for a given store.
+    """
+    columns = matrix.role_columns[role]
+    weights = role_weights(matrix, role)
+    pieces = None
+    if store.in_memory:
+        pieces = [(part, ranged_cells(low, high, weights))
+                  for part, low, high in store.bound_chunks(columns, rows)]
+
+    rng = np.random.default_rng(seed)
+    count = len(store) if rows is None else len(rows)
+    rank_sum = np.zeros(count)
+    best = np.full(count, count, dtype=np.int64)
+    worst = np.zeros(count, dtype=np.int64)
+    in_top = np.zeros(count, dtype=np.int64)
+    positions = np.arange(1, count + 1)
+
+    done = 0
+    while done < samples:
+        batch = min(BATCH_SAMPLES, samples - done)
+        ratings = np.empty((batch, count))
+        batch_pieces = pieces
+        if batch_pieces is None:
+            batch_pieces = ((part, ranged_cells(low, high, weights))
+                            for part, low, high in store.bound_chunks(columns, rows))
+        for part, cells in batch_pieces:
+            ratings[:, part] = sample_ratings(rng, batch, *cells)
+
+        order = np.argsort(-ratings, axis=1, kind='stable')
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, positions[np.newaxis], axis=1)
+        rank_sum += ranks.sum(axis=0)
+        np.minimum(best, ranks.min(axis=0), out=best)
+        np.maximum(worst, ranks.max(axis=0), out=worst)
+        in_top += (ranks <= top).sum(axis=0)
+
+        done += batch
+        if progress is not None:
+            progress(done / samples)
+
+    return {'rank_mean': rank_sum / samples, 'rank_best': best, 'rank_worst': worst,
+            f'top_{top}_pct': in_top / samples * 100}
@@ -0,0 +1,127 @@
+"""Batch scouting reports: one attribute chart per shortlisted player.
+
+Charts are the GUI's AttributeChart, drawn on a plain Agg canvas, so neither
+Tk nor pyplot is needed. A report is either PNG files, one per player and
+named after the path given ('shortlist.png' -> 'shortlist_001_Harry_Kane.png'),
+or a single multi-page PDF.
+
+PNG pages are rendered by a pool of spawned processes, a chunk of pages per
+task, each worker keeping one figure and rebuilding its axes only when the
+role changes. A PDF is one stream that only one process can write, so its pages
+are drawn in order by the calling process.
+
+Pages are gathered from results beforehand as (file stem, title, role,
+attributes, values) tuples of plain values, which is all a worker is sent.
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Figure size (inches) and resolution of a report page
+PAGE_SIZE = (12, 4)
+PAGE_DPI = 100
+
+# Pages sent to a worker at once
+CHUNK_PAGES = 25
+
+# The worker process's chart, created by its first chunk
+_chart = None
+
+
+def file_part(text):
+    """A piece of a file name made from text ('Luis Suárez' -> 'Luis_Suárez')"""
+    return re.sub(r'[^\w-]+', '_', text).strip('_')
+
+
+def report_pages(result, count=None):
+    """Pages for the first count players of a result, in its display order.
+
+    A player is charted for result.role_for(row), i.e. their best role in an
+    all-roles result.
+    """
+    store = result.store
+    rows = result.order[:count].tolist()
+    pages = []
+    for rank, row in enumerate(rows, 1):
+        role = result.role_for(row)
+        attributes = result.attributes_for(role)
+        name = str(store.names[row])
+        values = [float(store.best_values(attr, row)) for attr, _ in attributes]
+        stem = f'{file_part(role)}_{rank:03d}_{file_part(name)}'
+        pages.append((stem, f'{name} - {role}', role, list(attributes), values))
+    return pages
+
+
+def new_chart():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from player_chart import AttributeChart
+
+    figure = Figure(figsize=PAGE_SIZE)
+    figure.patch.set_facecolor('white')
+    canvas = FigureCanvasAgg(figure)
+    return AttributeChart(figure, figure.add_subplot(), canvas, blit=False)
+
+
+def draw_page(chart, page):
+    """Set the chart up for one page"""
+    _, title, role, attributes, values = page
+    chart.update(title, role, attributes, [(title, values)])
+
+
+def render_pngs(pages, prefix):
+    """Save pages as prefix_<stem>.png (runs in a worker process); returns the paths"""
+    global _chart
+    if _chart is None:
+        _chart = new_chart()
+    paths = []
+    for page in pages:
+        draw_page(_chart, page)
+        path = f'{prefix}_{page[0]}.png'
+        _chart.figure.savefig(path, dpi=PAGE_DPI)
+        paths.append(path)
+    return paths
+
+
+def write_pdf(pages, path, progress=None):
+    """Save pages as one multi-page PDF"""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    chart = new_chart()
+    with PdfPages(path) as pdf:
+        for done, page in enumerate(pages, 1):
+            draw_page(chart, page)
+            pdf.savefig(chart.figure)
+            if progress is not None:
+                progress(done / len(pages))
+    return [path]
+
+
+def write_pngs(pages, path, workers=None, progress=None):
+    """Save pages as PNG files named after path, rendered across a process pool"""
+    prefix = os.path.splitext(path)[0]
+    chunks = [pages[start:start + CHUNK_PAGES] for start in range(0, len(pages), CHUNK_PAGES)]
+    paths = []
+    # Spawned, not forked: the GUI calls this from a worker thread, and forking a threaded process can deadlock
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [executor.submit(render_pngs, chunk, prefix) for chunk in chunks]
+        for future in as_completed(futures):
+            paths.extend(future.result())
+            if progress is not None:
+                progress(len(paths) / len(pages))
+    finally:
+        # A failed or cancelled report (progress raising) drops the chunks not yet started
+        executor.shutdown(cancel_futures=True)
+    return sorted(paths)
+
+
+def write_report(pages, path, workers=None, progress=None):
+    """Write pages as a PDF (path ending in .pdf) or as PNG files; returns the files written"""
+    if not pages:
+        raise ValueError("No players to report on")
+    if path.lower().endswith('.pdf'):
+        return write_pdf(pages, path, progress)
+    return write_pngs(pages, path, workers, progress)
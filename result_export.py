@@ -0,0 +1,144 @@
+"""Write results to CSV, Parquet or JSON Lines, a chunk of players at a time.
+
+Result columns are computed from the store for the rows asked for (see
+RankedResult.column), so an export only ever holds CHUNK_ROWS players'
+values, however many players the results have. Several results (one per
+role) go into one file with a 'Role' column, columns a result lacks left
+empty.
+
+Parquet needs pyarrow, which is only imported for a Parquet export.
+"""
+import csv
+import json
+import os
+
+# Players read from the results and written at a time
+CHUNK_ROWS = 10_000
+
+# Output format by file extension
+FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.jsonl': 'jsonl'}
+
+# 'display': the columns the GUI table shows; 'full': every attribute column too
+COLUMN_SETS = ('display', 'full')
+
+
+def format_for(path):
+    """The output format for a file name, from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the export format from '{extension or path}' "
+                         f"(use {', '.join(FORMATS)})")
+    return FORMATS[extension]
+
+
+def export_columns(results, column_set='display'):
+    """Union of the chosen columns of [(role, result)], in order of first appearance"""
+    columns = ['Role'] if len(results) > 1 else []
+    for _, result in results:
+        for col in (result.display_columns if column_set == 'display' else result.columns):
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def column_chunks(results, columns, chunk_rows=CHUNK_ROWS):
+    """Yield {column: list of values} for up to chunk_rows players at a time, in display order"""
+    for role, result in results:
+        available = set(result.columns)
+        for start in range(0, len(result), chunk_rows):
+            stop = min(start + chunk_rows, len(result))
+            chunk = {}
+            for col in columns:
+                if col in available:
+                    chunk[col] = result.column(col, start, stop).tolist()
+                elif col == 'Role':
+                    chunk[col] = [role] * (stop - start)
+                else:
+                    chunk[col] = [None] * (stop - start)
+            yield chunk
+
+
+def chunk_records(chunk, columns):
+    """The players of one chunk as dicts"""
+    return [dict(zip(columns, values)) for values in zip(*(chunk[col] for col in columns))]
+
+
+def write_csv(chunks, columns, out):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    for chunk in chunks:
+        # None (a column the player's result lacks) is written as an empty cell
+        writer.writerows(zip(*(chunk[col] for col in columns)))
+        yield len(chunk[columns[0]])
+
+
+def write_jsonl(chunks, columns, out):
+    for chunk in chunks:
+        out.writelines(json.dumps(record, ensure_ascii=False) + '\n'
+                       for record in chunk_records(chunk, columns))
+        yield len(chunk[columns[0]])
+
+
+def parquet_schema(results, columns):
+    """Arrow types of the columns, from the first result that has each one"""
+    import numpy as np
+    import pyarrow as pa
+
+    fields = []
+    for col in columns:
+        kind = pa.string()
+        for _, result in results:
+            if col in result.columns and len(result):
+                dtype = result.column(col, 0, 1).dtype
+                if dtype != np.dtype(object) and dtype.kind != 'U':
+                    kind = pa.from_numpy_dtype(dtype)
+                break
+        fields.append(pa.field(col, kind))
+    return pa.schema(fields)
+
+
+def write_parquet(chunks, columns, path, schema):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            # Each chunk is one row group
+            writer.write_table(pa.table([pa.array(chunk[col], type=field.type)
+                                         for col, field in zip(columns, schema)], schema=schema))
+            yield len(chunk[columns[0]])
+
+
+def export_results(results, path, column_set='display', output_format=None, progress=None):
+    """Write [(role, result)] to a file in chunks; returns the number of players written.
+
+    The format is taken from the file extension unless given. progress, if
+    given, is called with the fraction written after each chunk.
+    """
+    if column_set not in COLUMN_SETS:
+        raise ValueError(f"Unknown column set: {column_set}")
+    output_format = output_format or format_for(path)
+    columns = export_columns(results, column_set)
+    chunks = column_chunks(results, columns)
+    total = sum(len(result) for _, result in results)
+
+    if output_format == 'parquet':
+        try:
+            schema = parquet_schema(results, columns)
+        except ImportError:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)") from None
+        return report_written(write_parquet(chunks, columns, path, schema), total, progress)
+
+    write = {'csv': write_csv, 'jsonl': write_jsonl}[output_format]
+    with open(path, 'w', newline='', encoding='utf-8') as out:
+        return report_written(write(chunks, columns, out), total, progress)
+
+
+def report_written(counts, total, progress):
+    """Run a writer over its chunks, reporting progress; returns the players written"""
+    written = 0
+    for count in counts:
+        written += count
+        if progress is not None:
+            progress(written / total)
+    return written
@@ -0,0 +1,245 @@
+"""A results table that only keeps the rows in view as Treeview items.
+
+A ttk.Treeview with one item per player gets slow with big exports:
+inserting, deleting and re-sorting tens of thousands of items freezes the
+window. VirtualTable keeps just enough items to fill the visible area (plus
+a small buffer), drives its own vertical scrollbar over the whole result,
+and on every scroll or sort rewrites those few items from the result's
+columns. Cells are formatted a column slice at a time, so a redraw costs
+the same whatever the number of players.
+
+Besides the selected player, Ctrl-click marks players to compare with it.
+Marked players are kept as store rows, so they stay marked through sorting
+and scrolling, and are shown with the 'compared' tag when in view. A right
+click selects the player under the pointer and asks for its context menu.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+# Extra items kept below the visible rows, so a partly shown row is filled in
+BUFFER_ROWS = 2
+
+# Tk's own Treeview row height, used when the style does not set one
+DEFAULT_ROW_HEIGHT = 20
+
+# Rows moved per mouse wheel notch
+WHEEL_ROWS = 3
+
+# Background of the players marked for comparison
+COMPARED_BACKGROUND = '#e3f2fd'
+
+
+def format_column(name, values):
+    """Format a slice of one result column the way the table shows it"""
+    if values.dtype.kind == 'f':
+        spec = '{:.0f}%' if name.endswith('_pct') else '{:.1f}'  # Format percentages
+        return list(map(spec.format, values.tolist()))
+    return list(map(str, values.tolist()))
+
+
+class VirtualTable:
+    """A Treeview over a RoleResult or AllRolesResult holding only the visible rows"""
+
+    def __init__(self, parent, on_select=None, on_compare=None, compare_limit=None, on_menu=None):
+        self.on_select = on_select  # Called with the store row of a newly selected player
+        self.on_compare = on_compare  # Called with the store rows marked for comparison
+        self.on_menu = on_menu  # Called with (store row, screen x, screen y) on a right click
+        self.compare_limit = compare_limit  # Most players that can be marked
+        self.result = None
+        self.columns = []
+        self.top = 0  # Display position of the first row shown
+        self.visible_rows = 1
+        self.selected_position = None  # Display position of the selected player
+        self.compared = []  # Store rows of the players marked for comparison, in marking order
+        self.compared_store = None  # The store those rows belong to
+
+        self.tree = ttk.Treeview(parent, show='headings', selectmode='browse')
+        self.tree.tag_configure('compared', background=COMPARED_BACKGROUND)
+
+        # The vertical scrollbar spans the whole result, not the items
+        self.v_scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.yview)
+        self.h_scrollbar = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.h_scrollbar.set)
+
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.h_scrollbar.grid(row=1, column=0, sticky='ew')
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+        self.tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self.move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self.move_selection(self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self.move_selection(-len(self)))
+        self.tree.bind('<End>', lambda event: self.move_selection(len(self)))
+        self.tree.bind('<Control-Button-1>', self.on_compare_click)
+        self.tree.bind('<Escape>', lambda event: self.set_compared([]))
+        # The right button is Button-2 on macOS
+        menu_button = '<Button-2>' if self.tree.tk.call('tk', 'windowingsystem') == 'aqua' else '<Button-3>'
+        self.tree.bind(menu_button, self.on_menu_click)
+
+    def __len__(self):
+        return 0 if self.result is None else len(self.result)
+
+    def show(self, result, columns):
+        """Show a result's columns from the top; the tree's headings are set by the caller"""
+        # Marked players stay marked across roles, but rows only match within one store
+        if self.compared and self.compared_store is not result.store:
+            self.set_compared([])
+        self.compared_store = result.store
+        self.result = result
+        self.columns = list(columns)
+        self.top = 0
+        self.selected_position = None
+        self.refresh()
+
+    def reorder(self, result):
+        """Show the same columns in another order (or re-ranking), keeping the selection if still shown"""
+        selected = None
+        if self.selected_position is not None:
+            selected = self.result.order[self.selected_position]
+        self.result = result
+        self.top = 0
+        self.selected_position = None
+        if selected is not None:
+            self.selected_position = result.position_of(selected)
+        self.refresh()
+
+    def clear(self):
+        self.result = None
+        self.columns = []
+        self.top = 0
+        self.selected_position = None
+        self.refresh()
+
+    def row_height(self):
+        height = ttk.Style().lookup('Treeview', 'rowheight')
+        return int(height) if height else DEFAULT_ROW_HEIGHT
+
+    def on_resize(self, event=None):
+        """Work out how many rows fit and refill the items"""
+        row_height = self.row_height()
+        items = self.tree.get_children()
+        box = self.tree.bbox(items[0]) if items else None
+        heading = box[1] if box else row_height
+        self.visible_rows = max(1, (self.tree.winfo_height() - heading) // row_height)
+        self.refresh()
+
+    def refresh(self):
+        """Rewrite the items from the window of the result starting at self.top"""
+        count = len(self)
+        self.top = max(0, min(self.top, count - self.visible_rows))
+        stop = min(count, self.top + self.visible_rows + BUFFER_ROWS)
+
+        if count:
+            cells = [format_column(col, self.result.column(col, self.top, stop))
+                     for col in self.columns]
+            rows = list(zip(*cells))
+            compared = set(self.compared)
+            tags = [('compared',) if row in compared else ()
+                    for row in self.result.order[self.top:stop].tolist()]
+        else:
+            rows = tags = []
+
+        # Items are named by their slot and reused; only the difference is added or removed
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        for slot, (values, tag) in enumerate(zip(rows, tags)):
+            if slot < len(items):
+                self.tree.item(items[slot], values=values, tags=tag)
+            else:
+                self.tree.insert('', 'end', iid=str(slot), values=values, tags=tag)
+        self.tree.yview_moveto(0)
+
+        self.sync_selection(len(rows))
+        if count:
+            self.v_scrollbar.set(self.top / count, min(1.0, (self.top + self.visible_rows) / count))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+
+    def sync_selection(self, shown):
+        """Select the item showing the selected player, or none when it is out of view"""
+        position = self.selected_position
+        if position is not None and self.top <= position < self.top + shown:
+            wanted = (str(position - self.top),)
+        else:
+            wanted = ()
+        if tuple(self.tree.selection()) != wanted:
+            self.tree.selection_set(wanted)
+
+    def on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection or self.result is None:
+            return
+        position = self.top + int(selection[0])
+        if position != self.selected_position:
+            self.select(position)
+
+    def select(self, position):
+        """Select the player at a display position, scrolling it into view"""
+        self.selected_position = position
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + self.visible_rows:
+            self.top = position - self.visible_rows + 1
+        self.refresh()
+        if self.on_select is not None:
+            self.on_select(int(self.result.order[position]))
+
+    def on_compare_click(self, event):
+        """Ctrl-click marks a player for comparison, or unmarks a marked one"""
+        item = self.tree.identify_row(event.y)
+        if not item or self.result is None:
+            return 'break'
+        row = int(self.result.order[self.top + int(item)])
+        if row in self.compared:
+            self.set_compared([marked for marked in self.compared if marked != row])
+        elif self.compare_limit is None or len(self.compared) < self.compare_limit:
+            self.set_compared(self.compared + [row])
+        return 'break'
+
+    def on_menu_click(self, event):
+        """Right click selects the player under the pointer and opens its menu"""
+        item = self.tree.identify_row(event.y)
+        if not item or self.result is None:
+            return 'break'
+        self.select(self.top + int(item))
+        if self.on_menu is not None:
+            self.on_menu(int(self.result.order[self.selected_position]), event.x_root, event.y_root)
+        return 'break'
+
+    def set_compared(self, rows):
+        """Mark these store rows for comparison and tell on_compare"""
+        self.compared = list(rows)
+        self.refresh()
+        if self.on_compare is not None:
+            self.on_compare(list(self.compared))
+
+    def move_selection(self, delta):
+        if len(self):
+            start = -1 if self.selected_position is None else self.selected_position
+            self.select(max(0, min(start + delta, len(self) - 1)))
+        return 'break'
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.top += int(args[1]) * step
+        self.refresh()
+
+    def on_wheel(self, event):
+        if event.num == 4 or (event.num != 5 and event.delta > 0):
+            self.top -= WHEEL_ROWS
+        else:
+            self.top += WHEEL_ROWS
+        self.refresh()
+        return 'break'
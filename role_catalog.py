@@ -0,0 +1,164 @@
+"""Role definitions: the bundled roles_data plus roles read from JSON or TOML files.
+
+A role file has the same shape as roles_data, categories of attributes by
+full name (or abbreviation) with an importance of 1, 3 or 5:
+
+    {"Inside Forward (Attack)": {"Technical": {"Dribbling": 5, "Finishing": 3},
+                                 "Mental": {"Off The Ball": 5}}}
+
+    ["Inside Forward (Attack)".Technical]
+    Dribbling = 5
+    Finishing = 3
+
+Files are read in order after the bundled roles; a role defined again
+replaces the earlier definition in place, and new roles are added at the
+end. Every role is validated and flattened once into [(abbreviation,
+importance)] in definition order, which is what RoleMatrix compiles
+against a store's columns.
+
+reload() re-reads the files when any of them has changed (by size and
+modification time) and returns the roles whose definitions differ, so
+callers only rescore those. A file that fails to read or validate leaves
+the catalog as it was.
+"""
+import json
+import os
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Importance values a role may give an attribute
+IMPORTANCES = (1, 3, 5)
+
+BUNDLED = 'roles_data.py'
+
+
+def read_role_file(path):
+    """The {role: {category: {attribute: importance}}} defined in a JSON or TOML file"""
+    if path.lower().endswith('.toml'):
+        if tomllib is None:
+            raise ValueError(f"{path}: reading TOML needs Python 3.11 or the tomli package")
+        with open(path, 'rb') as f:
+            try:
+                return tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"{path}: {e}") from None
+    with open(path, encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}") from None
+
+
+def file_stamp(path):
+    """(size, mtime) of a file, or None when it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class RoleCatalog:
+    """Validated, flattened role definitions from roles_data and role files"""
+
+    def __init__(self, roles_data, attribute_mapping, paths=()):
+        self.roles_data = roles_data
+        self.attribute_mapping = attribute_mapping  # Abbreviation -> full name
+        self.reverse_mapping = {v: k for k, v in attribute_mapping.items()}
+        self.paths = []
+        self.stamps = {}  # Path -> file_stamp when last read
+        # Role -> [(abbreviation, importance)], and role -> file it was defined in
+        self.weights, self.sources = self.compile([])
+        if paths:
+            self.add_files(*paths)
+
+    def __contains__(self, role):
+        return role in self.weights
+
+    def __len__(self):
+        return len(self.weights)
+
+    @property
+    def roles(self):
+        return list(self.weights)
+
+    def full_name(self, abbreviation):
+        return self.attribute_mapping.get(abbreviation, abbreviation)
+
+    def flatten(self, role, definition, source):
+        """Validate one role's categories into [(abbreviation, importance)]"""
+        if not isinstance(definition, dict):
+            raise ValueError(f"{source}: role '{role}' must map categories to attributes")
+        weights = {}
+        for category, attributes in definition.items():
+            if not isinstance(attributes, dict):
+                raise ValueError(f"{source}: '{role}' category '{category}' must map "
+                                 f"attributes to importances")
+            for name, importance in attributes.items():
+                abbreviation = self.reverse_mapping.get(name)
+                if abbreviation is None:
+                    if name not in self.attribute_mapping:
+                        raise ValueError(f"{source}: '{role}' has unknown attribute '{name}'")
+                    abbreviation = name
+                if isinstance(importance, bool) or importance not in IMPORTANCES:
+                    raise ValueError(f"{source}: '{role}' gives '{name}' importance "
+                                     f"{importance!r} (use 1, 3 or 5)")
+                weights[abbreviation] = importance
+        return list(weights.items())
+
+    def compile(self, paths):
+        """(weights, sources) for the bundled roles followed by the given files"""
+        weights, sources = {}, {}
+        definitions = [(BUNDLED, self.roles_data)]
+        definitions += [(path, read_role_file(path)) for path in paths]
+        for source, roles in definitions:
+            if not isinstance(roles, dict):
+                raise ValueError(f"{source}: expected a table of roles")
+            for role, definition in roles.items():
+                weights[role] = self.flatten(role, definition, source)
+                sources[role] = source
+        return weights, sources
+
+    def add_files(self, *paths):
+        """Read more role files (after those already read); returns the roles they change"""
+        added = [path for path in paths if path not in self.paths]
+        for path in added:
+            if file_stamp(path) is None:
+                raise FileNotFoundError(f"Role file not found: {path}")
+        paths = self.paths + added
+        stamps = {path: file_stamp(path) for path in paths}
+        # Compiled before anything is kept, so a bad file is not added
+        weights, sources = self.compile([path for path in paths if stamps[path] is not None])
+        self.paths, self.stamps = paths, stamps
+        return self.replace(weights, sources)
+
+    def stale(self):
+        """Whether any role file has changed since it was read"""
+        return any(file_stamp(path) != self.stamps.get(path) for path in self.paths)
+
+    def reload(self):
+        """Re-read the role files if any has changed; returns the roles that changed.
+
+        A deleted file's roles are dropped (bundled ones come back) until it
+        reappears.
+        """
+        if not self.stale():
+            return set()
+        # Stamped before reading, so a broken file is reported once, not on every check
+        self.stamps = {path: file_stamp(path) for path in self.paths}
+        weights, sources = self.compile([path for path in self.paths
+                                         if self.stamps[path] is not None])
+        return self.replace(weights, sources)
+
+    def replace(self, weights, sources):
+        """Use newly compiled roles; returns the roles added, removed or redefined"""
+        changed = {role for role in weights.keys() | self.weights.keys()
+                   if weights.get(role) != self.weights.get(role)}
+        self.weights, self.sources = weights, sources
+        return changed
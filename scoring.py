@@ -0,0 +1,489 @@
+"""Role scoring over a PlayerStore.
+
+Players are rated per role from the importance groups of its definition
+(see role_catalog): the average best value of the importance 5, 3 and 1
+attributes, combined as (5 * avg5 + 3 * avg3 + 1 * avg1) / 9. A scouted
+range counts as its midpoint; the same combination of the low and high
+bounds gives each player a pessimistic and optimistic rating alongside
+that expected one, so a mostly-unscouted player shows how far off it may
+be. The role catalog is compiled once into a
+RoleMatrix of roles x attributes group masks aligned to the store's columns,
+so one role or all of them is scored with a single matmul. A RoleResult keeps
+only the per-player summary columns and a display order; attribute columns
+are read from the store when asked for, so no per-role copy is made, and
+sorting a result reuses a cached permutation instead of re-sorting. A top-k
+result is found by partial selection (top_k) and keeps summary columns for
+just its k players.
+
+Nothing here needs pandas except to_frame, which imports it on demand.
+"""
+import copy
+import sys
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Importance groups used by role definitions, most important first
+IMPORTANCE_LEVELS = (5, 3, 1)
+
+
+def combine_groups(avg5, avg3, avg1):
+    """Overall rating from the importance 5, 3 and 1 group averages"""
+    return (avg5 * 5 + avg3 * 3 + avg1 * 1) / 9  # 5+3+1=9
+
+
+def top_k(values, k):
+    """Positions of the k largest values, largest first.
+
+    The same positions in the same order as the first k of a stable
+    descending sort (ties go to the earlier position), but found by partial
+    selection so only the k winners are sorted.
+    """
+    n = len(values)
+    if k >= n:
+        return np.argsort(-values, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Everything above the k-th largest value wins; its ties fill the rest, earliest first
+    threshold = np.partition(values, n - k)[n - k]
+    above = np.flatnonzero(values > threshold)
+    tied = np.flatnonzero(values == threshold)[:k - len(above)]
+    winners = np.sort(np.concatenate([above, tied]))
+    return winners[np.argsort(-values[winners], kind='stable')]
+
+
+def sort_order(values, ascending=True):
+    """Stable permutation that sorts values; ties keep their current order either way"""
+    if values.dtype == object:
+        # Text can't be negated: sort its rank codes instead (reversing the order would reverse ties)
+        values = np.unique(values, return_inverse=True)[1].reshape(-1)
+    elif values.dtype.kind in 'ub':
+        # Negating unsigned values wraps around
+        values = values.astype(np.int64)
+    return np.argsort(values if ascending else -values, kind='stable')
+
+
+class RoleMatrix:
+    """A RoleCatalog compiled into roles x attributes arrays aligned to a store's columns"""
+
+    def __init__(self, catalog, attributes):
+        self.roles = catalog.roles
+        self.index = {role: i for i, role in enumerate(self.roles)}
+        self.attributes = list(attributes)
+        columns = {attr: i for i, attr in enumerate(self.attributes)}
+
+        n_roles, n_attrs = len(self.roles), len(self.attributes)
+        self.importance = np.zeros((n_roles, n_attrs), dtype=np.int64)
+        # 0/1 mask per role and importance group, in IMPORTANCE_LEVELS order
+        self.group_masks = np.zeros((n_roles, len(IMPORTANCE_LEVELS), n_attrs), dtype=np.float32)
+        # Role -> [(abbreviation, importance)] present in the data, in definition order
+        self.role_attributes = {}
+        # Role -> store columns of those attributes
+        self.role_columns = {}
+        # Role attributes the export has no column for, reported once each
+        self.missing = {}
+
+        for r, role in enumerate(self.roles):
+            present = []
+            for attr_abbrev, importance in catalog.weights[role]:
+                col = columns.get(attr_abbrev)
+                if col is None:
+                    self.missing[attr_abbrev] = catalog.full_name(attr_abbrev)
+                    continue
+
+                present.append((attr_abbrev, importance))
+                self.importance[r, col] = importance
+                if importance in IMPORTANCE_LEVELS:
+                    self.group_masks[r, IMPORTANCE_LEVELS.index(importance), col] = 1
+            self.role_attributes[role] = present
+            self.role_columns[role] = np.array([columns[attr] for attr, _ in present], dtype=np.intp)
+
+        for attr_abbrev, full_attr_name in self.missing.items():
+            print(f"Warning: Attribute '{attr_abbrev}' (from '{full_attr_name}') not found in data",
+                  file=sys.stderr)
+
+        # Attributes per group, floored at 1 to avoid division by zero
+        self.group_counts = np.maximum(self.group_masks.sum(axis=2).astype(np.float64), 1)
+
+    def matches(self, attributes):
+        """Whether this matrix was compiled for a store with these attribute columns"""
+        return self.attributes == list(attributes)
+
+    def role_indices(self, roles=None):
+        return list(range(len(self.roles))) if roles is None else [self.index[r] for r in roles]
+
+    def summaries(self, store, roles=None, rows=None):
+        """Summary columns for each requested role as (players x roles) arrays.
+
+        rows limits the players scored to those store rows (in that order).
+        """
+        return gather_chunks(store, rows, self.summarizer(roles))
+
+    def summarizer(self, roles=None):
+        """A function from a dense stack to the requested roles' summary columns"""
+        indices = self.role_indices(roles)
+        masks = self.group_masks[indices].reshape(len(indices) * len(IMPORTANCE_LEVELS), -1)
+        counts = self.group_counts[indices]
+
+        def summarize(dense):
+            # One product gives group totals, absolute counts and low-bound totals:
+            # (3, players, roles * groups). The float32 sums are exact, so widening
+            # afterwards loses nothing.
+            sums = (dense.reshape(-1, dense.shape[2]) @ masks.T).reshape(
+                3, dense.shape[1], len(indices), len(IMPORTANCE_LEVELS))
+            totals, absolutes = sums[0], sums[1]
+
+            summary = {}
+            for g, level in enumerate(IMPORTANCE_LEVELS):
+                summary[f'importance_{level}_total'] = totals[:, :, g].astype(np.float64)
+            for g, level in enumerate(IMPORTANCE_LEVELS):
+                summary[f'importance_{level}_abs_pct'] = (absolutes[:, :, g] / counts[:, g]) * 100
+            for g, level in enumerate(IMPORTANCE_LEVELS):
+                summary[f'importance_{level}_avg'] = summary[f'importance_{level}_total'] / counts[:, g]
+
+            # Overall rating (weighted sum of group averages), then the same from the
+            # low bounds; best values are range midpoints, so the high bounds' rating
+            # is the expected one mirrored about the pessimistic one
+            summary['overall_rating'] = combine_groups(summary['importance_5_avg'],
+                                                       summary['importance_3_avg'],
+                                                       summary['importance_1_avg'])
+            low_averages = sums[2] / counts
+            summary['pessimistic_rating'] = combine_groups(*np.moveaxis(low_averages, -1, 0))
+            summary['optimistic_rating'] = 2 * summary['overall_rating'] - summary['pessimistic_rating']
+            return summary
+
+        return summarize
+
+    def ratings(self, store, rows=None, roles=None):
+        """Just the overall rating of each player for every (or each given) role, as (players x roles).
+
+        The same values as summaries(store)['overall_rating'], from half the
+        work: only best values are multiplied and no other column is kept.
+        """
+        indices = self.role_indices(roles)
+        masks = self.group_masks[indices].reshape(len(indices) * len(IMPORTANCE_LEVELS), -1)
+        counts = self.group_counts[indices]
+
+        def rate(dense):
+            totals = (dense[0] @ masks.T).reshape(-1, len(indices), len(IMPORTANCE_LEVELS))
+            averages = totals.astype(np.float64) / counts
+            return {'overall_rating': combine_groups(*np.moveaxis(averages, -1, 0))}
+
+        return gather_chunks(store, rows, rate)['overall_rating']
+
+
+def gather_chunks(store, rows, compute):
+    """Run compute(dense) over the store's dense chunks and stitch the {name: array} results.
+
+    An in-memory store is one chunk and its result is returned as is; for a
+    chunked store only the per-player outputs are ever whole.
+    """
+    count = len(store) if rows is None else len(rows)
+    gathered = None
+    for part, dense in store.dense_chunks(rows):
+        result = compute(dense)
+        if part == slice(None):
+            return result
+        if gathered is None:
+            gathered = {name: np.empty((count,) + values.shape[1:], dtype=values.dtype)
+                        for name, values in result.items()}
+        for name, values in result.items():
+            gathered[name][part] = values
+    if gathered is None:
+        # No players at all
+        return compute(np.zeros((3, 0, len(store.attributes)), dtype=np.float32))
+    return gathered
+
+
+class RankedResult(ABC):
+    """Per-player result columns plus the store rows in display order.
+
+    Subclasses name their columns and look up a column's values for any
+    store rows; everything else is shared. Sorting only swaps the order. The order for each (column, direction) is
+    computed once, from the original ranking so ties keep their ranking
+    order, and the cache is shared by every sorted view of the result.
+    """
+
+    def __init__(self, store, order, total=None):
+        self.store = store
+        self.order = order  # Store rows in display order
+        self.ranking = order  # The order the result was created with
+        # Players scored; more than len(self) for a top-k result, fewer than the store when filtered
+        self.total = len(store) if total is None else total
+        self._sort_orders = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    @abstractmethod
+    def columns(self):
+        """Every result column, in export order"""
+
+    @abstractmethod
+    def values(self, name, rows):
+        """Values of one result column for the given store rows"""
+
+    def column(self, name, start=0, stop=None):
+        """Values of one result column, in display order (optionally only positions start:stop)"""
+        return self.values(name, self.order[start:stop])
+
+    def sorted_by(self, name, ascending=True):
+        """A view of this result ordered by one column"""
+        key = (name, ascending)
+        if key not in self._sort_orders:
+            values = self.values(name, self.ranking)
+            self._sort_orders[key] = self.ranking[sort_order(values, ascending)]
+        view = copy.copy(self)
+        view.order = self._sort_orders[key]
+        return view
+
+    def head(self, count):
+        """A view of only the first count players of the ranking"""
+        view = copy.copy(self)
+        view.order = view.ranking = self.ranking[:count]
+        view._sort_orders = {}
+        return view
+
+    def within(self, rows):
+        """A view of only some store rows (a filter's matches), in their ranking order"""
+        keep = np.zeros(len(self.store), dtype=bool)
+        keep[rows] = True
+        view = copy.copy(self)
+        view.order = view.ranking = self.ranking[keep[self.ranking]]
+        view.total = len(rows)
+        view._sort_orders = {}
+        return view
+
+    def position_of(self, row):
+        """Display position of a store row, or None when this result does not show it"""
+        matches = np.flatnonzero(self.order == row)
+        return int(matches[0]) if len(matches) else None
+
+    def to_frame(self, columns=None):
+        """Materialize the chosen columns (all by default) as a DataFrame in display order"""
+        import pandas as pd
+
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.column(col) for col in columns})
+
+
+class RoleResult(RankedResult):
+    """Every player's scores for one role, plus the order they are shown in"""
+
+    def __init__(self, store, role, attributes, summary, order, summary_rows=None, total=None):
+        super().__init__(store, order, total)
+        self.role = role
+        self.attributes = attributes  # [(abbreviation, importance)] present in the store
+        self.importance = dict(attributes)
+        self.summary = summary  # Summary column -> per-player array in store row order
+        # The sorted store rows the summary arrays cover, when not every player (top-k, filtered)
+        self.summary_rows = summary_rows
+
+    @property
+    def columns(self):
+        """All result columns, in the order export has always written them"""
+        columns = ['Name']
+        for attr, _ in self.attributes:
+            columns.extend([f'{attr}_abs', f'{attr}_est', f'{attr}_best', f'{attr}_importance'])
+        return columns + list(self.summary)
+
+    @property
+    def display_columns(self):
+        """The columns the results table shows: summaries plus the 6 most important attributes"""
+        columns = ['Name', 'overall_rating', 'pessimistic_rating', 'optimistic_rating',
+                   'importance_5_total', 'importance_5_abs_pct',
+                   'importance_3_total', 'importance_3_abs_pct',
+                   'importance_1_total', 'importance_1_abs_pct']
+        # Monte Carlo rank columns, when added (see rank_sampling)
+        columns += [name for name in self.summary if name.startswith(('rank_', 'top_'))]
+        key_attributes = sorted(self.attributes, key=lambda x: x[1], reverse=True)[:6]
+        for attr, _ in key_attributes:
+            columns.extend([f'{attr}_best', f'{attr}_importance'])
+        return columns
+
+    def with_summary(self, columns):
+        """A copy with more summary columns, given as arrays over the same players as summary"""
+        view = copy.copy(self)
+        view.summary = dict(self.summary, **columns)
+        return view
+
+    def values(self, name, rows):
+        if name == 'Name':
+            return self.store.names[rows]
+        if name in self.summary:
+            if self.summary_rows is not None:
+                rows = np.searchsorted(self.summary_rows, rows)
+            return self.summary[name][rows]
+
+        attr, _, kind = name.rpartition('_')
+        if attr in self.importance:
+            if kind == 'abs':
+                return self.store.abs_values(attr, rows)
+            if kind == 'est':
+                return self.store.est_values(attr, rows)
+            if kind == 'best':
+                return self.store.best_values(attr, rows)
+            if kind == 'importance':
+                return np.full(len(rows), self.importance[attr])
+        raise KeyError(name)
+
+    def role_for(self, row):
+        """The role a player's scores refer to"""
+        return self.role
+
+    def attributes_for(self, role):
+        """[(abbreviation, importance)] of a role's attributes present in the store"""
+        return self.attributes
+
+
+def score_role(store, matrix, role, top=None, rows=None):
+    """Score the players in the store for one role, keeping only the best top if given.
+
+    rows (sorted store rows, e.g. from player_filter.select) limits scoring
+    to those players; the others are never scored.
+    """
+    if top is not None:
+        return score_role_top(store, matrix, role, top, rows)
+    summary = {name: values[:, 0] for name, values in matrix.summaries(store, [role], rows).items()}
+    order = np.argsort(-summary['overall_rating'], kind='stable')
+    if rows is None:
+        return RoleResult(store, role, matrix.role_attributes[role], summary, order)
+    return RoleResult(store, role, matrix.role_attributes[role], summary, rows[order],
+                      summary_rows=rows, total=len(rows))
+
+
+def score_role_top(store, matrix, role, top, rows=None):
+    """The best top players for one role, streamed over the store's dense chunks.
+
+    Each chunk's summaries are merged with the running top and cut back to
+    top rows, so only top rows of each summary column outlive a chunk. The
+    result ranks the same players in the same order as score_role(...).head(top).
+    """
+    summarize = matrix.summarizer([role])
+    total = len(store) if rows is None else len(rows)
+    kept = np.empty(0, dtype=np.intp)
+    summary = None
+    for part, dense in store.dense_chunks(rows):
+        chunk = {name: values[:, 0] for name, values in summarize(dense).items()}
+        chunk_rows = np.arange(*part.indices(len(store))) if rows is None else rows[part]
+        if summary is not None:
+            # Earlier rows first, so top_k breaks ties towards them
+            chunk = {name: np.concatenate([summary[name], values]) for name, values in chunk.items()}
+            chunk_rows = np.concatenate([kept, chunk_rows])
+        keep = np.sort(top_k(chunk['overall_rating'], top))
+        kept = chunk_rows[keep]
+        summary = {name: values[keep] for name, values in chunk.items()}
+    if summary is None:
+        return score_role(store, matrix, role, rows=rows).head(top)
+
+    order = kept[top_k(summary['overall_rating'], top)]
+    return RoleResult(store, role, matrix.role_attributes[role], summary, order,
+                      summary_rows=kept, total=total)
+
+
+class AllRolesResult(RankedResult):
+    """Every player's overall rating for every role, ordered by best rating.
+
+    Only the (players x roles) ratings are kept; a role's full summary
+    columns are computed when role_result asks for them.
+    """
+
+    def __init__(self, store, matrix, ratings, order=None):
+        self.matrix = matrix
+        self.roles = matrix.roles
+        self.ratings = ratings  # (players x roles) in store row order
+
+        # Best and runner-up role per player; argmax takes the first role on ties
+        rows = np.arange(len(store))
+        self.best_index = ratings.argmax(axis=1) if len(self.roles) else np.zeros(len(store), dtype=np.intp)
+        if len(self.roles) > 1:
+            # Hide each best rating for a second argmax, then put it back (no copy of ratings)
+            best = ratings[rows, self.best_index]
+            ratings[rows, self.best_index] = -np.inf
+            self.second_index = ratings.argmax(axis=1)
+            ratings[rows, self.best_index] = best
+        else:
+            self.second_index = self.best_index
+        self.best_rating = self.ratings[rows, self.best_index]
+        self.margin = self.best_rating - self.ratings[rows, self.second_index]
+
+        super().__init__(store, np.argsort(-self.best_rating, kind='stable') if order is None else order)
+        self._role_results = {}
+
+    @property
+    def columns(self):
+        return ['Name', 'best_role', 'best_rating', 'margin', 'second_role'] + list(self.roles)
+
+    @property
+    def display_columns(self):
+        return self.columns
+
+    def values(self, name, rows):
+        if name == 'Name':
+            return self.store.names[rows]
+        if name == 'best_role':
+            return np.asarray(self.roles, dtype=object)[self.best_index[rows]]
+        if name == 'second_role':
+            return np.asarray(self.roles, dtype=object)[self.second_index[rows]]
+        if name == 'best_rating':
+            return self.best_rating[rows]
+        if name == 'margin':
+            return self.margin[rows]
+        if name in self.matrix.index:
+            return self.ratings[rows, self.matrix.index[name]]
+        raise KeyError(name)
+
+    def role_for(self, row):
+        """The role a player fits best"""
+        return self.roles[self.best_index[row]]
+
+    def attributes_for(self, role):
+        """[(abbreviation, importance)] of a role's attributes present in the store"""
+        return self.matrix.role_attributes[role]
+
+    def role_result(self, role):
+        """The single-role ranking for one role (cached)"""
+        if role not in self._role_results:
+            self._role_results[role] = score_role(self.store, self.matrix, role)
+        return self._role_results[role]
+
+
+def score_all_roles(store, matrix):
+    """Score every player in the store against every role at once"""
+    return AllRolesResult(store, matrix, matrix.ratings(store))
+
+
+def rescore_roles(result, matrix, roles):
+    """All-roles scores under a recompiled RoleMatrix, rescoring only the given roles.
+
+    Every other role of the new matrix must be defined as it was in
+    result.matrix; its ratings (and any single-role ranking already made
+    for it) are kept.
+    """
+    store = result.store
+    ratings = np.empty((len(store), len(matrix.roles)), dtype=np.float64)
+    rescored = [role for role in matrix.roles if role in roles or role not in result.matrix.index]
+    kept = [role for role in matrix.roles if role not in rescored]
+    if kept:
+        ratings[:, matrix.role_indices(kept)] = result.ratings[:, result.matrix.role_indices(kept)]
+    if rescored:
+        ratings[:, matrix.role_indices(rescored)] = matrix.ratings(store, roles=rescored)
+
+    updated = AllRolesResult(store, matrix, ratings)
+    updated._role_results = {role: ranking for role, ranking in result._role_results.items()
+                             if role in kept}
+    return updated
+
+
+def rescore_all_roles(result, store, rows):
+    """All-roles scores for a store merged from result's store, rescoring only the given rows.
+
+    The merged store must keep the old players in their rows (appending new
+    ones) and have the same attribute columns, as PlayerStore.merge does.
+    """
+    ratings = np.empty((len(store), len(result.roles)), dtype=np.float64)
+    ratings[:len(result.ratings)] = result.ratings
+    ratings[rows] = result.matrix.ratings(store, rows)
+    return AllRolesResult(store, result.matrix, ratings)
@@ -0,0 +1,235 @@
+"""Tk-free scouting session: load exports and score players.
+
+This is everything the GUI does apart from drawing, so it can be imported
+from scripts, cron jobs and cli.py. The GUI drives it from a single worker
+thread (see jobs.py), so it does no locking of its own. It only needs NumPy; pandas, tkinter
+and matplotlib are never imported on this path.
+"""
+import numpy as np
+
+from export_parser import read_export_rows
+from player_filter import FilterIndex, KnownFilter, select
+from player_store import PlayerStore
+from role_catalog import RoleCatalog
+from scoring import RoleMatrix, rescore_all_roles, rescore_roles, score_all_roles, score_role
+
+
+def load_store(file_path, progress=None):
+    """Parse one FM HTML export into a PlayerStore; progress(fraction) is called while reading"""
+    header, rows = read_export_rows(file_path, progress=progress)
+    return PlayerStore.from_rows(header, rows)
+
+
+class ScoutingSession:
+    """A loaded player store plus the compiled roles and any cached scores"""
+
+    def __init__(self, roles_data=None, attribute_mapping=None, cache=None, role_files=()):
+        # Default to the bundled definitions; imported here so a caller can supply its own
+        if roles_data is None:
+            from roles_data import roles_data
+        if attribute_mapping is None:
+            from attribute_mapping import attribute_mapping
+
+        self.attribute_mapping = attribute_mapping
+        self.cache = cache  # Optional ParseCache of previously parsed exports
+
+        # roles_data plus any JSON/TOML role files, validated and flattened once
+        self.catalog = RoleCatalog(roles_data, attribute_mapping, role_files)
+
+        self.store = None
+        self.role_matrix = None
+        self.all_roles = None  # Every role's scores, once score_all_roles has run
+        self.filter_index = None  # Sorted indexes for player filters, built as filters use them
+        self.similarity = {}  # (role, scope) -> SimilarityIndex, built on first search
+
+    @property
+    def roles(self):
+        return self.catalog.roles
+
+    def add_role_files(self, *paths):
+        """Read role definitions from JSON/TOML files; returns the roles added or redefined"""
+        return self.update_roles(self.catalog.add_files(*paths))
+
+    def reload_roles(self):
+        """Re-read the role files if they have changed; returns the roles that changed"""
+        return self.update_roles(self.catalog.reload())
+
+    def update_roles(self, changed):
+        """Recompile the roles after a catalog change, rescoring only the changed roles"""
+        for key in [key for key in self.similarity if key[0] in changed]:
+            del self.similarity[key]
+        if changed and self.store is not None:
+            matrix = RoleMatrix(self.catalog, self.store.attributes)
+            if self.all_roles is not None:
+                self.all_roles = rescore_roles(self.all_roles, matrix, changed)
+            self.role_matrix = matrix
+        elif changed:
+            self.role_matrix = None  # Compiled when a store is loaded
+        return changed
+
+    def load(self, *file_paths, progress=None):
+        """Load one or more exports (stacked into one store) and return the store.
+
+        progress, if given, is called with the fraction of all files read so
+        far; the session is only changed once every file has been parsed.
+        """
+        stores = self.read(file_paths, progress)
+        self.set_store(stores[0] if len(stores) == 1 else PlayerStore.concat(stores))
+        return self.store
+
+    def open_database(self, directory):
+        """Score straight from a memory-mapped player database (see player_db.py)"""
+        from player_db import PlayerDatabase
+
+        self.set_store(PlayerDatabase(directory))
+        return self.store
+
+    def merge(self, *file_paths, progress=None):
+        """Merge newer exports into the loaded players, oldest first.
+
+        Each attribute keeps its most precise value (see PlayerStore.merge).
+        Cached all-roles scores are only recomputed for the players that are
+        new or changed. Returns the merged rows that were new or changed.
+        Raises ValueError when a player database is loaded.
+        """
+        if self.store is not None and not self.store.in_memory:
+            # Merging builds the merged store in memory, the whole database with it
+            raise ValueError("Exports can't be merged into a player database; rebuild it with them")
+        stores = self.read(file_paths, progress)
+        if self.store is None:
+            store, stores = stores[0], stores[1:]
+            changed = set(range(len(store)))
+        else:
+            store, changed = self.store, set()
+        for newer in stores:
+            store, rows = store.merge(newer)
+            changed.update(rows.tolist())
+        changed = np.array(sorted(changed), dtype=np.intp)
+
+        previous, matrix = self.all_roles, self.role_matrix
+        self.set_store(store)
+        if previous is not None and self.role_matrix is matrix:
+            self.all_roles = rescore_all_roles(previous, store, changed)
+        return changed
+
+    def read(self, file_paths, progress=None):
+        """Parse exports (through the cache when there is one) into a list of stores"""
+        stores = []
+        for i, path in enumerate(file_paths):
+            file_progress = None
+            if progress is not None:
+                file_progress = lambda fraction, i=i: progress((i + fraction) / len(file_paths))
+            if self.cache is not None:
+                stores.append(self.cache.load(path, load_store, file_progress))
+            else:
+                stores.append(load_store(path, file_progress))
+        return stores
+
+    def set_store(self, store):
+        """Use a new player store, dropping scores cached for the old one"""
+        self.store = store
+        self.all_roles = None
+        self.filter_index = FilterIndex(store)
+        self.similarity = {}
+
+        # Compile the role catalog against the export's columns once, not per analysis
+        if self.role_matrix is None or not self.role_matrix.matches(store.attributes):
+            self.role_matrix = RoleMatrix(self.catalog, store.attributes)
+
+    def known_filter(self, role, minimum_pct, level=5):
+        """A filter for players with at least minimum_pct% of a role's importance-level attributes known"""
+        attributes = [attr for attr, importance in self.role_matrix.role_attributes[role]
+                      if importance == level]
+        return KnownFilter(attributes, minimum_pct)
+
+    def select(self, predicates):
+        """Sorted rows of the players matching every predicate (see player_filter), or None for all"""
+        return select(self.filter_index, predicates)
+
+    def analysis_rows(self, role, predicates, known_pct=0):
+        """select() for an analysis, plus the known-% filter when it is for one role"""
+        predicates = list(predicates)
+        if known_pct and role is not None:
+            predicates.append(self.known_filter(role, known_pct))
+        return self.select(predicates)
+
+    def score_role(self, role, top=None, rows=None):
+        """Rank players for one role, reusing the all-roles scores when they exist.
+
+        top keeps only the best top players; rows (from select) scores only
+        those players.
+        """
+        if role not in self.catalog:
+            raise KeyError(f"Unknown role: {role}")
+        if self.all_roles is not None:
+            result = self.all_roles.role_result(role)
+            if rows is not None:
+                result = result.within(rows)
+            return result if top is None else result.head(top)
+        return score_role(self.store, self.role_matrix, role, top, rows)
+
+    def add_rank_distribution(self, result, rows=None, samples=None, seed=None, progress=None):
+        """One role's result with Monte Carlo rank columns (see rank_sampling) added.
+
+        rows are the players the result was scored over (from select), None
+        for all; ranks are taken among them, however few the result keeps.
+        """
+        from rank_sampling import SAMPLES, rank_distribution
+
+        distribution = rank_distribution(self.store, self.role_matrix, result.role, rows,
+                                         samples or SAMPLES, seed=seed, progress=progress)
+        columns = {}
+        for name, values in distribution.items():
+            if rows is not None:
+                # Indexed by store row, like the summary of an unfiltered result
+                full = np.zeros(len(self.store), dtype=values.dtype)
+                full[rows] = values
+                values = full
+            columns[name] = values if result.summary_rows is None else values[result.summary_rows]
+        return result.with_summary(columns)
+
+    def similar_players(self, row, role, count=None, scope='role'):
+        """(store rows, distances) of the players most like row's, weighted by a role.
+
+        The role's search index (see similarity) is built by the first search
+        and kept until the players or the role change.
+        """
+        from similarity import SIMILAR_COUNT, SimilarityIndex
+
+        if role not in self.catalog:
+            raise KeyError(f"Unknown role: {role}")
+        if (role, scope) not in self.similarity:
+            self.similarity[role, scope] = SimilarityIndex(
+                self.store, role, self.role_matrix.role_attributes[role], scope)
+        return self.similarity[role, scope].nearest(row, count or SIMILAR_COUNT)
+
+    def pick_squad(self, formation, rows=None, depth=None):
+        """The best players for each slot of a formation (see squad), from the all-roles scores.
+
+        rows (from select) limits the players picked from; depth is the
+        number of choices per slot. Every role is scored first if not yet.
+        """
+        from squad import DEPTH, pick_squad
+
+        for role in formation:
+            if role not in self.catalog:
+                raise KeyError(f"Unknown role: {role}")
+        self.score_all_roles()
+        return pick_squad(self.all_roles, formation, rows, depth or DEPTH)
+
+    def weight_tuner(self, role, rows=None):
+        """A WeightTuner re-ranking one role's players (rows, or all) as its weights change"""
+        from weight_tuning import WeightTuner
+
+        return WeightTuner(self.score_role(role, rows=rows))
+
+    def score_all_roles(self, top=None, rows=None):
+        """Score every player against every role (cached until the next load).
+
+        top and rows limit the ranking returned, not the scores cached: every
+        player is scored so that switching roles or filters never rescores.
+        """
+        if self.all_roles is None:
+            self.all_roles = score_all_roles(self.store, self.role_matrix)
+        result = self.all_roles if rows is None else self.all_roles.within(rows)
+        return result if top is None else result.head(top)
@@ -0,0 +1,52 @@
+"""A window listing the players most like one player for a role.
+
+The list is short (see similarity.SIMILAR_COUNT), so it is a plain
+Treeview with an item per player. Double-click or Enter shows a player in
+the main window; 'Compare on Chart' draws the player searched from against
+the closest ones.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+COLUMNS = ('Name', 'distance', 'overall_rating', 'pessimistic_rating', 'optimistic_rating')
+
+
+class SimilarPlayersWindow:
+    """A Toplevel of one search's neighbours, closest first"""
+
+    def __init__(self, parent, title, rows, records, on_pick, on_compare=None):
+        self.rows = list(rows)  # Store rows, in list order
+        self.on_pick = on_pick  # Called with a store row to show
+        self.on_compare = on_compare  # Called with the listed store rows
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text=title, font=("Arial", 11, "bold")).pack(anchor='w', pady=(0, 5))
+
+        self.tree = ttk.Treeview(frame, columns=COLUMNS, show='headings',
+                                 height=max(len(self.rows), 1), selectmode='browse')
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=180 if col == 'Name' else 110,
+                             anchor='w' if col == 'Name' else 'center')
+        for i, record in enumerate(records):
+            self.tree.insert('', tk.END, iid=str(i), values=[
+                value if isinstance(value, str) else f"{value:.2f}" for value in record])
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind('<Double-Button-1>', lambda event: self.pick())
+        self.tree.bind('<Return>', lambda event: self.pick())
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X, pady=(5, 0))
+        if on_compare is not None:
+            ttk.Button(buttons, text="Compare on Chart",
+                       command=lambda: self.on_compare(self.rows)).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Close", command=self.window.destroy).pack(side=tk.RIGHT)
+
+    def pick(self):
+        selection = self.tree.selection()
+        if selection:
+            self.on_pick(self.rows[int(selection[0])])
@@ -0,0 +1,145 @@
+"""Find the players most like a given one, weighted by a role.
+
+Players are compared on a role's attributes, each weighted by its
+importance (5, 3 or 1), as a weighted root mean square difference in
+attribute points:
+
+    distance = sqrt(sum(w_i * (x_i - y_i)^2) / sum(w_i))
+
+x and y are best values (range midpoints). An unscouted attribute (0) is
+not a value, so it stands in as that attribute's mean over the scouted
+players rather than pulling its player towards 0.
+
+The features are the values scaled by sqrt(w_i / sum(w_i)), so the
+distance is plain Euclidean distance between feature rows. Roles weigh 30
+or more attributes, which is too many dimensions for a KD-tree to prune,
+so the search is a blocked scan: per block of BLOCK_ROWS players, squared
+distances come from one matrix-vector product (|x|^2 - 2 x.q + |q|^2, the
+norms cached) and partial selection keeps the best k. Searching only a
+role's key (importance 5) attributes has few enough dimensions for a
+KD-tree, and scipy's cKDTree is used for it when scipy is installed (and
+the players are in memory; a player database is always scanned).
+"""
+import numpy as np
+
+from scoring import top_k
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; the blocked scan needs only NumPy
+    cKDTree = None
+
+# Players compared per matrix-vector product
+BLOCK_ROWS = 65536
+
+# Most features a KD-tree is built for; beyond this a scan is as fast
+KD_TREE_MAX_DIMS = 12
+
+# Neighbours listed unless asked otherwise
+SIMILAR_COUNT = 20
+
+# 'role': every attribute of the role; 'key': only its importance 5 attributes
+SCOPES = ('role', 'key')
+
+
+def attribute_scales(attributes):
+    """sqrt(w_i / sum(w_i)) for [(abbreviation, importance)], so features compare by weighted RMS"""
+    weights = np.array([importance for _, importance in attributes], dtype=np.float64)
+    return np.sqrt(weights / weights.sum()) if len(weights) else weights
+
+
+def scouted_means(store, columns):
+    """Mean best value of each column over the players it is scouted for"""
+    sums = np.zeros(len(columns))
+    counts = np.zeros(len(columns))
+    for _, low, high in store.bound_chunks(columns):
+        scouted = high > 0
+        sums += (np.add(low, high, dtype=np.float64) / 2 * scouted).sum(axis=0)
+        counts += scouted.sum(axis=0)
+    return (sums / np.maximum(counts, 1)).astype(np.float32)
+
+
+def features_of(low, high, means, scales):
+    """Weighted features (players x attributes, float32) from some players' bounds"""
+    values = np.add(low, high, dtype=np.float32) / 2
+    return (np.where(high > 0, values, means) * scales).astype(np.float32)
+
+
+class SimilarityIndex:
+    """Nearest players to any player of a store, for one role's weighting.
+
+    The features of an in-memory store are computed once; a player
+    database's are computed block by block on every search instead, so a
+    search reads the database once but never holds it in memory.
+    """
+
+    def __init__(self, store, role, attributes, scope='role'):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown similarity scope: {scope}")
+        if scope == 'key':
+            attributes = [(attr, importance) for attr, importance in attributes if importance == 5]
+        self.store = store
+        self.role = role
+        self.attributes = attributes  # [(abbreviation, importance)] compared
+        self.columns = [store.columns[attr] for attr, _ in attributes]
+        self.scales = attribute_scales(attributes)
+        self.means = scouted_means(store, self.columns)
+        self.features = self.tree = self.norms = None
+        if store.in_memory:
+            self.features = self.features_for()
+            if cKDTree is not None and len(attributes) <= KD_TREE_MAX_DIMS:
+                self.tree = cKDTree(self.features)
+            else:
+                self.norms = np.einsum('ij,ij->i', self.features, self.features)
+
+    def features_for(self, rows=None):
+        """Features of some store rows (or all), in the order given"""
+        if self.features is not None:
+            return self.features if rows is None else self.features[rows]
+        return np.concatenate([features_of(low, high, self.means, self.scales)
+                               for _, low, high in self.store.bound_chunks(self.columns, rows)]
+                              or [np.empty((0, len(self.columns)), dtype=np.float32)])
+
+    def blocks(self):
+        """(first row, features, squared norms) of consecutive blocks of players"""
+        if self.features is not None:
+            for start in range(0, len(self.store), BLOCK_ROWS):
+                stop = min(start + BLOCK_ROWS, len(self.store))
+                yield start, self.features[start:stop], self.norms[start:stop]
+            return
+        for part, low, high in self.store.bound_chunks(self.columns):
+            features = features_of(low, high, self.means, self.scales)
+            yield part.start, features, np.einsum('ij,ij->i', features, features)
+
+    def nearest(self, row, count=SIMILAR_COUNT):
+        """(store rows, distances) of the count players most like row's, closest first"""
+        count = min(count, len(self.store) - 1)
+        if count <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        query = self.features_for(np.array([row]))[0]
+        if self.tree is not None:
+            # One extra, since the player finds itself (or a twin) at distance 0
+            _, found = self.tree.query(query, k=count + 1)
+            found = found[found != row][:count]
+        else:
+            found = self.scan(row, query, count)
+        distances = np.sqrt(((self.features_for(found) - query).astype(np.float64) ** 2).sum(axis=1))
+        return found, distances
+
+    def scan(self, row, query, count):
+        """The count nearest rows to row's features (query), block by block"""
+        query_norm = float(query @ query)
+        kept = np.empty(0, dtype=np.intp)
+        kept_scores = np.empty(0, dtype=np.float32)
+        for start, features, norms in self.blocks():
+            stop = start + len(features)
+            # Negated squared distances, so the largest are the nearest
+            scores = 2 * (features @ query) - norms - query_norm
+            if start <= row < stop:
+                scores[row - start] = -np.inf
+            # Kept rows stay in row order ahead of the block, so top_k breaks ties towards earlier rows
+            scores = np.concatenate([kept_scores, scores])
+            rows = np.concatenate([kept, np.arange(start, stop)])
+            best = np.sort(top_k(scores, count))
+            kept, kept_scores = rows[best], scores[best]
+        return kept[top_k(kept_scores, count)]
@@ -0,0 +1,182 @@
+"""Pick the players for a formation from the all-roles scores.
+
+A formation is a list of roles, one per slot (a role may fill several
+slots). The starting players are the one-to-one assignment of players to
+slots with the highest total overall_rating, solved with scipy's
+linear_sum_assignment when scipy is installed and otherwise with the
+Hungarian method below. The second (and any further) choice for each slot
+is the same assignment over the players not picked yet, so a depth chart
+never names a player twice.
+
+Only a few players can be in an optimal assignment: whoever fills a slot
+is among the best n players for its role (n slots), since otherwise one of
+those n is unused and could take the slot for at least as much. So each
+round only solves for the union of every formation role's top n, at most
+n * n players, however many players the pool has.
+"""
+import numpy as np
+
+from scoring import RankedResult, top_k
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional; hungarian() needs only NumPy
+    linear_sum_assignment = None
+
+# Slots filled when no formation is given: a back four, three in midfield, three up front
+DEFAULT_FORMATION = [
+    'Goalkeeper',
+    'Full-Back (Defend)', 'Central Defender (Defend)', 'Ball Playing Defender (Defend)',
+    'Wing-Back (Defend)',
+    'Defensive Midfielder (Defend)', 'Box To Box Midfielder (Support)', 'Mezzala (Support)',
+    'Advanced Forward (Attack)', 'Poacher (Attack)', 'Deep Lying Forward (Support)',
+]
+
+# Choices per slot unless asked otherwise: the starter and a second choice
+DEPTH = 2
+
+
+def hungarian(cost):
+    """Column assigned to each row of a (rows x columns) cost matrix, rows <= columns, minimizing the total.
+
+    The O(rows^2 * columns) shortest augmenting path method with row and
+    column potentials; the scan over columns in each step is vectorized.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.intp)  # 1-based row holding each column (0: free); column 0 is a sentinel
+    way = np.zeros(m + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        owner[0] = i
+        column = 0
+        slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            row = owner[column]
+            reduced = cost[row - 1] - u[row] - v[1:]
+            better = ~used[1:] & (reduced < slack[1:])
+            slack[1:][better] = reduced[better]
+            way[1:][better] = column
+            free_slack = np.where(used[1:], np.inf, slack[1:])
+            nearest = int(np.argmin(free_slack)) + 1
+            delta = free_slack[nearest - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            slack[~used] -= delta
+            column = nearest
+            if owner[column] == 0:
+                break
+        # Flip the augmenting path back to the start
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+    assigned = np.empty(n, dtype=np.intp)
+    for column in np.flatnonzero(owner[1:]) + 1:
+        assigned[owner[column] - 1] = column - 1
+    return assigned
+
+
+def assign(scores):
+    """(slot positions, candidate positions) pairing slots with candidates for the highest total score"""
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(scores, maximize=True)
+    n, m = scores.shape
+    if n <= m:
+        return np.arange(n), hungarian(-scores)
+    # Fewer candidates than slots: give each candidate a slot instead
+    slots = hungarian(-scores.T)
+    order = np.argsort(slots)
+    return slots[order], order
+
+
+class SquadResult(RankedResult):
+    """The players picked for each slot of a formation, starters and backups, in slot order"""
+
+    def __init__(self, store, matrix, formation, slots, choices, rows, ratings):
+        super().__init__(store, rows, total=len(rows))
+        self.matrix = matrix
+        self.formation = list(formation)
+        # Per pick, in the order rows lists them
+        self.slots = slots  # Formation position filled
+        self.choices = choices  # 1 for the starter, 2 for the second choice, ...
+        self.ratings = ratings  # overall_rating for the slot's role
+        self.picked = rows
+        self._sorter = np.argsort(rows)
+
+    @property
+    def columns(self):
+        return ['Slot', 'Role', 'Choice', 'Name', 'overall_rating']
+
+    @property
+    def display_columns(self):
+        return self.columns
+
+    def picks(self, rows):
+        """Positions of some picked store rows among the picks"""
+        return self._sorter[np.searchsorted(self.picked, rows, sorter=self._sorter)]
+
+    def values(self, name, rows):
+        if name == 'Name':
+            return self.store.names[rows]
+        picks = self.picks(rows)
+        if name == 'Slot':
+            return self.slots[picks] + 1
+        if name == 'Role':
+            return np.array(self.formation, dtype=object)[self.slots[picks]]
+        if name == 'Choice':
+            return self.choices[picks]
+        if name == 'overall_rating':
+            return self.ratings[picks]
+        raise KeyError(name)
+
+    def role_for(self, row):
+        """The role of the slot a player was picked for"""
+        return self.formation[self.slots[self.picks([row])[0]]]
+
+    def attributes_for(self, role):
+        return self.matrix.role_attributes[role]
+
+    def starting_rating(self):
+        """Total overall_rating of the first choices"""
+        return float(self.ratings[self.choices == 1].sum())
+
+
+def pick_squad(all_roles, formation, rows=None, depth=DEPTH):
+    """A SquadResult filling each slot of formation from an AllRolesResult's ratings.
+
+    rows (sorted store rows, e.g. from a filter) limits the players picked
+    from; depth is how many choices each slot gets. Slots go unfilled once
+    the pool runs out of players.
+    """
+    matrix = all_roles.matrix
+    ratings = all_roles.ratings if rows is None else all_roles.ratings[rows]
+    columns = [matrix.index[role] for role in formation]
+    n = len(formation)
+    available = np.ones(len(ratings), dtype=bool)
+
+    picks = []  # (slot, choice, pool position, rating)
+    for choice in range(1, depth + 1):
+        # Every role's best n available players: the only ones an optimal assignment can use
+        candidates = set()
+        for column in set(columns):
+            scores = np.where(available, ratings[:, column], -np.inf)
+            best = top_k(scores, min(n, int(available.sum())))
+            candidates.update(best.tolist())
+        if not candidates:
+            break
+        candidates = np.array(sorted(candidates), dtype=np.intp)
+        slots, chosen = assign(ratings[np.ix_(candidates, columns)].T)
+        for slot, position in zip(slots.tolist(), candidates[chosen].tolist()):
+            picks.append((slot, choice, position, float(ratings[position, columns[slot]])))
+            available[position] = False
+
+    picks.sort()
+    slots = np.array([slot for slot, _, _, _ in picks], dtype=np.intp)
+    choices = np.array([choice for _, choice, _, _ in picks], dtype=np.int64)
+    positions = np.array([position for _, _, position, _ in picks], dtype=np.intp)
+    picked_rows = positions if rows is None else rows[positions]
+    picked_ratings = np.array([rating for _, _, _, rating in picks])
+    return SquadResult(all_roles.store, matrix, formation, slots, choices, picked_rows, picked_ratings)
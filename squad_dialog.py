@@ -0,0 +1,60 @@
+"""A window for choosing a formation's roles and picking a squad for it.
+
+Each slot is a role dropdown, filled in with squad.DEFAULT_FORMATION; a
+slot left empty is dropped. The squad is picked from the players passing
+the sidebar filters, with the chosen number of choices per slot.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from squad import DEFAULT_FORMATION, DEPTH
+
+# Slots offered, enough for a full XI
+SLOTS = 11
+
+
+class SquadDialog:
+    """A Toplevel of slot dropdowns; 'Pick Squad' calls on_pick(formation, depth)"""
+
+    def __init__(self, parent, roles, on_pick, formation=None):
+        self.on_pick = on_pick
+        formation = [role for role in (formation or DEFAULT_FORMATION) if role in roles]
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Pick Squad")
+
+        slots = ttk.LabelFrame(self.window, text="Formation (one role per slot)", padding="10")
+        slots.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        self.slot_vars = []
+        for i in range(SLOTS):
+            ttk.Label(slots, text=f"{i + 1}.").grid(row=i, column=0, sticky='e', padx=(0, 5))
+            variable = tk.StringVar(value=formation[i] if i < len(formation) else '')
+            ttk.Combobox(slots, textvariable=variable, values=[''] + list(roles), width=35,
+                         state='readonly').grid(row=i, column=1, pady=1)
+            self.slot_vars.append(variable)
+
+        options = ttk.Frame(self.window)
+        options.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(options, text="Choices per slot:").pack(side=tk.LEFT)
+        self.depth_var = tk.StringVar(value=str(DEPTH))
+        ttk.Spinbox(options, from_=1, to=5, width=4, textvariable=self.depth_var).pack(side=tk.LEFT,
+                                                                                       padx=(5, 0))
+
+        buttons = ttk.Frame(self.window)
+        buttons.pack(fill=tk.X, padx=10, pady=(5, 10))
+        ttk.Button(buttons, text="Pick Squad", command=self.pick).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Close", command=self.window.destroy).pack(side=tk.RIGHT)
+
+    def formation(self):
+        return [variable.get() for variable in self.slot_vars if variable.get()]
+
+    def depth(self):
+        try:
+            return max(1, int(self.depth_var.get()))
+        except (tk.TclError, ValueError):
+            return DEPTH
+
+    def pick(self):
+        formation = self.formation()
+        if formation:
+            self.on_pick(formation, self.depth())
@@ -0,0 +1,40 @@
+"""Make the top-level modules importable however pytest is started, and share fixtures."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from session import ScoutingSession, load_store  # noqa: E402
+
+EXPORT = os.path.join(ROOT, 'all attackers.html')
+
+
+def write_export(path, header, rows):
+    """Write a minimal FM HTML export: one table, a header row of th and rows of td cells"""
+    def row(tag, cells):
+        cells = ''.join(f'<{tag}>{"" if cell is None else cell}</{tag}>' for cell in cells)
+        return f'<tr>{cells}</tr>\n'
+
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write('<html><body><table>\n' + row('th', header))
+        handle.writelines(row('td', cells) for cells in rows)
+        handle.write('</table></body></html>\n')
+    return path
+
+
+@pytest.fixture(scope='session')
+def export_store():
+    """The bundled export, parsed once; tests must not modify it"""
+    return load_store(EXPORT)
+
+
+@pytest.fixture
+def session(export_store):
+    """A fresh session over the bundled export"""
+    session = ScoutingSession()
+    session.set_store(export_store)
+    return session
@@ -0,0 +1,92 @@
+"""The block parsers must agree with the per-cell parsers on every cell."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from attribute_parser import (parse_attribute_block, parse_attribute_bounds,
+                              parse_attribute_bounds_block, parse_attribute_value)
+from export_parser import read_export
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORTS = ['all attackers.html', 'more players just atributes.html']
+
+# Cells FM writes plus the malformed ones the scalar parser has rules for
+EDGE_CASES = [
+    '12', '7-14', '-', '', None, np.nan, ' 9 ', '7 - 14', '20-20', '0', '007',
+    '- -  -', '5-', '-5', '7-14-3', 'abc', '1.5', '+3', '3-x', '12.0', 12, 12.0,
+    '٣', '99999999999', '1_000', ' - ', '\t15\n',
+    '100', '9' * 30, '5-' + '9' * 30, '٣' * 25, '7-140',
+]
+
+
+def attribute_columns(df):
+    return [col for col in df.columns if col not in ['Name', 'Inf'] and len(col) <= 3]
+
+
+def scalar_block(df, columns):
+    """The old process_data path: apply the scalar parser cell by cell"""
+    abs_columns, est_columns = [], []
+    for col in columns:
+        parsed = df[col].apply(parse_attribute_value)
+        abs_columns.append([x[0] for x in parsed])
+        est_columns.append([x[1] for x in parsed])
+    return np.array(abs_columns).T, np.array(est_columns, dtype=float).T
+
+
+def scalar_bounds_block(df, columns):
+    """parse_attribute_bounds cell by cell, as (abs, low, high) player x column arrays"""
+    parsed = np.array([[parse_attribute_bounds(df[col].iat[row]) for col in columns]
+                       for row in range(len(df))], dtype=np.int64).reshape(len(df), len(columns), 3)
+    return parsed[..., 0], parsed[..., 1], parsed[..., 2]
+
+
+def assert_equivalent(df, columns):
+    expected_abs, expected_est = scalar_block(df, columns)
+    actual_abs, actual_est = parse_attribute_block(df, columns)
+    np.testing.assert_array_equal(actual_abs, expected_abs)
+    np.testing.assert_array_equal(actual_est, expected_est)
+    for expected, actual in zip(scalar_bounds_block(df, columns),
+                                parse_attribute_bounds_block(df, columns)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def cells_frame(cells):
+    return pd.DataFrame({'Val': pd.Series(cells, dtype=object)})
+
+
+@pytest.mark.parametrize('cell', EDGE_CASES, ids=repr)
+def test_edge_case(cell):
+    assert_equivalent(cells_frame([cell]), ['Val'])
+
+
+def test_edge_cases_together():
+    # One block, so distinct cells share the factorized lookup
+    assert_equivalent(cells_frame(EDGE_CASES * 2), ['Val'])
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ('12', (12, 12.0)), ('7-14', (0, 10.5)), ('-', (0, 0.0)), ('', (0, 0.0)),
+    (' 9 ', (9, 9.0)), ('abc', (0, 0.0)),
+])
+def test_block_values(cell, expected):
+    abs_values, est = parse_attribute_block(cells_frame([cell]), ['Val'])
+    assert (abs_values[0, 0], est[0, 0]) == expected
+
+
+@pytest.mark.parametrize('cell', ['100', '9' * 30, '5-' + '9' * 30, '٣' * 25, '7-140'], ids=repr)
+def test_long_numbers_are_unknown(cell):
+    abs_values, low, high = parse_attribute_bounds_block(cells_frame([cell]), ['Val'])
+    assert (abs_values[0, 0], low[0, 0], high[0, 0]) == (0, 0, 0)
+
+
+def test_empty_block():
+    abs_values, est = parse_attribute_block(cells_frame([]), ['Val'])
+    assert abs_values.shape == est.shape == (0, 1)
+
+
+@pytest.mark.parametrize('export', EXPORTS)
+def test_bundled_export(export):
+    df = read_export(os.path.join(ROOT, export))
+    assert_equivalent(df, attribute_columns(df))
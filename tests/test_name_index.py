@@ -0,0 +1,65 @@
+"""Name search finds exact names, then word prefixes, then substrings."""
+import numpy as np
+import pytest
+
+from name_index import NameIndex, normalize
+
+NAMES = ['Harry Kane', 'Thomas Müller', 'Kane Smith', 'Dominic Calvert-Lewin', 'Kanelo',
+         'Jack O\'Brien', 'Harry Kane', 'Erling Haaland', None, 'Ben  White']
+
+
+@pytest.fixture(scope='module')
+def index():
+    return NameIndex(NAMES)
+
+
+def test_normalize():
+    assert normalize('  Thomas   MÜLLER ') == 'thomas muller'
+    assert normalize(None) == ''
+
+
+def test_row_of_takes_the_first_exact_match(index):
+    assert index.row_of('Harry Kane') == 0
+    assert index.row_of('harry kane') is None
+
+
+def test_exact_then_prefix_then_later_word(index):
+    # 'kane' starts Kane Smith and Kanelo (alphabetical), and is a later word of Harry Kane
+    assert index.search('kane') == [2, 4, 0, 6]
+    assert index.search('kanelo') == [4]
+    assert index.search('harry kane') == [0, 6]
+
+
+def test_later_word_prefixes(index):
+    assert index.search('lew') == [3]  # After a hyphen
+    assert index.search('bri') == [5]  # After an apostrophe
+    assert index.search('muller') == [1]  # Accents ignored
+
+
+def test_substring_matches_come_last_in_row_order(index):
+    assert index.search('an') == [0, 2, 4, 6, 7]
+    assert index.search('aal') == [7]
+
+
+def test_limit_and_empty_queries(index):
+    assert len(index.search('a', limit=3)) == 3
+    assert index.search('   ') == []
+    assert index.search('zzz') == []
+
+
+def test_contains_matches_a_scan(export_store):
+    index = NameIndex(export_store.names)
+    for text in ['son', 'AN', 'ü', 'de ', 'x']:
+        expected = [row for row, name in enumerate(export_store.names)
+                    if normalize(text) in normalize(name)]
+        np.testing.assert_array_equal(index.contains(text), expected)
+
+
+def test_search_matches_a_scan(export_store):
+    index = NameIndex(export_store.names)
+    for query in ['ha', 'son', 'kane', 'mo']:
+        found = index.search(query, limit=len(export_store))
+        expected = {row for row, name in enumerate(export_store.names)
+                    if normalize(query) in normalize(name)}
+        assert sorted(found) == sorted(expected)
+        assert len(found) == len(set(found))
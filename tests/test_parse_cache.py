@@ -0,0 +1,78 @@
+"""The parse cache returns a cached store for an unchanged export and reparses a changed one."""
+import os
+
+import numpy as np
+import pytest
+
+from conftest import write_export
+from parse_cache import ParseCache
+from session import load_store
+
+HEADER = ['Name', 'Inf', 'Fin', 'Pac']
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path, progress=None):
+        self.calls += 1
+        return load_store(path, progress)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def export(tmp_path):
+    return write_export(str(tmp_path / 'export.html'), HEADER,
+                        [['A', None, '12', '7-14'], ['B', 'Inj', '-', '15']])
+
+
+def assert_same_store(actual, expected):
+    assert actual.names.tolist() == expected.names.tolist()
+    assert actual.attributes == expected.attributes
+    np.testing.assert_array_equal(actual.low, expected.low)
+    np.testing.assert_array_equal(actual.high, expected.high)
+    np.testing.assert_array_equal(actual.abs_bits, expected.abs_bits)
+    assert actual.metadata['Inf'].tolist() == expected.metadata['Inf'].tolist()
+
+
+def test_unchanged_export_hits(cache, export):
+    parse = CountingParser()
+    first = cache.load(export, parse)
+    second = cache.load(export, parse)
+    assert parse.calls == 1
+    assert_same_store(second, first)
+
+
+def test_touched_export_still_hits(cache, export):
+    parse = CountingParser()
+    cache.load(export, parse)
+    stat = os.stat(export)
+    os.utime(export, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    cache.load(export, parse)
+    assert parse.calls == 1
+
+
+def test_changed_export_is_reparsed(cache, export):
+    parse = CountingParser()
+    cache.load(export, parse)
+    write_export(export, HEADER, [['A', None, '13', '7-14'], ['B', None, '-', '15']])
+    store = cache.load(export, parse)
+    assert parse.calls == 2
+    assert_same_store(store, load_store(export))
+
+
+def test_unreadable_entry_is_reparsed(cache, export):
+    parse = CountingParser()
+    cache.load(export, parse)
+    for name in os.listdir(cache.directory):
+        if name.endswith('.npz'):
+            with open(os.path.join(cache.directory, name), 'wb') as handle:
+                handle.write(b'not an archive')
+    store = cache.load(export, parse)
+    assert parse.calls == 2
+    assert_same_store(store, load_store(export))
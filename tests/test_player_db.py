@@ -0,0 +1,93 @@
+"""A player database holds the same players as the in-memory store and scores them the same."""
+import numpy as np
+import pytest
+
+from conftest import EXPORT
+from player_db import PlayerDatabase, build_database
+from rank_sampling import rank_distribution
+from scoring import score_all_roles, score_role
+from similarity import SimilarityIndex
+
+ROLE = 'Poacher (Attack)'
+
+
+@pytest.fixture(scope='module')
+def database_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('db') / 'players')
+    # Small build chunks, so the writer appends more than once
+    build_database(directory, [EXPORT], chunk_rows=500)
+    return directory
+
+
+@pytest.fixture
+def database(database_dir):
+    # Small scoring chunks, so every chunked path runs over several chunks
+    return PlayerDatabase(database_dir, chunk_rows=300)
+
+
+def test_round_trip(database, export_store):
+    assert len(database) == len(export_store)
+    assert database.attributes == export_store.attributes
+    assert database.names.tolist() == export_store.names.tolist()
+    np.testing.assert_array_equal(database.low, export_store.low)
+    np.testing.assert_array_equal(database.high, export_store.high)
+    np.testing.assert_array_equal(database.abs_bits, export_store.abs_bits)
+    assert list(database.metadata) == list(export_store.metadata)
+    for col, values in export_store.metadata.items():
+        assert database.metadata[col].tolist() == values.tolist()
+
+
+def test_row_lookups(database, export_store):
+    rows = np.array([5, 0, len(export_store) - 1])
+    assert database.names[rows].tolist() == export_store.names[rows].tolist()
+    np.testing.assert_array_equal(database.best_values('Fin', rows),
+                                  export_store.best_values('Fin', rows))
+
+
+def test_scores_match(database, session):
+    matrix = session.role_matrix
+    expected = score_role(session.store, matrix, ROLE)
+    actual = score_role(database, matrix, ROLE)
+    np.testing.assert_array_equal(actual.order, expected.order)
+    np.testing.assert_allclose(actual.column('overall_rating'), expected.column('overall_rating'))
+
+    top = score_role(database, matrix, ROLE, top=25)
+    np.testing.assert_array_equal(top.order, expected.order[:25])
+
+    rows = np.arange(3, len(database), 4)
+    np.testing.assert_array_equal(score_role(database, matrix, ROLE, rows=rows).order,
+                                  score_role(session.store, matrix, ROLE, rows=rows).order)
+
+    np.testing.assert_allclose(score_all_roles(database, matrix).ratings,
+                               score_all_roles(session.store, matrix).ratings)
+
+
+def test_similar_players_match(database, session):
+    attributes = session.role_matrix.role_attributes[ROLE]
+    for scope in ('role', 'key'):
+        in_memory = SimilarityIndex(session.store, ROLE, attributes, scope)
+        streamed = SimilarityIndex(database, ROLE, attributes, scope)
+        for row in (0, 123, len(database) - 1):
+            expected_rows, expected_distances = in_memory.nearest(row, 10)
+            rows, distances = streamed.nearest(row, 10)
+            np.testing.assert_array_equal(rows, expected_rows)
+            np.testing.assert_allclose(distances, expected_distances, rtol=1e-6)
+
+
+def test_rank_sampling_runs_chunked(database, session):
+    ranks = rank_distribution(database, session.role_matrix, ROLE, samples=16, seed=2)
+    count = len(database)
+    # Each sample ranks every player 1..count once
+    assert ranks['rank_mean'].sum() == pytest.approx(count * (count + 1) / 2)
+    assert (ranks['rank_best'] <= ranks['rank_worst']).all()
+    again = rank_distribution(database, session.role_matrix, ROLE, samples=16, seed=2)
+    for name, values in ranks.items():
+        np.testing.assert_array_equal(again[name], values)
+
+
+def test_whole_matrix_features_refuse_a_database(database_dir, session):
+    session.open_database(database_dir)
+    with pytest.raises(ValueError):
+        session.merge(EXPORT)
+    with pytest.raises(ValueError):
+        session.weight_tuner(ROLE)
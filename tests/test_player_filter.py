@@ -0,0 +1,81 @@
+"""Indexed filters select the same players as brute-force masks over the store."""
+import numpy as np
+import pytest
+
+from name_index import normalize
+from player_filter import (AttributeFilter, FilterIndex, KnownFilter, NameFilter, parse_conditions,
+                           select)
+
+
+@pytest.fixture
+def index(export_store):
+    return FilterIndex(export_store)
+
+
+def attribute_mask(store, attr, op, value):
+    best = store.best_values(attr)
+    return {'>=': best >= value, '>': best > value, '<=': best <= value, '<': best < value,
+            '=': best == value}[op]
+
+
+def known_mask(store, attributes, minimum_pct):
+    known = np.column_stack([store.is_absolute(attr) for attr in attributes])
+    return known.mean(axis=1) * 100 >= minimum_pct - 1e-9
+
+
+def name_mask(store, text):
+    return np.array([normalize(text) in normalize(name) for name in store.names], dtype=bool)
+
+
+@pytest.mark.parametrize('op', ['>=', '>', '<=', '<', '='])
+@pytest.mark.parametrize('value', [0, 9.5, 12, 15])
+def test_attribute_filter(index, export_store, op, value):
+    predicate = AttributeFilter('Fin', op, value)
+    expected = np.flatnonzero(attribute_mask(export_store, 'Fin', op, value))
+    np.testing.assert_array_equal(predicate.rows(index), expected)
+    assert predicate.count(index) == len(expected)
+    rows = np.arange(0, len(export_store), 5)
+    np.testing.assert_array_equal(predicate.test(index, rows),
+                                  attribute_mask(export_store, 'Fin', op, value)[rows])
+
+
+@pytest.mark.parametrize('minimum_pct', [0, 34, 50, 100])
+def test_known_filter(index, export_store, minimum_pct):
+    attributes = ['Fin', 'Pac', 'Acc']
+    predicate = KnownFilter(attributes, minimum_pct)
+    expected = np.flatnonzero(known_mask(export_store, attributes, minimum_pct))
+    np.testing.assert_array_equal(predicate.rows(index), expected)
+    assert predicate.count(index) == len(expected)
+
+
+def test_name_filter(index, export_store):
+    predicate = NameFilter('SON')
+    expected = np.flatnonzero(name_mask(export_store, 'son'))
+    assert len(expected)
+    np.testing.assert_array_equal(predicate.rows(index), expected)
+
+
+def test_select_matches_all_masks(index, export_store):
+    predicates = parse_conditions('Fin >= 12, pac > 11; Acc <= 17', export_store.attributes)
+    predicates += [KnownFilter(['Fin', 'Pac'], 50), NameFilter('a')]
+    expected = (attribute_mask(export_store, 'Fin', '>=', 12) &
+                attribute_mask(export_store, 'Pac', '>', 11) &
+                attribute_mask(export_store, 'Acc', '<=', 17) &
+                known_mask(export_store, ['Fin', 'Pac'], 50) &
+                name_mask(export_store, 'a'))
+    assert expected.any()
+    np.testing.assert_array_equal(select(index, predicates), np.flatnonzero(expected))
+
+
+def test_select_without_predicates(index):
+    assert select(index, []) is None
+
+
+def test_select_with_no_matches(index):
+    assert len(select(index, [AttributeFilter('Fin', '>', 20), NameFilter('a')])) == 0
+
+
+@pytest.mark.parametrize('text', ['Fin >> 3', 'Xyz >= 3', 'Fin >= high'])
+def test_bad_conditions(export_store, text):
+    with pytest.raises(ValueError):
+        parse_conditions(text, export_store.attributes)
@@ -0,0 +1,92 @@
+"""Merging successive exports keeps the most precise value of each attribute."""
+import numpy as np
+
+from player_store import UNKNOWN_WIDTH, PlayerStore, precision
+from scoring import rescore_all_roles, score_all_roles
+
+HEADER = ['Name', 'Inf', 'Fin', 'Pac']
+
+
+def store(*rows):
+    return PlayerStore.from_rows(HEADER, [list(row) for row in rows])
+
+
+def bounds(merged, name, attr):
+    row = list(merged.names).index(name)
+    col = merged.columns[attr]
+    return int(merged.low[row, col]), int(merged.high[row, col]), bool(merged.is_absolute(attr, [row])[0])
+
+
+def test_precision_order():
+    low = np.array([[12, 7, 10, 0]], dtype=np.uint8)
+    high = np.array([[12, 14, 11, 0]], dtype=np.uint8)
+    absolute = np.array([[True, False, False, False]])
+    assert precision(low, high, absolute).tolist() == [[-1, 7, 1, UNKNOWN_WIDTH]]
+
+
+def test_precision_of_a_reversed_range_is_unscouted():
+    low = np.array([[14]], dtype=np.uint8)
+    high = np.array([[7]], dtype=np.uint8)
+    assert precision(low, high, np.array([[False]])).tolist() == [[UNKNOWN_WIDTH]]
+
+
+def test_merge_does_not_take_a_reversed_range_over_a_known_value():
+    merged, _ = store(['A', None, '12', '10']).merge(store(['A', None, '14-7', '10']))
+    assert bounds(merged, 'A', 'Fin') == (12, 12, True)
+
+
+def test_merge_keeps_the_most_precise_value():
+    older = store(['A', None, '12', '7-14'], ['B', None, '8-12', '10-11'], ['C', None, '-', '9'])
+    newer = store(['A', None, '5-15', '9-12'], ['B', None, '9-13', '-'], ['C', None, '6-8', '-'])
+    merged, changed = older.merge(newer)
+    assert bounds(merged, 'A', 'Fin') == (12, 12, True)  # Known beats a range
+    assert bounds(merged, 'A', 'Pac') == (9, 12, False)  # A narrower range wins
+    assert bounds(merged, 'B', 'Fin') == (9, 13, False)  # Same width: the newer export wins
+    assert bounds(merged, 'B', 'Pac') == (10, 11, False)  # A range beats unscouted
+    assert bounds(merged, 'C', 'Fin') == (6, 8, False)
+    assert bounds(merged, 'C', 'Pac') == (9, 9, True)
+    assert changed.tolist() == [0, 1, 2]
+
+
+def test_merge_appends_new_players_and_reports_only_changes():
+    older = store(['A', None, '12', '7-14'], ['B', None, '8', '10'])
+    newer = store(['B', None, '8', '10'], ['D', None, '14', '-'])
+    merged, changed = older.merge(newer)
+    assert merged.names.tolist() == ['A', 'B', 'D']
+    assert bounds(merged, 'D', 'Fin') == (14, 14, True)
+    assert changed.tolist() == [2]
+
+
+def test_merge_takes_the_newer_metadata():
+    older = store(['A', 'Inj', '12', '10'], ['B', 'Ban', '8', '10'])
+    newer = store(['A', None, '12', '10'], ['B', 'Inj', '8', '10'])
+    merged, _ = older.merge(newer)
+    assert merged.metadata['Inf'].tolist() == [None, 'Inj']
+
+
+def test_merge_matches_by_uid():
+    header = ['Name', 'UID', 'Fin']
+    older = PlayerStore.from_rows(header, [['A', '1', '7-14'], ['A', '2', '10']])
+    newer = PlayerStore.from_rows(header, [['A', '2', '11'], ['A Renamed', '1', '12']])
+    merged, _ = older.merge(newer)
+    assert merged.names.tolist() == ['A Renamed', 'A']
+    assert merged.low[:, 0].tolist() == [12, 11]
+
+
+def test_incremental_rescore_matches_a_full_rescore(session):
+    old = session.store
+    rows = np.arange(0, len(old), 7)
+    # Every sampled player scouted in full (known values beat ranges), plus some new players
+    best = np.round((old.low[rows].astype(np.float64) + old.high[rows]) / 2).astype(np.uint8)
+    names = old.names[rows].copy()
+    names[:5] = [f'New Player {i}' for i in range(5)]
+    newer = PlayerStore(names, old.attributes, best, best,
+                        np.packbits(best > 0, axis=1), {'Inf': np.full(len(rows), None, dtype=object)})
+
+    all_roles = score_all_roles(old, session.role_matrix)
+    merged, changed = old.merge(newer)
+    assert len(merged) == len(old) + 5
+    incremental = rescore_all_roles(all_roles, merged, changed)
+    full = score_all_roles(merged, session.role_matrix)
+    np.testing.assert_allclose(incremental.ratings, full.ratings, rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(incremental.order, full.order)
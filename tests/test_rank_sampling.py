@@ -0,0 +1,71 @@
+"""Sampled rank distributions are repeatable for a seed and consistent with the ratings."""
+import numpy as np
+import pytest
+
+from player_store import PlayerStore
+from rank_sampling import rank_distribution
+from scoring import score_role
+
+ROLE = 'Poacher (Attack)'
+
+
+def assert_same(first, second):
+    assert list(first) == list(second)
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
+
+
+def test_a_seed_repeats(session):
+    first = rank_distribution(session.store, session.role_matrix, ROLE, samples=20, seed=7)
+    second = rank_distribution(session.store, session.role_matrix, ROLE, samples=20, seed=7)
+    assert_same(first, second)
+    other = rank_distribution(session.store, session.role_matrix, ROLE, samples=20, seed=8)
+    assert not np.array_equal(first['rank_mean'], other['rank_mean'])
+
+
+def test_a_seed_repeats_through_the_session(session):
+    result = score_role(session.store, session.role_matrix, ROLE, top=30)
+    first = session.add_rank_distribution(result, samples=12, seed=3)
+    second = session.add_rank_distribution(result, samples=12, seed=3)
+    for name in ('rank_mean', 'rank_best', 'rank_worst', 'top_10_pct'):
+        np.testing.assert_array_equal(first.column(name), second.column(name))
+
+
+def test_rank_statistics_are_consistent(session):
+    count = len(session.store)
+    ranks = rank_distribution(session.store, session.role_matrix, ROLE, samples=24, seed=1, top=10)
+    # Every sample hands out ranks 1..count once, and 10 players make the top 10
+    assert ranks['rank_mean'].sum() == pytest.approx(count * (count + 1) / 2)
+    assert ranks['top_10_pct'].sum() == pytest.approx(10 * 100)
+    assert (1 <= ranks['rank_best']).all() and (ranks['rank_worst'] <= count).all()
+    assert (ranks['rank_best'] <= ranks['rank_mean']).all()
+    assert (ranks['rank_mean'] <= ranks['rank_worst']).all()
+
+
+def test_ranks_among_filtered_rows(session):
+    rows = np.arange(0, len(session.store), 4)
+    ranks = rank_distribution(session.store, session.role_matrix, ROLE, rows=rows,
+                              samples=8, seed=1)
+    assert len(ranks['rank_mean']) == len(rows)
+    assert ranks['rank_worst'].max() <= len(rows)
+
+
+def test_known_values_rank_as_the_ratings(session):
+    # Every range collapsed to its low bound: nothing left to sample
+    store = session.store
+    fixed = PlayerStore(store.names, store.attributes, store.low, store.low, store.abs_bits,
+                        store.metadata)
+    ranks = rank_distribution(fixed, session.role_matrix, ROLE, samples=5, seed=1)
+    np.testing.assert_array_equal(ranks['rank_best'], ranks['rank_worst'])
+    assert sorted(ranks['rank_best'].tolist()) == list(range(1, len(fixed) + 1))
+    # In rank order the ratings never rise (beyond rounding between the two sums)
+    overall = score_role(fixed, session.role_matrix, ROLE).values('overall_rating',
+                                                                  np.arange(len(fixed)))
+    assert (np.diff(overall[np.argsort(ranks['rank_best'])]) <= 1e-6).all()
+
+
+def test_rating_intervals_hold_the_rating(session):
+    result = score_role(session.store, session.role_matrix, ROLE)
+    overall = result.column('overall_rating')
+    assert (result.column('pessimistic_rating') <= overall + 1e-9).all()
+    assert (overall <= result.column('optimistic_rating') + 1e-9).all()
@@ -0,0 +1,93 @@
+"""Partial selection ranks exactly as a full stable sort does, ties included."""
+import numpy as np
+import pytest
+
+from player_store import PlayerStore
+from scoring import score_role, sort_order, top_k
+
+ROLE = 'Poacher (Attack)'
+
+
+class ChunkedStore(PlayerStore):
+    """An in-memory store that hands its rows out in small chunks, as a database does"""
+
+    chunk_rows = 97
+
+    def dense_chunks(self, rows=None):
+        dense = self.dense_matrix()
+        count = len(self) if rows is None else len(rows)
+        for start in range(0, count, self.chunk_rows):
+            part = slice(start, min(start + self.chunk_rows, count))
+            yield part, dense[:, part] if rows is None else dense[:, rows[part]]
+
+
+def full_sort(values, k):
+    return np.argsort(-values, kind='stable')[:max(k, 0)]
+
+
+@pytest.mark.parametrize('k', [0, 1, 5, 37, 99, 100, 150])
+def test_top_k_matches_a_stable_sort(k):
+    rng = np.random.default_rng(k)
+    # Few distinct values, so most winners are ties
+    values = rng.integers(0, 8, size=100).astype(np.float64)
+    np.testing.assert_array_equal(top_k(values, k), full_sort(values, k))
+
+
+def test_top_k_breaks_ties_towards_earlier_positions():
+    values = np.array([1.0, 3.0, 2.0, 3.0, 3.0, 2.0])
+    assert top_k(values, 2).tolist() == [1, 3]
+    assert top_k(values, 4).tolist() == [1, 3, 4, 2]
+
+
+@pytest.fixture
+def tied_store(export_store):
+    """The bundled players twice over, so every rating is tied with a later copy"""
+    doubled = PlayerStore.concat([export_store, export_store])
+    return ChunkedStore(doubled.names, doubled.attributes, doubled.low, doubled.high,
+                        doubled.abs_bits, doubled.metadata)
+
+
+@pytest.mark.parametrize('top', [1, 10, 250, 5000])
+def test_streamed_top_matches_a_full_sort(session, tied_store, top):
+    matrix = session.role_matrix
+    full = score_role(tied_store, matrix, ROLE)
+    streamed = score_role(tied_store, matrix, ROLE, top=top)
+    np.testing.assert_array_equal(streamed.order, full.order[:top])
+    np.testing.assert_array_equal(streamed.column('overall_rating'),
+                                  full.column('overall_rating', 0, top))
+    assert streamed.total == len(tied_store)
+
+
+def test_streamed_top_of_filtered_rows(session, tied_store):
+    matrix = session.role_matrix
+    rows = np.arange(1, len(tied_store), 3)
+    full = score_role(tied_store, matrix, ROLE, rows=rows)
+    streamed = score_role(tied_store, matrix, ROLE, top=40, rows=rows)
+    np.testing.assert_array_equal(streamed.order, full.order[:40])
+    assert streamed.total == len(rows)
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_sort_order_keeps_ties_in_order(ascending):
+    names = np.array(['b', 'a', 'b', 'c', 'a'], dtype=object)
+    expected = [1, 4, 0, 2, 3] if ascending else [3, 0, 2, 1, 4]
+    assert sort_order(names, ascending).tolist() == expected
+    # Unsigned values (an _abs column) must not wrap when sorted descending
+    counts = np.array([0, 12, 0, 19, 12], dtype=np.uint8)
+    expected = [0, 2, 1, 4, 3] if ascending else [3, 1, 4, 0, 2]
+    assert sort_order(counts, ascending).tolist() == expected
+
+
+def test_sorted_views_keep_ranking_order_for_ties(session):
+    result = score_role(session.store, session.role_matrix, ROLE)
+    for name in ('Name', 'Fin_abs', 'Fin_importance'):
+        for ascending in (True, False):
+            view = result.sorted_by(name, ascending)
+            values = view.column(name)
+            keys = np.unique(values, return_inverse=True)[1].reshape(-1)
+            steps = np.diff(keys) if ascending else -np.diff(keys)
+            assert (steps >= 0).all()
+            # Within a run of equal values, players keep their ranking positions' order
+            positions = np.argsort(result.order)[view.order]
+            tied = steps == 0
+            assert (np.diff(positions)[tied] > 0).all()
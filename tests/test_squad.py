@@ -0,0 +1,82 @@
+"""The squad picker's assignments are optimal and never name a player twice."""
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+import squad
+from squad import DEFAULT_FORMATION, assign, hungarian, pick_squad
+
+
+@pytest.fixture
+def numpy_only(monkeypatch):
+    """Use the NumPy Hungarian method even when scipy is installed"""
+    monkeypatch.setattr(squad, 'linear_sum_assignment', None)
+
+
+def best_total(scores):
+    """Highest total of a one-to-one pairing of rows and columns, by trying every pairing"""
+    n, m = scores.shape
+    if n > m:
+        return best_total(scores.T)
+    return max(sum(scores[i, column] for i, column in enumerate(columns))
+               for columns in permutations(range(m), n))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_hungarian_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 6))
+    m = int(rng.integers(n, 7))
+    # Few distinct costs, so ties are common
+    cost = rng.integers(0, 5, size=(n, m)).astype(np.float64)
+    columns = hungarian(cost)
+    assert len(set(columns.tolist())) == n
+    assert cost[np.arange(n), columns].sum() == pytest.approx(-best_total(-cost))
+
+
+@pytest.mark.parametrize('shape', [(3, 5), (5, 5), (6, 3)])
+def test_assign_maximizes(numpy_only, shape):
+    scores = np.random.default_rng(sum(shape)).uniform(0, 20, size=shape)
+    slots, chosen = assign(scores)
+    assert len(slots) == min(shape)
+    assert len(set(slots.tolist())) == len(set(chosen.tolist())) == min(shape)
+    assert scores[slots, chosen].sum() == pytest.approx(best_total(scores))
+
+
+def full_assignment_total(all_roles, formation, rows):
+    """Best starting total over every player in rows, without pruning"""
+    columns = [all_roles.matrix.index[role] for role in formation]
+    scores = all_roles.ratings[np.ix_(rows, columns)].T
+    slots, chosen = assign(scores)
+    return scores[slots, chosen].sum()
+
+
+@pytest.mark.parametrize('formation', [DEFAULT_FORMATION,
+                                       ['Poacher (Attack)', 'Poacher (Attack)', 'Goalkeeper']])
+def test_pruned_pick_is_optimal(numpy_only, session, formation):
+    all_roles = session.score_all_roles()
+    rows = np.arange(0, len(session.store), 9)
+    result = pick_squad(all_roles, formation, rows=rows, depth=1)
+    expected = full_assignment_total(all_roles, formation, rows)
+    assert result.starting_rating() == pytest.approx(expected)
+
+
+def test_depth_chart(numpy_only, session):
+    all_roles = session.score_all_roles()
+    result = pick_squad(all_roles, DEFAULT_FORMATION, depth=3)
+    assert len(result) == 3 * len(DEFAULT_FORMATION)
+    assert len(set(result.order.tolist())) == len(result)  # Nobody picked twice
+    picks = result.picks(result.order)
+    filled = sorted(zip(result.slots[picks].tolist(), result.choices[picks].tolist()))
+    slots = range(len(DEFAULT_FORMATION))
+    assert filled == [(slot, choice) for slot in slots for choice in (1, 2, 3)]
+    for row in result.order[:5]:
+        rating = all_roles.ratings[row, all_roles.matrix.index[result.role_for(row)]]
+        assert result.values('overall_rating', [row])[0] == pytest.approx(rating)
+
+
+def test_small_pool_leaves_slots_empty(numpy_only, session):
+    rows = np.arange(4)
+    result = pick_squad(session.score_all_roles(), DEFAULT_FORMATION, rows=rows, depth=2)
+    assert sorted(result.order.tolist()) == rows.tolist()
@@ -0,0 +1,103 @@
+"""Incrementally tuned ratings match ratings computed from scratch."""
+import numpy as np
+import pytest
+
+import weight_tuning
+from scoring import IMPORTANCE_LEVELS, score_role
+from weight_tuning import WeightTuner
+
+ROLE = 'Poacher (Attack)'
+
+
+def rescored(tuner, rows):
+    """(overall, pessimistic) ratings under the tuner's current weights, from the store's values"""
+    levels = tuner.levels
+    weights = np.array([tuner.multipliers[level] * scale / np.sum(levels == level)
+                        for level, scale in zip(levels, tuner.scales)])
+    divisor = sum(tuner.multipliers[level] * tuner.scales[levels == level].mean()
+                  for level in IMPORTANCE_LEVELS if (levels == level).any())
+    best = np.column_stack([tuner.store.best_values(attr, rows) for attr, _ in tuner.attributes])
+    low = np.column_stack([tuner.store.low[rows, tuner.store.columns[attr]]
+                           for attr, _ in tuner.attributes])
+    return best @ weights / divisor, low @ weights / divisor
+
+
+def assert_ranked_like(result, expected):
+    """Same players and ratings, ranked the same (up to ties within rounding)"""
+    rows = np.sort(expected.order)
+    np.testing.assert_array_equal(np.sort(result.order), rows)
+    for name in ('overall_rating', 'pessimistic_rating', 'optimistic_rating'):
+        np.testing.assert_allclose(result.values(name, rows), expected.values(name, rows),
+                                   rtol=0, atol=1e-9)
+    np.testing.assert_allclose(result.column('overall_rating'), expected.column('overall_rating'),
+                               rtol=0, atol=1e-9)
+
+
+@pytest.fixture
+def scored(session):
+    return score_role(session.store, session.role_matrix, ROLE)
+
+
+def test_default_weights_rank_as_score_role(scored):
+    assert_ranked_like(WeightTuner(scored).result(), scored)
+
+
+def test_tuned_and_restored_weights_rank_as_score_role(scored):
+    tuner = WeightTuner(scored)
+    tuner.set_multiplier(5, 8)
+    tuner.set_scale('Fin', 2.5)
+    tuner.set_multiplier(1, 0)
+    tuner.set_scale('Fin', 1)
+    for level in IMPORTANCE_LEVELS:
+        tuner.set_multiplier(level, level)
+    assert_ranked_like(tuner.result(), scored)
+
+
+def test_dropping_a_group_matches_its_averages(scored):
+    tuner = WeightTuner(scored)
+    tuner.set_multiplier(1, 0)
+    rows = np.sort(scored.ranking)
+    expected = (5 * scored.values('importance_5_avg', rows) +
+                3 * scored.values('importance_3_avg', rows)) / 8
+    np.testing.assert_allclose(tuner.ratings(), expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('rebase', [1000, 3])
+def test_tuned_ratings_match_a_rescore(monkeypatch, scored, rebase):
+    # With a small REBASE_UPDATES the sums are also recomputed in full along the way
+    monkeypatch.setattr(weight_tuning, 'REBASE_UPDATES', rebase)
+    tuner = WeightTuner(scored)
+    rng = np.random.default_rng(5)
+    attributes = [attr for attr, _ in tuner.attributes]
+    for step in range(40):
+        if step % 3:
+            tuner.set_scale(attributes[rng.integers(len(attributes))], rng.uniform(0, 3))
+        else:
+            tuner.set_multiplier(IMPORTANCE_LEVELS[rng.integers(3)], rng.uniform(0, 10))
+        overall, pessimistic = rescored(tuner, np.sort(scored.ranking))
+        np.testing.assert_allclose(tuner.ratings(), overall, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(tuner.ratings(tuner.low_sums), pessimistic, rtol=0, atol=1e-9)
+
+    result = tuner.result()
+    overall, _ = rescored(tuner, result.order)
+    np.testing.assert_allclose(result.column('overall_rating'), overall, rtol=0, atol=1e-9)
+    assert (np.diff(result.column('overall_rating')) <= 1e-12).all()
+
+
+def test_filtered_players_and_top(session):
+    rows = np.arange(2, len(session.store), 3)
+    scored = score_role(session.store, session.role_matrix, ROLE, rows=rows)
+    tuner = WeightTuner(scored)
+    tuner.set_multiplier(3, 6)
+    overall, _ = rescored(tuner, rows)
+    full = tuner.result()
+    np.testing.assert_array_equal(np.sort(full.order), rows)
+    np.testing.assert_allclose(full.values('overall_rating', rows), overall, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(full.column('overall_rating'), np.sort(overall)[::-1],
+                               rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(tuner.result(top=15).order, full.order[:15])
+
+
+def test_refuses_a_top_k_result(session):
+    with pytest.raises(ValueError):
+        WeightTuner(score_role(session.store, session.role_matrix, ROLE, top=10))
@@ -0,0 +1,103 @@
+"""A window of sliders for tuning one role's weights while the table re-ranks.
+
+There is a slider per importance group (how much the group's average
+counts, 5/3/1 by default) and one per attribute (how much it counts within
+its group, 1 by default). Each slider movement goes straight to the
+WeightTuner, which is cheap (see weight_tuning); re-ranking and redrawing
+the table happen once per burst of movements, when Tk is next idle.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from scoring import IMPORTANCE_LEVELS
+
+GROUP_NAMES = {5: 'Critical (5)', 3: 'Moderate (3)', 1: 'Minor (1)'}
+
+# Slider ranges: group multipliers and per-attribute scales
+MAX_MULTIPLIER = 10
+MAX_SCALE = 3
+
+# Attribute sliders per column of the window
+ATTRIBUTE_ROWS = 12
+
+
+class WeightEditor:
+    """A Toplevel of group and attribute sliders driving a WeightTuner"""
+
+    def __init__(self, parent, tuner, on_change, full_name=None, on_close=None):
+        self.tuner = tuner
+        self.on_change = on_change  # Called with the tuner after a burst of slider moves
+        self.on_close = on_close
+        full_name = full_name or (lambda attr: attr)
+        self.pending = None  # after_idle id of the pending re-rank
+        self.variables = {}  # ('group', level) or ('attr', abbreviation) -> DoubleVar
+        self.value_labels = {}
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Tune Weights - {tuner.role}")
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+
+        groups = ttk.LabelFrame(self.window, text="Group weights", padding="10")
+        groups.pack(fill=tk.X, padx=10, pady=(10, 5))
+        for i, level in enumerate(IMPORTANCE_LEVELS):
+            self.add_slider(groups, i, 0, ('group', level), GROUP_NAMES[level],
+                            tuner.multipliers[level], MAX_MULTIPLIER)
+
+        attributes = ttk.LabelFrame(self.window, text="Attribute weights (within their group)",
+                                    padding="10")
+        attributes.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        ordered = sorted(tuner.attributes, key=lambda x: x[1], reverse=True)
+        for i, (attr, importance) in enumerate(ordered):
+            self.add_slider(attributes, i % ATTRIBUTE_ROWS, 3 * (i // ATTRIBUTE_ROWS),
+                            ('attr', attr), f"{full_name(attr)} ({importance})", 1.0, MAX_SCALE)
+
+        buttons = ttk.Frame(self.window)
+        buttons.pack(fill=tk.X, padx=10, pady=(5, 10))
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Close", command=self.close).pack(side=tk.RIGHT)
+
+    def add_slider(self, parent, row, column, key, text, value, maximum):
+        variable = tk.DoubleVar(value=value)
+        ttk.Label(parent, text=text).grid(row=row, column=column, sticky='w', padx=(10, 5))
+        ttk.Scale(parent, from_=0, to=maximum, variable=variable, length=160,
+                  command=lambda _, key=key: self.on_slide(key)).grid(row=row, column=column + 1)
+        label = ttk.Label(parent, text=f"{value:.2f}", width=5)
+        label.grid(row=row, column=column + 2, sticky='e')
+        self.variables[key] = variable
+        self.value_labels[key] = label
+
+    def on_slide(self, key):
+        """Apply one slider's value to the tuner and schedule a re-rank"""
+        kind, name = key
+        value = self.variables[key].get()
+        self.value_labels[key].config(text=f"{value:.2f}")
+        if kind == 'group':
+            self.tuner.set_multiplier(name, value)
+        else:
+            self.tuner.set_scale(name, value)
+        self.schedule()
+
+    def schedule(self):
+        if self.pending is None:
+            self.pending = self.window.after_idle(self.apply)
+
+    def apply(self):
+        self.pending = None
+        self.on_change(self.tuner)
+
+    def reset(self):
+        """Put every slider back to the role's own weights"""
+        self.tuner.reset()
+        for (kind, name), variable in self.variables.items():
+            value = self.tuner.multipliers[name] if kind == 'group' else 1.0
+            variable.set(value)
+            self.value_labels[(kind, name)].config(text=f"{value:.2f}")
+        self.schedule()
+
+    def close(self):
+        if self.pending is not None:
+            self.window.after_cancel(self.pending)
+            self.pending = None
+        self.window.destroy()
+        if self.on_close is not None:
+            self.on_close()
@@ -0,0 +1,139 @@
+"""Re-rank one role's players live as its weights are tuned.
+
+A role's overall rating is linear in its players' best values: with every
+group multiplier m (5, 3 and 1 by default) and per-attribute scale s (1 by
+default), attribute i of importance group g weighs
+
+    w_i = m_g * s_i / n_g        (n_g attributes in the group)
+
+and the rating is sum(w_i * best_i) divided by the sum over groups of
+m_g times the group's mean scale: the group averages'
+(5 * avg5 + 3 * avg3 + 1 * avg1) / 9 when nothing has been tuned. A scaled
+attribute counts that much more within its group, and the divisor follows
+the scales so ratings stay on the 1-20 attribute scale.
+
+WeightTuner keeps the undivided sums of the players being ranked. Moving a
+slider changes one weight (or, for a multiplier, its group's), so the sums are
+brought up to date by adding the weight changes times those attributes'
+values: a few columns touched per step, never the whole role rescored.
+The same is done for the low bounds, which give the pessimistic rating
+(and with it the optimistic one, see scoring). The sums are recomputed in
+full every REBASE_UPDATES steps so rounding cannot build up.
+"""
+import numpy as np
+
+from scoring import IMPORTANCE_LEVELS, RoleResult, top_k
+
+# Incremental updates between full recomputations of the weighted sums
+REBASE_UPDATES = 256
+
+
+class WeightTuner:
+    """One role's ratings for a fixed set of players under adjustable weights"""
+
+    def __init__(self, result):
+        # result: a RoleResult of every player to be ranked (filtered, but not top-k)
+        if len(result) < result.total:
+            raise ValueError("Weights can only be tuned on a result that keeps every player")
+        if not result.store.in_memory:
+            # Tuning keeps every ranked player's values in memory, which a database is too big for
+            raise ValueError("Weights can't be tuned on a player database; load exports instead")
+        self.store = result.store
+        self.role = result.role
+        self.attributes = result.attributes  # [(abbreviation, importance)]
+        rows = np.sort(result.ranking)
+        self.rows = None if len(rows) == len(self.store) else rows  # Store rows ranked, None for all
+        self.summary = {name: result.values(name, rows) for name in result.summary}
+        self.total = result.total
+
+        self.levels = np.array([importance for _, importance in self.attributes], dtype=np.int64)
+        self.counts = {level: max(int(np.sum(self.levels == level)), 1) for level in IMPORTANCE_LEVELS}
+        self.scales = np.ones(len(self.attributes))  # Multipliers are set by reset()
+
+        # Best values and low bounds of the role's attributes, a contiguous column each
+        self.values = np.empty((len(rows), len(self.attributes)), dtype=np.float32, order='F')
+        self.lows = np.empty_like(self.values)
+        for i, (attr, _) in enumerate(self.attributes):
+            self.values[:, i] = self.store.best_values(attr, rows)
+            self.lows[:, i] = self.store.low[rows, self.store.columns[attr]]
+
+        self.reset()
+
+    def current_weights(self):
+        """Each attribute's weight under the current multipliers and scales"""
+        multipliers = np.array([self.multipliers[level] for level in self.levels])
+        counts = np.array([self.counts[level] for level in self.levels], dtype=np.float64)
+        return multipliers * self.scales / counts
+
+    def divisor(self):
+        """What the weighted sums are divided by; sum(m_g) until any scale moves"""
+        total = 0.0
+        for level in IMPORTANCE_LEVELS:
+            in_group = self.levels == level
+            share = self.scales[in_group].sum() / self.counts[level] if in_group.any() else 1.0
+            total += self.multipliers[level] * share
+        return total
+
+    def set_multiplier(self, level, value):
+        """Weigh one importance group's average by value"""
+        self.multipliers[level] = float(value)
+        self.update()
+
+    def set_scale(self, attr, value):
+        """Weigh one attribute value times as much as its group's others"""
+        self.scales[[a for a, _ in self.attributes].index(attr)] = float(value)
+        self.update()
+
+    def reset(self):
+        """Back to the role's own 5/3/1 weights"""
+        self.multipliers = {level: float(level) for level in IMPORTANCE_LEVELS}
+        self.scales[:] = 1
+        self.weights = self.current_weights()
+        self.sums = self.summary['overall_rating'] * self.divisor()
+        self.low_sums = self.summary['pessimistic_rating'] * self.divisor()
+        self.updates = 0
+
+    def update(self):
+        """Apply the change since the last update to the weighted sums"""
+        weights = self.current_weights()
+        changed = np.flatnonzero(weights != self.weights)
+        self.updates += 1
+        if self.updates >= REBASE_UPDATES:
+            self.sums = self.values @ weights
+            self.low_sums = self.lows @ weights
+            self.updates = 0
+        elif len(changed):
+            delta = weights[changed] - self.weights[changed]
+            self.sums += self.values[:, changed] @ delta
+            self.low_sums += self.lows[:, changed] @ delta
+        self.weights = weights
+
+    def ratings(self, sums=None):
+        """The overall rating of every ranked player under the current weights"""
+        sums = self.sums if sums is None else sums
+        divisor = self.divisor()
+        if divisor <= 0:
+            return np.zeros_like(sums)
+        return sums / divisor
+
+    def result(self, top=None):
+        """A RoleResult ranking the players (the best top if given) by the tuned rating"""
+        ratings = self.ratings()
+        pessimistic = self.ratings(self.low_sums)
+        summary = dict(self.summary, overall_rating=ratings, pessimistic_rating=pessimistic,
+                       optimistic_rating=2 * ratings - pessimistic)
+        if top is None:
+            positions, kept = np.argsort(-ratings, kind='stable'), None
+        else:
+            # Summaries for just the winners, as score_role_top keeps them
+            positions = top_k(ratings, top)
+            kept = np.sort(positions)
+            summary = {name: values[kept] for name, values in summary.items()}
+
+        if self.rows is None:
+            order, summary_rows = positions, kept
+        else:
+            order = self.rows[positions]
+            summary_rows = self.rows if kept is None else self.rows[kept]
+        return RoleResult(self.store, self.role, self.attributes, summary, order,
+                          summary_rows=summary_rows, total=self.total)